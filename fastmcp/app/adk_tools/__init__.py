@@ -3,6 +3,7 @@ try:
     from .runners import (
         # Jira runners
         run_jira_fetch_issue,
+        run_jira_fetch_issues,
         run_jira_get_projects,
         run_jira_get_issues_for_project,
         run_jira_create_issue,
@@ -14,6 +15,9 @@ try:
         run_jira_get_issue_comments,
         run_jira_get_sprints,
         run_jira_move_issue_to_sprint,
+        run_jira_bulk_assign_issues,
+        run_jira_bulk_transition_issues,
+        run_jira_bulk_move_issues_to_sprint,
         # GitHub runners
         run_github_get_repos,
         run_github_get_branches,
@@ -23,9 +27,13 @@ try:
         run_github_close_pull_request,
         run_github_get_issues,
         run_github_get_pull_requests,
+        run_github_get_repos_overview,
         run_github_get_pr_files,
+        run_github_get_pr_file_patch,
+        run_github_summarize_pr,
         run_github_create_issue,
         run_github_comment_issue,
+        run_issues_search,
         run_email_send,
         run_email_confirm_and_send,
         run_regenerate_email_summary,
@@ -38,6 +46,7 @@ try:
     ALL_TOOL_RUNNERS = {
         # Jira runners
         "jira_fetch_issue": run_jira_fetch_issue,
+        "jira_fetch_issues": run_jira_fetch_issues,
         "jira_get_projects": run_jira_get_projects,
         "jira_get_issues_for_project": run_jira_get_issues_for_project,
         "jira_create_issue": run_jira_create_issue,
@@ -49,6 +58,9 @@ try:
         "jira_get_issue_comments": run_jira_get_issue_comments,
         "jira_get_sprints": run_jira_get_sprints,
         "jira_move_issue_to_sprint": run_jira_move_issue_to_sprint,
+        "jira_bulk_assign_issues": run_jira_bulk_assign_issues,
+        "jira_bulk_transition_issues": run_jira_bulk_transition_issues,
+        "jira_bulk_move_issues_to_sprint": run_jira_bulk_move_issues_to_sprint,
         # GitHub runners
         "github_get_repos": run_github_get_repos,
         "github_get_branches": run_github_get_branches,
@@ -58,9 +70,13 @@ try:
         "github_close_pull_request": run_github_close_pull_request,
         "github_get_issues": run_github_get_issues,
         "github_get_pull_requests": run_github_get_pull_requests,
+        "github_get_repos_overview": run_github_get_repos_overview,
         "github_get_pr_files": run_github_get_pr_files,
+        "github_get_pr_file_patch": run_github_get_pr_file_patch,
+        "github_summarize_pr": run_github_summarize_pr,
         "github_create_issue": run_github_create_issue,
         "github_comment_issue": run_github_comment_issue,
+        "issues_search": run_issues_search,
         "email_send": run_email_send,
         "email_confirm_and_send": run_email_confirm_and_send,
         "regenerate_email_summary": run_regenerate_email_summary,
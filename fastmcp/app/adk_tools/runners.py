@@ -1,11 +1,17 @@
 # Tool runner functions without ADK tool declarations
-from ..services import github_service, jira_service
+from ..services import github_service, issue_index, jira_service, pr_summary_service
 from ..services.email_service import send_email
 
 # Jira runners
 async def run_jira_fetch_issue(ticket_id: str):
     return await jira_service.fetch_jira_issue(ticket_id)
 
+async def run_jira_fetch_issues(ticket_ids):
+    # Accept a comma-separated string as well as a list of keys
+    if isinstance(ticket_ids, str):
+        ticket_ids = ticket_ids.split(",")
+    return await jira_service.fetch_jira_issues(list(ticket_ids))
+
 async def run_jira_get_projects():
     return await jira_service.get_jira_projects()
 
@@ -79,7 +85,16 @@ async def run_jira_get_sprints(project_key: str):
     return await jira_service.get_sprints(project_key)
 
 async def run_jira_move_issue_to_sprint(ticket_id: str, sprint_id: int):
-    return await jira_service.move_issue_to_sprint(ticket_id, sprint_id)
+    return await jira_service.move_issue_to_sprint(sprint_id, ticket_id)
+
+async def run_jira_bulk_assign_issues(ticket_ids, assignee: str):
+    return await jira_service.bulk_assign_issues(ticket_ids, assignee)
+
+async def run_jira_bulk_transition_issues(ticket_ids, transition: str):
+    return await jira_service.bulk_transition_issues(ticket_ids, str(transition))
+
+async def run_jira_bulk_move_issues_to_sprint(ticket_ids, sprint_id: int):
+    return await jira_service.bulk_move_issues_to_sprint(int(sprint_id), ticket_ids)
 
 # GitHub runners
 async def run_github_get_repos():
@@ -102,14 +117,25 @@ async def run_github_merge_pull_request(owner: str, repo: str, pr_number: int, c
 async def run_github_close_pull_request(owner: str, repo: str, pr_number: int):
     return await github_service.close_pull_request(owner, repo, pr_number)
 
-async def run_github_get_issues(owner: str, repo: str):
-    return await github_service.get_issues(owner, repo)
+async def run_github_get_issues(owner: str, repo: str, state: str = "open", labels: str = None, assignee: str = None,
+                                since: str = None, sort: str = None, direction: str = None, max_items: int = None):
+    return await github_service.get_issues(owner, repo, state, labels, assignee, since, sort, direction, max_items)
 
-async def run_github_get_pull_requests(owner: str, repo: str, state: str = "open"):
-    return await github_service.get_pull_requests(owner, repo, state)
+async def run_github_get_pull_requests(owner: str, repo: str, state: str = "open", base: str = None, head: str = None,
+                                       sort: str = None, direction: str = None, max_items: int = None):
+    return await github_service.get_pull_requests(owner, repo, state, base, head, sort, direction, max_items)
 
-async def run_github_get_pr_files(owner: str, repo: str, pr_number: int):
-    return await github_service.get_pull_request_files(owner, repo, pr_number)
+async def run_github_get_repos_overview(repos=None, include=None, state: str = "open", max_items: int = 100):
+    return await github_service.get_repos_overview(repos, include, state, max_items)
+
+async def run_github_get_pr_files(owner: str, repo: str, pr_number: int, include_patch: bool = True, max_files: int = None):
+    return await github_service.get_pull_request_files(owner, repo, int(pr_number), include_patch, max_files)
+
+async def run_github_get_pr_file_patch(owner: str, repo: str, pr_number: int, filename: str, max_bytes: int = None):
+    return await github_service.get_pull_request_file_patch(owner, repo, int(pr_number), filename, max_bytes)
+
+async def run_github_summarize_pr(owner: str, repo: str, pr_number: int):
+    return await pr_summary_service.summarize_pull_request(owner, repo, int(pr_number))
 
 async def run_github_create_issue(owner: str, repo: str, title: str, body: str = ""):
     from ..models.github_models import CreateGithubIssue
@@ -119,6 +145,12 @@ async def run_github_create_issue(owner: str, repo: str, title: str, body: str =
 async def run_github_comment_issue(owner: str, repo: str, issue_number: int, comment_body: str):
     return await github_service.comment_issue(owner, repo, issue_number, comment_body)
 
+# Local index runner
+async def run_issues_search(query: str = None, source: str = None, project: str = None, status: str = None,
+                            assignee: str = None, priority: str = None, due_before: str = None,
+                            updated_since: str = None, limit: int = 20):
+    return await issue_index.search_issues(query, source, project, status, assignee, priority, due_before, updated_since, int(limit))
+
 # Email runner
 async def run_email_send(to: str, subject: str, body: str):
     return await send_email(to_email=to, subject=subject, body=body)
@@ -4,18 +4,74 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     gemini_api_key: str
+    gemini_api_endpoint: str | None = None
+    gemini_context_cache_enabled: bool = True
+    gemini_context_cache_ttl: float = 3600.0
+    gemini_context_cache_retry: float = 600.0
+    gemini_tool_selection_enabled: bool = True
+    gemini_tool_top_k: int = 8
+    gemini_tool_subset_cache_size: int = 32
+    prompt_total_tokens: int = 8000
+    prompt_context_tokens: int = 500
+    prompt_history_tokens: int = 2000
+    prompt_tool_result_tokens: int = 4000
+    prompt_exact_token_count: bool = False
+    plan_cache_enabled: bool = True
+    plan_cache_threshold: float = 0.8
+    plan_cache_size: int = 512
+    plan_cache_ttl: float = 86400.0
+    plan_templates_enabled: bool = True
     github_token: str
     github_api_url: str = "https://api.github.com"
     github_mock: bool = False
     github_user_agent: str = "project-automator"
+    github_max_items: int = 1000
+    github_page_concurrency: int = 4
+    github_graphql_enabled: bool = True
+    github_graphql_url: str | None = None
+    github_graphql_max_nodes: int = 5000
+    github_pr_max_files: int = 300
+    github_pr_patch_max_bytes: int = 8000
+    github_pr_patch_total_bytes: int = 60000
+    pr_summary_chunk_tokens: int = 6000
+    pr_summary_concurrency: int = 4
+    pr_summary_cache_ttl: float = 86400.0
     jira_base_url: str
     jira_email: str
     jira_api_token: str
     jira_mock: bool = False
     http_timeout: float = 15.0
+    http_retry_attempts: int = 3
+    http_retry_backoff_base: float = 0.2
+    http_retry_backoff_max: float = 5.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    http_hedge_enabled: bool = False
+    http_hedge_percentile: float = 95.0
+    http_hedge_min_delay_ms: float = 50.0
+    http_hedge_budget: float = 0.05
     jira_default_project_key: str | None = None
+    jira_user_cache_ttl: float = 3600.0
+    jira_user_negative_ttl: float = 300.0
+    jira_prefetch_assignable_users: bool = False
+    jira_board_cache_ttl: float = 86400.0
+    jira_board_cache_file: str | None = None
+    jira_sprint_cache_ttl: float = 60.0
+    jira_warm_projects: str | None = None
+    jira_bulk_concurrency: int = 8
+    jira_incremental_sync: bool = False
+    jira_sync_overlap_minutes: int = 2
+    jira_sync_full_interval: float = 3600.0
+    jira_sync_store_file: str | None = None
+    jira_sync_min_interval: float = 0.0
+    github_webhook_secret: str | None = None
+    jira_webhook_secret: str | None = None
+    issue_index_path: str = ":memory:"
     api_key: str | None = None
     expose_rest_endpoints: bool = False
+    metrics_enabled: bool = True
+    log_level: str = "INFO"
+    log_json: bool = True
     smtp_host: str | None = None
     smtp_port: int | None = None
     smtp_user: str | None = None
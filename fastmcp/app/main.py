@@ -1,17 +1,70 @@
-from fastapi import FastAPI, HTTPException, Body, Header
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Body, Header, Request, Response
 from typing import Optional, Any, Dict
 from .config.settings import settings
-from .routers import jira, github
+from .config.logging_config import setup_logging, request_id_var
+from .responses import ORJSONResponse, json_response
+from .routers import jira, github, search, webhooks
+from .services import jira_service, metrics_service
 
-app = FastAPI(title="FastMCP API")
+setup_logging(settings.log_level, settings.log_json)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolve board ids for the configured projects in the background so the first sprint
+    # lookup is a single call, without holding up startup when Jira is slow
+    warm = asyncio.create_task(jira_service.warm_caches())
+    yield
+    warm.cancel()
+
+app = FastAPI(title="FastMCP API", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Label by route template (e.g. /jira/issue/{ticket_id}) to keep cardinality bounded
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        metrics_service.observe_http_request(request.method, route_path, status_code, time.perf_counter() - start)
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    # Reuse the caller's id when present so logs can be correlated across services
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        request_id_var.reset(token)
 
 @app.get("/")
 async def root():
     return {"message": "FastMCP server running"}
 
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint."""
+        return Response(content=metrics_service.render_latest(), media_type=metrics_service.CONTENT_TYPE_LATEST)
+
+# Webhook receivers stay reachable without the REST endpoints; each is off until its secret is set
+app.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
+
 if settings.expose_rest_endpoints:
     app.include_router(jira.router, prefix="/jira", tags=["Jira"])
     app.include_router(github.router, prefix="/github", tags=["GitHub"])
+    app.include_router(search.router, prefix="/search", tags=["Search"])
 
 try:
     from .orchestration.coordinator import create_orchestrator_agent
@@ -54,9 +107,10 @@ try:
         # Pass prompt with session ID for context management
         response = await agent.run(str(final_prompt), session_id=session_id)
         # Normalize agent responses into the stable schema
+        # Tool results can be large lists of models; send them without jsonable_encoder
         if isinstance(response, dict) and ("result" in response or "error" in response or "toolCalls" in response):
-            return response
-        return {"result": response, "toolCalls": [], "model_summary": None}
+            return json_response(response)
+        return json_response({"result": response, "toolCalls": [], "model_summary": None})
 except Exception as e:
     adk_error_detail = str(e)
 
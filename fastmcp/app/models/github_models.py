@@ -35,4 +35,23 @@ class GithubIssue(BaseModel):
 
 class CreateGithubIssue(BaseModel):
     title: str
-    body: Optional[str] = None
\ No newline at end of file
+    body: Optional[str] = None
+
+class PullRequestSummary(BaseModel):
+    pr_number: int
+    head_sha: str  # the commit the summary describes
+    title: str
+    summary: str
+    files: int  # files covered
+    chunks: int  # diff chunks summarized separately before combining
+
+class RepoOverview(BaseModel):
+    full_name: str
+    # None when the listing was not requested
+    branches: Optional[List[GithubBranch]] = None
+    pull_requests: Optional[List[PullRequest]] = None
+    issues: Optional[List[GithubIssue]] = None
+    error: Optional[str] = None  # e.g. the repository does not exist or is not accessible
+
+class MultiRepoOverview(BaseModel):
+    repositories: List[RepoOverview]
@@ -0,0 +1,19 @@
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+class IndexedIssue(BaseModel):
+    source: str  # "jira" or "github"
+    container: str  # Jira project key or GitHub owner/repo
+    key: str  # e.g. TP-12 or owner/repo#12
+    title: str
+    status: Optional[str] = None
+    assignee: Optional[str] = None
+    priority: Optional[str] = None
+    due_date: Optional[str] = None
+    updated: Optional[str] = None
+    url: Optional[str] = None
+
+class IssueSearchResult(BaseModel):
+    issues: List[IndexedIssue]
+    total: int
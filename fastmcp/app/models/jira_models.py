@@ -10,6 +10,20 @@ class JiraIssue(BaseModel):
     assignee: str
     description: Optional[str] = None
 
+class JiraIssueBatch(BaseModel):
+    issues: List[JiraIssue]
+    not_found: List[str] = []
+
+class JiraBulkItemResult(BaseModel):
+    issue_key: str
+    status: str  # "success" or "error"
+    detail: Optional[str] = None
+
+class JiraBulkResult(BaseModel):
+    results: List[JiraBulkItemResult]
+    succeeded: int
+    failed: int
+
 class JiraProject(BaseModel):
     id: str
     key: str
@@ -0,0 +1,43 @@
+
+import base64
+import hashlib
+import json
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Opaque token for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+def _scope_tag(scope: str) -> str:
+    return hashlib.sha1(scope.encode()).hexdigest()[:8]
+
+def encode_cursor(position: Dict[str, Any], scope: str) -> str:
+    """Packs an upstream position (offset, page, ...) into an opaque cursor bound to `scope`.
+
+    `scope` identifies the listing (route plus filters), so a cursor can't be replayed
+    against a different query.
+    """
+    payload = json.dumps({"s": _scope_tag(scope), **position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, scope: str) -> Dict[str, Any]:
+    """Unpacks a cursor from encode_cursor, raising 400 if it is malformed or from another listing."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(data, dict) or data.pop("s", None) != _scope_tag(scope):
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this listing")
+    # Positions are always offsets or page numbers
+    if not all(isinstance(v, int) and not isinstance(v, bool) and v >= 0 for v in data.values()):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return data
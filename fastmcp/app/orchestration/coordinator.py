@@ -1,8 +1,49 @@
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, MutableSequence
 import google.generativeai as genai
 import importlib
+from google.api_core import exceptions as google_exceptions
 from ..config.settings import settings
 from ..adk_tools import ALL_TOOL_RUNNERS
 from ..services.context_service import context_service
+from ..services import ai_service, metrics_service
+from .prompt_budget import PromptSection, build_prompt, fit_tool_response, tool_result_text
+from .plan_cache import READ_ONLY_TOOLS, PlanCache
+from .prompt_cache import CachedPrefixModel
+from .tool_selector import ToolSelector
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "gemini-2.5-flash-lite"
+
+
+def _plain(value):
+    if isinstance(value, Mapping):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, MutableSequence):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _plain_args(args) -> dict:
+    """Converts Gemini's proto args to plain Python, nested ones included: maps to dicts, repeated values to lists."""
+    return _plain(dict(args or {}))
+
+
+def _previous_calls(context):
+    """(call, response) pairs of the session's previous turn, for plans that look values up in them."""
+    response = context.conversation_history[-1].get("agent_response") if context.conversation_history else None
+    if not isinstance(response, dict):
+        return []
+    calls = response.get("toolCalls") or []
+    results = response.get("result")
+    if len(calls) == 1:
+        return [(calls[0], results)]
+    if isinstance(results, list) and len(results) == len(calls):
+        return list(zip(calls, results))
+    return []
 
 
 def _build_tool_declarations():
@@ -17,6 +58,15 @@ def _build_tool_declarations():
                 "required": ["ticket_id"],
             },
         },
+        {
+            "name": "jira_fetch_issues",
+            "description": "Fetch several Jira issues at once by their ticket IDs (one request for all of them)",
+            "parameters": {
+                "type": "object",
+                "properties": {"ticket_ids": {"type": "array", "items": {"type": "string"}}},
+                "required": ["ticket_ids"],
+            },
+        },
         {
             "name": "jira_create_issue",
             "description": "Create a new Jira issue",
@@ -91,6 +141,63 @@ def _build_tool_declarations():
                 "required": ["issue_key", "transition_id"],
             },
         },
+        {
+            "name": "jira_get_sprints",
+            "description": "List the sprints (id, name, state) of a Jira project's board",
+            "parameters": {
+                "type": "object",
+                "properties": {"project_key": {"type": "string"}},
+                "required": ["project_key"],
+            },
+        },
+        {
+            "name": "jira_move_issue_to_sprint",
+            "description": "Move a single Jira issue to a sprint by sprint ID",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticket_id": {"type": "string"},
+                    "sprint_id": {"type": "integer"},
+                },
+                "required": ["ticket_id", "sprint_id"],
+            },
+        },
+        {
+            "name": "jira_bulk_move_issues_to_sprint",
+            "description": "Move many Jira issues to a sprint at once; returns a per-issue result",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticket_ids": {"type": "array", "items": {"type": "string"}, "description": "Issue keys; ranges like TP-1..TP-40 are expanded"},
+                    "sprint_id": {"type": "integer"},
+                },
+                "required": ["ticket_ids", "sprint_id"],
+            },
+        },
+        {
+            "name": "jira_bulk_transition_issues",
+            "description": "Transition many Jira issues at once to a target status (name such as 'Done') or transition ID; returns a per-issue result",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticket_ids": {"type": "array", "items": {"type": "string"}, "description": "Issue keys; ranges like TP-1..TP-40 are expanded"},
+                    "transition": {"type": "string"},
+                },
+                "required": ["ticket_ids", "transition"],
+            },
+        },
+        {
+            "name": "jira_bulk_assign_issues",
+            "description": "Assign many Jira issues to one user at once; returns a per-issue result",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "ticket_ids": {"type": "array", "items": {"type": "string"}, "description": "Issue keys; ranges like TP-1..TP-40 are expanded"},
+                    "assignee": {"type": "string"},
+                },
+                "required": ["ticket_ids", "assignee"],
+            },
+        },
         {
             "name": "jira_summarize_and_email_issue",
             "description": "Summarize a Jira issue and send the summary via email with confirmation workflow",
@@ -134,12 +241,19 @@ def _build_tool_declarations():
         },
         {
             "name": "github_get_issues",
-            "description": "List issues for a repository",
+            "description": "List issues for a repository (pull requests excluded); filters are applied by GitHub",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "owner": {"type": "string"},
                     "repo": {"type": "string"},
+                    "state": {"type": "string", "description": "Issue state (open, closed, all)", "enum": ["open", "closed", "all"]},
+                    "labels": {"type": "string", "description": "Comma-separated label names; issues must have all of them"},
+                    "assignee": {"type": "string", "description": "GitHub login, 'none' for unassigned or '*' for any assignee"},
+                    "since": {"type": "string", "description": "Only issues updated at or after this ISO 8601 timestamp"},
+                    "sort": {"type": "string", "enum": ["created", "updated", "comments"]},
+                    "direction": {"type": "string", "enum": ["asc", "desc"]},
+                    "max_items": {"type": "integer", "description": "Maximum number of issues to return"},
                 },
                 "required": ["owner", "repo"],
             },
@@ -153,13 +267,61 @@ def _build_tool_declarations():
                     "owner": {"type": "string"},
                     "repo": {"type": "string"},
                     "state": {"type": "string", "description": "Pull request state (open, closed, all)", "enum": ["open", "closed", "all"]},
+                    "base": {"type": "string", "description": "Only pull requests into this branch"},
+                    "head": {"type": "string", "description": "Only pull requests from this branch, as user:branch"},
+                    "sort": {"type": "string", "enum": ["created", "updated", "popularity", "long-running"]},
+                    "direction": {"type": "string", "enum": ["asc", "desc"]},
+                    "max_items": {"type": "integer", "description": "Maximum number of pull requests to return"},
                 },
                 "required": ["owner", "repo"],
             },
         },
+        {
+            "name": "github_get_repos_overview",
+            "description": "Get branches, pull requests and/or issues of several repositories in one call",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "repos": {"type": "array", "items": {"type": "string"}, "description": "Repositories as owner/repo; omit for all of the user's repositories"},
+                    "include": {"type": "array", "items": {"type": "string", "enum": ["branches", "pull_requests", "issues"]}, "description": "Listings to fetch (default: all three)"},
+                    "state": {"type": "string", "description": "State of pull requests and issues (open, closed, all)", "enum": ["open", "closed", "all"]},
+                    "max_items": {"type": "integer", "description": "Maximum rows per listing and repository"},
+                },
+            },
+        },
         {
             "name": "github_get_pr_files",
-            "description": "Get the list of files changed in a pull request",
+            "description": "Get the list of files changed in a pull request; patches are size-capped and flagged patch_truncated when cut",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "owner": {"type": "string"},
+                    "repo": {"type": "string"},
+                    "pr_number": {"type": "integer"},
+                    "include_patch": {"type": "boolean", "description": "false returns only filename, status, additions and deletions"},
+                    "max_files": {"type": "integer", "description": "Maximum number of files to return"},
+                },
+                "required": ["owner", "repo", "pr_number"],
+            },
+        },
+        {
+            "name": "github_get_pr_file_patch",
+            "description": "Get the diff of one file changed in a pull request",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "owner": {"type": "string"},
+                    "repo": {"type": "string"},
+                    "pr_number": {"type": "integer"},
+                    "filename": {"type": "string", "description": "Path of the file as listed by github_get_pr_files"},
+                    "max_bytes": {"type": "integer", "description": "Maximum patch size in bytes"},
+                },
+                "required": ["owner", "repo", "pr_number", "filename"],
+            },
+        },
+        {
+            "name": "github_summarize_pr",
+            "description": "Summarize what a pull request changes from its full diff, however large; cached per head commit",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -243,6 +405,25 @@ def _build_tool_declarations():
                 "required": ["owner", "repo", "issue_number", "comment_body"],
             },
         },
+        {
+            "name": "issues_search",
+            "description": "Instantly filter or full-text search Jira and GitHub issues already synced to the local index (by status, assignee, priority, due date, updated date or words in the title)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Words to search for in issue titles and bodies"},
+                    "source": {"type": "string", "enum": ["jira", "github"]},
+                    "project": {"type": "string", "description": "Jira project key or GitHub owner/repo"},
+                    "status": {"type": "string"},
+                    "assignee": {"type": "string"},
+                    "priority": {"type": "string"},
+                    "due_before": {"type": "string", "description": "YYYY-MM-DD"},
+                    "updated_since": {"type": "string", "description": "YYYY-MM-DD"},
+                    "limit": {"type": "integer"},
+                },
+                "required": [],
+            },
+        },
         {
             "name": "email_send",
             "description": "Send an email via configured SMTP",
@@ -307,9 +488,9 @@ class GeminiToolsAgent:
     def __init__(self) -> None:
         if not settings.gemini_api_key:
             raise RuntimeError("Missing GEMINI_API_KEY")
-        genai.configure(api_key=settings.gemini_api_key)
+        genai.configure(**ai_service.genai_client_options())
         self.tools = _build_tool_declarations()
-        system_instruction = (
+        self.instruction_head = (
             "You are an automation agent with access to session context. When a user asks for an actionable task, ALWAYS call a function if one matches. "
             "Be proactive and infer context from user requests. Never ask for clarification unless absolutely necessary. "
             "PRIORITY: If a user mentions 'summarise' or 'summarize' along with 'send' or 'email' and provides an email address, this is a HIGH PRIORITY command that should trigger jira_summarize_and_email_issue function immediately. "
@@ -320,29 +501,41 @@ class GeminiToolsAgent:
             "JIRA SUMMARY EMAIL RULES: When a user requests to 'summarise issue [ticket] and send it to [email]' or similar variations, you MUST call jira_summarize_and_email_issue function immediately. Do NOT just show the issue details - the user specifically wants to send an email summary. "
             "EXAMPLE: 'summarise issue tp-1 and send it to test@example.com' should call jira_summarize_and_email_issue with issue_key='tp-1' and to_email='test@example.com'. "
             "Common patterns to recognize: "
-            "- 'show branches in my repo' or 'list my repositories' → call github_get_repos "
-            "- 'show branches for [repo]' → call github_get_branches with the repo info "
-            "- 'create PR' or 'pull request' → MANDATORY: Ask user for title and description if not provided, then call github_create_pull_request "
-            "- 'list PRs', 'show PRs', 'pull requests', 'show pull requests' → call github_get_pull_requests "
-            "- 'show files in PR #123', 'files changed in PR #123', 'what files changed in PR #123' → call github_get_pr_files "
-            "- 'merge this pr', 'close this pr', 'files in this pr' → use the most recently viewed PR number from context "
-            "- 'merge PR #123', 'merge pull request #123', 'merge this pr' → call github_merge_pull_request with sensible defaults (merge method='merge', commit_title from PR title, commit_message from PR description) "
-            "- 'close PR #123', 'close pull request #123' → call github_close_pull_request "
-            "- 'create issue' → call github_create_issue "
-            "- 'create branch' → call github_create_branch "
-            "- 'list jira projects' or 'show jira projects' → call jira_get_projects "
-            "- 'list issues in [project]' or 'show issues for [project]' → call jira_get_issues_for_project and format the response with key, summary, assignee, due date, and status "
-            "- 'get jira issue [ticket]' or 'fetch jira [ticket]' → call jira_fetch_issue "
-            "- 'create jira issue' → call jira_create_issue "
-            "- 'add comment to jira issue [ticket]' or 'comment on jira [ticket]' → call jira_comment_issue "
-            "- 'get comments from jira issue [ticket]' or 'show comments for [ticket]' → call jira_get_issue_comments "
-            "- 'change status of [ticket]' or 'transition [ticket]' → first call jira_get_possible_transitions to show available statuses, then call jira_transition_issue with the chosen transition ID "
-            "- 'move [ticket] to [status]' or 'set [ticket] status to [status]' → first call jira_get_possible_transitions to find the transition ID for the desired status, then call jira_transition_issue "
-            "- 'summarise [ticket] and send to [email]', 'summarize [ticket] and email [email]', 'summarise issue [ticket] and send it to [email]', 'summarize issue [ticket] and send this to [email]' → call jira_summarize_and_email_issue to fetch issue details, generate summary, and show email preview for confirmation "
-            "- 'what was my previous project?' or 'which project was I on?' → use session context to provide information about recent repositories, Jira projects, and actions "
-            "- 'what did I do last?' or 'show me my recent work' → use session context to summarize recent actions and conversations "
-            "- 'what have I been working on?' → provide a comprehensive summary of recent GitHub and Jira activities "
-            "- 'show me my conversation history' → list recent user inputs and their outcomes "
+        )
+        # One entry per tool pattern, so a request offered only some of the tools gets only their patterns
+        self.patterns = [
+            "- 'show branches in my repo' or 'list my repositories' → call github_get_repos ",
+            "- 'show branches for [repo]' → call github_get_branches with the repo info ",
+            "- 'create PR' or 'pull request' → MANDATORY: Ask user for title and description if not provided, then call github_create_pull_request ",
+            "- 'list PRs', 'show PRs', 'pull requests', 'show pull requests' → call github_get_pull_requests ",
+            "- 'open bugs in [repo]', 'issues assigned to [login]', 'issues updated since [date]' → call github_get_issues with state, labels, assignee or since instead of filtering the full list yourself ",
+            "- 'open PRs and branches across my repos', 'issues in repo-a, repo-b and repo-c' or any question about more than one repository → call github_get_repos_overview once instead of per-repository github_get_* calls ",
+            "- 'show files in PR #123', 'files changed in PR #123', 'what files changed in PR #123' → call github_get_pr_files with include_patch=false ",
+            "- 'show the diff of [file] in PR #123', or a file whose patch was patch_truncated → call github_get_pr_file_patch for that file ",
+            "- 'summarize PR #123', 'what does PR #123 do', 'review this pr' → call github_summarize_pr instead of reading patches from github_get_pr_files ",
+            "- 'merge this pr', 'close this pr', 'files in this pr' → use the most recently viewed PR number from context ",
+            "- 'merge PR #123', 'merge pull request #123', 'merge this pr' → call github_merge_pull_request with sensible defaults (merge method='merge', commit_title from PR title, commit_message from PR description) ",
+            "- 'close PR #123', 'close pull request #123' → call github_close_pull_request ",
+            "- 'create issue' → call github_create_issue ",
+            "- 'create branch' → call github_create_branch ",
+            "- 'list jira projects' or 'show jira projects' → call jira_get_projects ",
+            "- 'list issues in [project]' or 'show issues for [project]' → call jira_get_issues_for_project and format the response with key, summary, assignee, due date, and status ",
+            "- 'get jira issue [ticket]' or 'fetch jira [ticket]' → call jira_fetch_issue ",
+            "- 'show [ticket], [ticket] and [ticket]' or any request about several tickets → call jira_fetch_issues once with all ticket IDs ",
+            "- 'move [tickets] to sprint [n]', 'transition all these to [status]', 'assign [tickets] to [user]' for more than one ticket → call jira_bulk_move_issues_to_sprint, jira_bulk_transition_issues or jira_bulk_assign_issues once with all ticket IDs (use jira_get_sprints to find a sprint ID) ",
+            "- 'find issues about [topic]', 'which [project] issues are assigned to [user]', 'high priority issues due before [date]' or other filters over issues → call issues_search ",
+            "- 'create jira issue' → call jira_create_issue ",
+            "- 'add comment to jira issue [ticket]' or 'comment on jira [ticket]' → call jira_comment_issue ",
+            "- 'get comments from jira issue [ticket]' or 'show comments for [ticket]' → call jira_get_issue_comments ",
+            "- 'change status of [ticket]' or 'transition [ticket]' → first call jira_get_possible_transitions to show available statuses, then call jira_transition_issue with the chosen transition ID ",
+            "- 'move [ticket] to [status]' or 'set [ticket] status to [status]' → first call jira_get_possible_transitions to find the transition ID for the desired status, then call jira_transition_issue ",
+            "- 'summarise [ticket] and send to [email]', 'summarize [ticket] and email [email]', 'summarise issue [ticket] and send it to [email]', 'summarize issue [ticket] and send this to [email]' → call jira_summarize_and_email_issue to fetch issue details, generate summary, and show email preview for confirmation ",
+            "- 'what was my previous project?' or 'which project was I on?' → use session context to provide information about recent repositories, Jira projects, and actions ",
+            "- 'what did I do last?' or 'show me my recent work' → use session context to summarize recent actions and conversations ",
+            "- 'what have I been working on?' → provide a comprehensive summary of recent GitHub and Jira activities ",
+            "- 'show me my conversation history' → list recent user inputs and their outcomes ",
+        ]
+        self.instruction_tail = (
             "Infer reasonable defaults from context when missing. If a required field is missing, pick a sensible default (e.g., issuetype_name='Task', base='main'). "
             "For pull request operations: "
             "1. If user wants to CREATE a PR with email notification, create the PR first, then use email_confirm_and_send to show email preview and ask for user confirmation before sending. "
@@ -361,30 +554,180 @@ class GeminiToolsAgent:
             "If the user just viewed PR #4 and then says 'merge this pr', use PR #4. If they just viewed issue TP-1 and say 'comment on this issue', use TP-1. "
             "MERGE DEFAULTS: When merging PRs, use sensible defaults: merge_method='merge', commit_title from PR title, commit_message from PR description. Only ask for custom merge details if user specifically requests them (e.g., 'squash merge' or 'merge with custom message'). "
         )
-        # Use Gemini 2.5 Flash Lite for tool calling support
-        self.model = genai.GenerativeModel(
-            "gemini-2.5-flash-lite",
-            tools=self.tools,
-            system_instruction=system_instruction,
-        )
+        system_instruction = self.instruction_head + "".join(self.patterns) + self.instruction_tail
+        # Use Gemini 2.5 Flash Lite for tool calling support; the static instruction and
+        # tools are served from a context cache when Gemini supports it
+        self.prefix = CachedPrefixModel(MODEL_NAME, system_instruction, self.tools)
+        self.model = self.prefix.plain
+        # Bare model for exact token counts of the request text (PROMPT_EXACT_TOKEN_COUNT)
+        self.counter = genai.GenerativeModel(MODEL_NAME)
+        # Requests usually need a handful of tools: offer those (and their patterns) only.
+        # Tools the general rules refer to stay in every subset for email follow-ups.
+        declarations = self.tools[0]["function_declarations"]
+        self.selector = ToolSelector(declarations, self.patterns, rules=self.instruction_head + self.instruction_tail)
+        self._subsets: "OrderedDict[frozenset, CachedPrefixModel]" = OrderedDict()
+        self.plans = PlanCache(maxsize=settings.plan_cache_size, ttl=settings.plan_cache_ttl)
+
+    def _prefix_for(self, prompt: str) -> CachedPrefixModel:
+        """The model prefix offering the tools relevant to `prompt`; one is built and cached per tool subset."""
+        if not settings.gemini_tool_selection_enabled:
+            return self.prefix
+        names = self.selector.select(prompt, settings.gemini_tool_top_k)
+        if names is None:
+            return self.prefix
+        key = frozenset(names)
+        prefix = self._subsets.get(key)
+        if prefix is None:
+            instruction = self.instruction_head + "".join(self.selector.patterns_for(names)) + self.instruction_tail
+            tools = [{"function_declarations": self.selector.declarations_for(names)}]
+            prefix = CachedPrefixModel(MODEL_NAME, instruction, tools)
+            self._subsets[key] = prefix
+            while len(self._subsets) > settings.gemini_tool_subset_cache_size:
+                self._subsets.popitem(last=False)
+        else:
+            self._subsets.move_to_end(key)
+        logger.debug("Offering %d of %d tools", len(names), len(self.selector.names), extra={"tools": names})
+        return prefix
+
+    async def _generate(self, contents, call: str, model=None, prefix: CachedPrefixModel = None):
+        """Calls Gemini and records latency and token usage under the given call-site label.
+
+        `prefix` picks the tool subset for the request (default: all tools); an explicit
+        `model` is used as is unless it is the agent's own model.
+        """
+        prefix = prefix or self.prefix
+        requested = model or self.model
+        if requested is self.prefix.plain:
+            requested = prefix.plain
+        model = await prefix.get() if requested is prefix.plain else requested
+        start = time.perf_counter()
+        response = None
+        try:
+            try:
+                response = await ai_service.generate_content(model, contents)
+            except (google_exceptions.NotFound, google_exceptions.PermissionDenied):
+                if model is requested:
+                    raise
+                # The context cache expired or was deleted upstream; send the full prompt this time
+                prefix.invalidate()
+                response = await ai_service.generate_content(requested, contents)
+            return response
+        finally:
+            metrics_service.observe_gemini_call(call, time.perf_counter() - start, response)
+
+    async def _run_tool(self, name: str, runner, args):
+        """Executes a tool runner and records its latency and outcome."""
+        start = time.perf_counter()
+        try:
+            result = await runner(**args)
+        except Exception:
+            metrics_service.observe_tool_call(name, time.perf_counter() - start, ok=False)
+            raise
+        metrics_service.observe_tool_call(name, time.perf_counter() - start, ok=not metrics_service.is_error_result(result))
+        return result
+
+    async def _tool_turn_result(self, collected_tool_calls, tool_results, prefix):
+        """Builds the response for a turn that ran tools: one result with a short model summary, or all results."""
+        if len(tool_results) == 1:
+            # Attempt to generate a concise model summary if model available
+            try:
+                tool_response = tool_results[0]['function_response']['response']
+                # Convert Pydantic models to dict for better serialization
+                if hasattr(tool_response, '__dict__'):
+                    tool_response = tool_response.__dict__
+                elif hasattr(tool_response, 'model_dump'):
+                    tool_response = tool_response.model_dump()
+                elif isinstance(tool_response, list) and tool_response and hasattr(tool_response[0], 'model_dump'):
+                    tool_response = [item.model_dump() for item in tool_response]
+
+                result_text = tool_result_text(tool_response, settings.prompt_tool_result_tokens)
+                summary_prompt = f"Summarize the action result in one sentence: {result_text}"
+                summary_resp = await self._generate(summary_prompt, call="result_summary", prefix=prefix)
+                model_summary = getattr(summary_resp, 'text', None)
+            except Exception:
+                # Fallback: create a simple summary based on the tool name
+                tool_name = collected_tool_calls[0].get("name", "tool")
+                if "jira_get_projects" in tool_name:
+                    model_summary = "Retrieved the list of available Jira projects."
+                elif "jira_get_issues" in tool_name:
+                    model_summary = "Retrieved the list of Jira issues for the project."
+                else:
+                    model_summary = f"Executed {tool_name} successfully."
+            result = {
+                "result": tool_results[0]["function_response"]["response"],
+                "toolCalls": collected_tool_calls,
+                "model_summary": model_summary,
+            }
+        else:
+            result = {
+                "result": [tr["function_response"]["response"] for tr in tool_results],
+                "toolCalls": collected_tool_calls,
+                "model_summary": None,
+            }
+        return result
+
+    async def _replay(self, replay, prefix):
+        """Runs the calls of a stored plan in order; None when a value it looks up is not found and the model should plan."""
+        collected_tool_calls, tool_results = [], []
+        for step in range(len(replay)):
+            call = replay.call(step, [tr["function_response"]["response"] for tr in tool_results])
+            if call is None:
+                logger.info("Stored tool plan does not fit the request", extra={"tool_calls": collected_tool_calls})
+                # Once a write has run, report what ran rather than have the model plan it again
+                if all(c["name"] in READ_ONLY_TOOLS for c in collected_tool_calls):
+                    return None
+                break
+            collected_tool_calls.append(call)
+            try:
+                result = await self._run_tool(call["name"], ALL_TOOL_RUNNERS[call["name"]], call["args"])
+            except Exception as ex:
+                result = {"error": str(ex)}
+            tool_results.append({"function_response": {"name": call["name"], "response": result}})
+        return await self._tool_turn_result(collected_tool_calls, tool_results, prefix)
 
     async def run(self, prompt: str, session_id: str = None):
-        print(f"DEBUG: Coordinator run called with session_id: {session_id}")
+        with metrics_service.track_gemini_usage() as usage:
+            try:
+                return await self._run(prompt, session_id)
+            finally:
+                logger.info("Gemini usage for request", extra={"gemini_usage": usage.as_dict()})
+
+    async def _run(self, prompt: str, session_id: str = None):
+        logger.debug("Coordinator run called with session_id: %s", session_id)
         # Get or create context for this session
         context = context_service.get_or_create_context(session_id)
         
-        # Enhance prompt with context
-        context_info = context_service.get_context_for_prompt(prompt)
-        enhanced_prompt = f"{context_info}User request: {prompt}"
-        
         history = []
+        prefix = self._prefix_for(prompt)
+        # Requests planned before (reworded, or of the same shape) run the stored tool calls
+        earlier = _previous_calls(context)
+        if settings.plan_cache_enabled:
+            replay = self.plans.match(prompt)
+            result = await self._replay(replay, prefix) if replay is not None else None
+            if result is not None:
+                context.add_conversation(prompt, result)
+                context_service.save_context()
+                return result
+
+        # Enhance prompt with context, within the token budgets; older conversations go first
+        context_summary, conversations = context_service.get_prompt_sections(prompt)
+        enhanced_prompt = await build_prompt(
+            [
+                PromptSection("context", [context_summary] if context_summary else [], settings.prompt_context_tokens, priority=1),
+                PromptSection("history", conversations, settings.prompt_history_tokens, header="\nRecent conversation context:\n"),
+                PromptSection("request", [f"\n\nUser request: {prompt}" if context_summary else f"User request: {prompt}"]),
+            ],
+            settings.prompt_total_tokens,
+            model=self.counter,
+        )
+        
         # First turn with enhanced prompt
         try:
-            response = await self.model.generate_content_async(enhanced_prompt)
+            response = await self._generate(enhanced_prompt, call="plan", prefix=prefix)
         except Exception:
             # Fallback: plain text generation without tools
-            plain = genai.GenerativeModel("gemini-2.5-flash-lite")
-            resp = await plain.generate_content_async(enhanced_prompt)
+            plain = genai.GenerativeModel(MODEL_NAME)
+            resp = await self._generate(enhanced_prompt, call="plain_fallback", model=plain)
             return resp.text if getattr(resp, "text", None) else ""
 
         # Handle tool calls iteratively
@@ -411,7 +754,7 @@ class GeminiToolsAgent:
                     continue
                     
                 name = fc.name.strip()
-                args = dict(fc.args or {})
+                args = _plain_args(fc.args)
                 # Normalize missing or vague args from NL prompts
                 if name == "jira_create_issue":
                     if not args.get("project_key") and settings.jira_default_project_key:
@@ -443,7 +786,7 @@ class GeminiToolsAgent:
                     tool_results.append({"function_response": {"name": name, "response": {"error": f"Unknown tool: {name}"}}})
                     continue
                 try:
-                    result = await runner(**args)
+                    result = await self._run_tool(name, runner, args)
                     tool_results.append({"function_response": {"name": name, "response": result}})
                     any_tool_called = True
                     
@@ -563,7 +906,7 @@ Keep it under 100 words and make it suitable for team communication.
                                 """.strip()
                                 
                                 # Generate initial summary using the model
-                                summary_response = await self.model.generate_content_async(pr_summary_prompt)
+                                summary_response = await self._generate(pr_summary_prompt, call="email_summary", prefix=prefix)
                                 initial_summary = getattr(summary_response, 'text', 'Pull request has been closed.')
                                 
                                 # Add email workflow to result
@@ -586,42 +929,15 @@ Keep it under 100 words and make it suitable for team communication.
                     tool_results.append({"function_response": {"name": name, "response": {"error": str(ex)}}})
             # If we executed tools, return their raw responses immediately
             if any_tool_called and tool_results:
-                if len(tool_results) == 1:
-                    # Attempt to generate a concise model summary if model available
-                    try:
-                        tool_response = tool_results[0]['function_response']['response']
-                        # Convert Pydantic models to dict for better serialization
-                        if hasattr(tool_response, '__dict__'):
-                            tool_response = tool_response.__dict__
-                        elif hasattr(tool_response, 'model_dump'):
-                            tool_response = tool_response.model_dump()
-                        elif isinstance(tool_response, list) and tool_response and hasattr(tool_response[0], 'model_dump'):
-                            tool_response = [item.model_dump() for item in tool_response]
-                        
-                        summary_prompt = f"Summarize the action result in one sentence: {tool_response}"
-                        summary_resp = await self.model.generate_content_async(summary_prompt)
-                        model_summary = getattr(summary_resp, 'text', None)
-                    except Exception:
-                        # Fallback: create a simple summary based on the tool name
-                        tool_name = collected_tool_calls[0].get("name", "tool")
-                        if "jira_get_projects" in tool_name:
-                            model_summary = "Retrieved the list of available Jira projects."
-                        elif "jira_get_issues" in tool_name:
-                            model_summary = "Retrieved the list of Jira issues for the project."
-                        else:
-                            model_summary = f"Executed {tool_name} successfully."
-                    result = {
-                        "result": tool_results[0]["function_response"]["response"],
-                        "toolCalls": collected_tool_calls,
-                        "model_summary": model_summary,
-                    }
-                else:
-                    result = {
-                        "result": [tr["function_response"]["response"] for tr in tool_results],
-                        "toolCalls": collected_tool_calls,
-                        "model_summary": None,
-                    }
-                
+                result = await self._tool_turn_result(collected_tool_calls, tool_results, prefix)
+
+                # Remember a successful plan the model made, for reworded requests and requests of the same shape
+                if settings.plan_cache_enabled and not any(
+                    metrics_service.is_error_result(tr["function_response"]["response"]) for tr in tool_results
+                ):
+                    responses = [tr["function_response"]["response"] for tr in tool_results]
+                    self.plans.store(prompt, collected_tool_calls, responses, earlier=earlier)
+
                 # Save context after tool execution
                 context.add_conversation(prompt, result)
                 context_service.save_context()
@@ -630,7 +946,11 @@ Keep it under 100 words and make it suitable for team communication.
 
             # Otherwise, attempt to continue the loop by passing tool_results back to the model
             try:
-                response = await self.model.generate_content_async(tool_results)
+                followup = [
+                    {"function_response": {**tr["function_response"], "response": fit_tool_response(tr["function_response"]["response"], settings.prompt_tool_result_tokens)}}
+                    for tr in tool_results
+                ]
+                response = await self._generate(followup, call="tool_followup", prefix=prefix)
             except Exception:
                 break
 
@@ -0,0 +1,493 @@
+import copy
+import logging
+import math
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..adk_tools import ALL_TOOL_RUNNERS
+from ..config.settings import settings
+from ..services import metrics_service
+from ..services.cache import TTLCache
+from .tool_selector import terms
+
+logger = logging.getLogger(__name__)
+
+# Tools that only read: replaying their plan for a reworded request fetches fresh data and changes nothing
+READ_ONLY_TOOLS = frozenset({
+    "jira_fetch_issue",
+    "jira_fetch_issues",
+    "jira_get_projects",
+    "jira_get_issues_for_project",
+    "jira_get_issue_comments",
+    "jira_get_possible_transitions",
+    "jira_get_sprints",
+    "github_get_repos",
+    "github_get_branches",
+    "github_get_issues",
+    "github_get_pull_requests",
+    "github_get_repos_overview",
+    "github_get_pr_files",
+    "github_get_pr_file_patch",
+    "github_summarize_pr",
+    "issues_search",
+})
+
+# Requests resolved against the session context ('this pr', 'the same repo') mean different things later
+_CONTEXT_REFERENCE = re.compile(r"\b(this|that|these|those|it|its|them|previous|last|current|same|again|above)\b")
+
+# Words that name a tool's action or object ('issue', 'pull', 'branche', 'create', 'merge', ...)
+_TOOL_WORDS = frozenset(word for name in ALL_TOOL_RUNNERS for word in terms(name))
+
+# Tools the orchestrator wraps in a confirmation or notification step after the call (the email
+# workflows of PR creation and closing); a replay runs calls bare, so these are never templated
+_CONFIRMED_TOOLS = frozenset(name for name in ALL_TOOL_RUNNERS if "email" in name) | {
+    "github_create_pull_request",
+    "github_close_pull_request",
+}
+
+# Dimensions of the hashed term vectors; collisions are rare at the vocabulary size of requests
+_DIMENSIONS = 1 << 16
+
+
+def _words(prompt: str) -> str:
+    """Request words separated by single spaces, as typed; identifiers like TP-12 or owner/repo stay whole."""
+    words = re.findall(r"[\w./@#-]+", prompt)
+    return " ".join(w.strip(".-#") for w in words if w.strip(".-#"))
+
+
+def normalize(prompt: str) -> str:
+    """Lower-cased request words separated by single spaces, keeping identifiers like tp-12 or owner/repo whole."""
+    return _words(prompt.lower())
+
+
+def embed(prompt: str) -> Dict[int, float]:
+    """Unit-length hashed bag of the prompt's terms (feature hashing; no vocabulary to keep)."""
+    vector: Dict[int, float] = {}
+    for term, count in Counter(t for t in terms(prompt) if len(t) > 1).items():
+        digest = zlib.crc32(term.encode())
+        index = digest % _DIMENSIONS
+        sign = 1.0 if digest & (1 << 31) else -1.0
+        vector[index] = vector.get(index, 0.0) + sign * count
+    norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+    return {index: w / norm for index, w in vector.items()}
+
+
+def _similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(index, 0.0) for index, w in a.items())
+
+
+def _identifiers(normalized: str) -> frozenset:
+    """Words with a digit in them: issue keys, PR numbers, dates."""
+    return frozenset(w for w in normalized.split() if any(c.isdigit() for c in w))
+
+
+def _values(args: Dict[str, Any], types: tuple = (str, int)) -> List[str]:
+    """Normalized scalar argument values of the given types, list items included."""
+    values = []
+    for value in args.values():
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, types) and not isinstance(item, bool):
+                text = normalize(str(item))
+                if text:
+                    values.append(text)
+    return values
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _tool_words(text: str) -> frozenset:
+    return frozenset(terms(text)) & _TOOL_WORDS
+
+
+def _loose(text: str) -> str:
+    return f" {re.sub(r'[-_/]', ' ', text)} "
+
+
+def _contains(normalized: str, phrase: str) -> bool:
+    """Whether the words of `phrase` occur together in the request; 'in-progress' matches 'in progress'."""
+    return _loose(phrase) in _loose(normalized)
+
+
+def _occurrences(text: str) -> "re.Pattern":
+    """Where `text` stands as whole words in a request; 'bench' and 'repo-1' both stand in 'bench/repo-1'."""
+    return re.compile(rf"(?<![^\s/]){re.escape(text)}(?![^\s/])")
+
+
+def _shape(text: str) -> str:
+    """Regex for a value with the same words and separators as `text`: 'tp-1' fits 'bench-12', not 'in progress'."""
+    return "".join(part if part in (" ", "/") else r"[^\s/]+" for part in re.split(r"([ /])", text) if part)
+
+
+def _has_digit(text: str) -> bool:
+    return any(c.isdigit() for c in text)
+
+
+def _fits_slot(text: str, digits: bool) -> bool:
+    """Whether `text` can stand for a value: a key or number for a key or number, words (not tool words) for words."""
+    if _has_digit(text) != digits or _CONTEXT_REFERENCE.search(text.lower()):
+        return False
+    return digits or bool(terms(text)) and not _tool_words(text)
+
+
+def _dicts(value: Any) -> Iterator[Dict[str, Any]]:
+    """Every mapping in a tool result, nested ones included."""
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from _dicts(child)
+    elif isinstance(value, (list, tuple)):
+        for child in value:
+            yield from _dicts(child)
+
+
+@dataclass(frozen=True)
+class _Slot:
+    """An argument taken from the request: the words in slot `index` exactly as typed, or their number."""
+
+    index: int
+    integer: bool = False
+
+    def value(self, text: str) -> Any:
+        if self.integer:
+            if not text.isdigit():
+                raise LookupError(text)
+            return int(text)
+        return text
+
+
+@dataclass(frozen=True)
+class _Derived:
+    """A text argument looked up in the result of call `step`: `key` of the item whose `field` reads like slot `slot`."""
+
+    step: int
+    key: str
+    field: str
+    slot: int
+
+
+class Replay:
+    """Tool calls to run for a request without asking the model.
+
+    Arguments are literal values, words of the request (`_Slot`) or values looked up in
+    the result of an earlier call (`_Derived`, e.g. the id of the transition named like
+    the requested status), so the calls are resolved one by one as they run.
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]], values: Sequence[str] = ()):
+        self.steps = steps
+        self.values = tuple(values)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def call(self, step: int, responses: List[Any]) -> Optional[Dict[str, Any]]:
+        """Name and arguments of call `step` given the responses of the calls before it; None when a value is not found."""
+        try:
+            args = {key: self._resolve(value, responses) for key, value in self.steps[step]["args"].items()}
+        except LookupError:
+            return None
+        return {"name": self.steps[step]["name"], "args": args}
+
+    def _resolve(self, value: Any, responses: List[Any]) -> Any:
+        if isinstance(value, list):
+            return [self._resolve(item, responses) for item in value]
+        if isinstance(value, _Slot):
+            return value.value(self.values[value.index])
+        if isinstance(value, _Derived):
+            wanted = _loose(normalize(self.values[value.slot])).split()
+            for item in _dicts(responses[value.step]):
+                if value.key in item and _loose(normalize(str(item.get(value.field, "")))).split() == wanted:
+                    return str(item[value.key])
+            raise LookupError(self.values[value.slot])
+        return copy.deepcopy(value)
+
+
+@dataclass
+class CachedPlan:
+    """Tool calls the model chose for a request, with the argument values taken from its wording."""
+
+    prompt: str
+    vector: Dict[int, float]
+    calls: List[Dict[str, Any]]
+    # Argument values that appear in the request; a reworded request must mention them too
+    grounded: Tuple[str, ...]
+    identifiers: frozenset
+    # Terms of the request and words of the called tools' names
+    vocabulary: frozenset
+
+
+@dataclass
+class PlanTemplate:
+    """A request shape with slots for its values ('move {0} to {1}') and the tool calls it leads to."""
+
+    template: str
+    pattern: "re.Pattern"
+    # Whether each slot's recorded value had a digit in it; new values must match
+    digits: Tuple[bool, ...]
+    steps: List[Dict[str, Any]]
+    # Characters outside the slots; the most specific matching template wins
+    literal: int
+
+
+def _build_template(typed: str, pairs: List[Tuple[Dict[str, Any], Any]], first: int) -> Optional[PlanTemplate]:
+    """Turns the calls of a request into a template; None when one of their values has no source.
+
+    `pairs` are (call, response) in the order they ran; those before `first` are the
+    previous turn's, kept only when a value of this request's calls is looked up in them.
+    """
+    # Slot spans are found in the lower-cased words and their values read from the words as typed
+    normalized = typed.lower()
+    if len(normalized) != len(typed):
+        return None
+    calls = [call for call, _ in pairs]
+    if any(call["name"] in _CONFIRMED_TOOLS or call["name"] not in ALL_TOOL_RUNNERS for call in calls[first:]):
+        return None
+    claimed: List[Tuple[int, int, str]] = []
+    slots: Dict[str, int] = {}
+    spans: Dict[str, str] = {}
+
+    def claim(text: str) -> Optional[int]:
+        """Slot of `text`, taking its first occurrence in the request not inside another slot."""
+        if text in slots:
+            return slots[text]
+        if not _fits_slot(text, _has_digit(text)):
+            return None
+        for m in _occurrences(text).finditer(normalized):
+            if all(m.end() <= start or m.start() >= end for start, end, _ in claimed):
+                claimed.append((m.start(), m.end(), text))
+                slots[text] = len(slots)
+                spans[text] = typed[m.start():m.end()]
+                return slots[text]
+        return None
+
+    # Longest values first, so 'bench/repo-1' is one slot rather than 'bench' and a literal rest
+    spelled = {normalize(str(v)) for call in calls[first:] for v in _values(call["args"])}
+    for text in sorted(spelled, key=len, reverse=True):
+        claim(text)
+
+    def derive(value: Any, step: int) -> Optional[_Derived]:
+        for source in range(step):
+            if source < first and calls[source]["name"] not in READ_ONLY_TOOLS:
+                continue
+            for item in _dicts(pairs[source][1]):
+                for key, found in item.items():
+                    if isinstance(found, bool) or not isinstance(found, (str, int)) or str(found) != str(value):
+                        continue
+                    for field, label in item.items():
+                        slot = claim(normalize(label)) if field != key and isinstance(label, str) else None
+                        if slot is not None:
+                            return _Derived(source, key, field, slot)
+        return None
+
+    derived: Dict[Tuple[int, str, int], _Derived] = {}
+    for step in range(first, len(calls)):
+        for key, value in calls[step]["args"].items():
+            for position, item in enumerate(value if isinstance(value, list) else [value]):
+                text = normalize(str(item))
+                if not _is_scalar(item) or text in slots or _contains(normalized, text):
+                    continue
+                source = derive(item, step)
+                if source is None:
+                    return None
+                derived[(step, key, position)] = source
+
+    def template_args(step: int) -> Dict[str, Any]:
+        args = {}
+        for key, value in calls[step]["args"].items():
+            items = []
+            for position, item in enumerate(value if isinstance(value, list) else [value]):
+                text = normalize(str(item))
+                integer = isinstance(item, int) and not isinstance(item, bool)
+                if (step, key, position) in derived:
+                    item = derived[(step, key, position)]
+                elif text in slots and (integer or item == spans[text]):
+                    # Only values the model took verbatim become slots; a re-cased one stays literal
+                    item = _Slot(slots[text], integer)
+                items.append(item)
+            args[key] = items if isinstance(value, list) else items[0]
+        return args
+
+    # Earlier-turn calls are kept only when a value is looked up in them, and then run first
+    kept = sorted({d.step for d in derived.values() if d.step < first}) + list(range(first, len(calls)))
+    steps = [{"name": calls[step]["name"], "args": template_args(step)} for step in kept]
+    used = {leaf.index if isinstance(leaf, _Slot) else leaf.slot for leaf in _leaves(steps) if isinstance(leaf, (_Slot, _Derived))}
+
+    # Slots no call reads stay literal words; numbered in the order they appear
+    claimed = sorted(c for c in claimed if slots[c[2]] in used)
+    order = {slots[text]: n for n, (_, _, text) in enumerate(claimed)}
+    steps = [{"name": call["name"], "args": _renumber(call["args"], {s: p for p, s in enumerate(kept)}, order)} for call in steps]
+    literal_text = normalized
+    for start, end, _ in claimed:
+        literal_text = literal_text[:start] + " " * (end - start) + literal_text[end:]
+    literal_text = " ".join(literal_text.split())
+    # Arguments that are not slots, numbers included, must be spelled out in the rest of the request
+    if not terms(literal_text) or not all(
+        _contains(literal_text, normalize(str(leaf))) for leaf in _leaves(steps) if _is_scalar(leaf)
+    ):
+        return None
+
+    # Slots only used to look a value up may take any number of words ('Done', 'In Progress'): the lookup checks them
+    looked_up = {leaf.slot for leaf in _leaves(steps) if isinstance(leaf, _Derived)}
+    looked_up -= {leaf.index for leaf in _leaves(steps) if isinstance(leaf, _Slot)}
+    pattern, template, position = "", "", 0
+    for start, end, text in claimed:
+        slot = order[slots[text]]
+        shape = r"[^/]+?" if slot in looked_up else _shape(text)
+        pattern += re.escape(normalized[position:start]) + f"(?P<s{slot}>{shape})"
+        template += normalized[position:start] + f"{{{slot}}}"
+        position = end
+    pattern += re.escape(normalized[position:])
+    template += normalized[position:]
+    digits = tuple(_has_digit(text) for _, _, text in claimed)
+    return PlanTemplate(template, re.compile(pattern, re.IGNORECASE), digits, steps, len(literal_text))
+
+
+def _leaves(steps: List[Dict[str, Any]]) -> Iterator[Any]:
+    for call in steps:
+        for value in call["args"].values():
+            yield from value if isinstance(value, list) else [value]
+
+
+def _renumber(value: Any, steps: Dict[int, int], slots: Dict[int, int]) -> Any:
+    """Points slots and looked-up values at their final step and slot numbers."""
+    if isinstance(value, dict):
+        return {key: _renumber(item, steps, slots) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_renumber(item, steps, slots) for item in value]
+    if isinstance(value, _Slot):
+        return _Slot(slots[value.index], value.integer)
+    if isinstance(value, _Derived):
+        return _Derived(steps[value.step], value.key, value.field, slots[value.slot])
+    return value
+
+
+class PlanCache:
+    """Reuses the model's tool plan for reworded read-only requests.
+
+    "what's in progress in TP" and "show in-progress TP issues" lead to the same tool calls,
+    so once the model has planned one of them the other is answered by running the stored
+    calls again, skipping the planning call. Only the plan is reused: the tools run and
+    fetch current data every time. A stored plan matches when its request's hashed term
+    vector is at least PLAN_CACHE_THRESHOLD similar, every argument value taken from the
+    stored request also appears in the new one and both mention the same identifiers (issue
+    keys, numbers), so "issues in TP" never answers "issues in TQ". The new request also may
+    not use a word the stored one did not, other than words of the called tools' names:
+    "open PRs in repo-1" never reuses the plan of "open issues in repo-1", nor "issues in TP
+    assigned to me" that of "issues in TP", whose calls would drop the filter.
+
+    Requests of a shape seen before are matched by template too: "move TP-1 to Done",
+    planned by the model as jira_get_possible_transitions then jira_transition_issue,
+    becomes "move {0} to {1}", and "move TP-7 to In Progress" runs the same two calls with
+    TP-7 and the id of the transition named "In Progress" - writes included, as the calls
+    are the ones the model made for a request of exactly this shape. Values looked up in
+    an earlier result that cannot be found there leave the request to the model.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 86400.0):
+        self._plans = TTLCache("plan", ttl=ttl, maxsize=maxsize)
+        self._templates = TTLCache("plan_template", ttl=ttl, maxsize=maxsize)
+
+    def __len__(self) -> int:
+        return len(self._plans) + len(self._templates)
+
+    def match(self, prompt: str) -> Optional[Replay]:
+        """The calls to run for `prompt`: a template's with this request's values, else a reworded request's; or None."""
+        if settings.plan_templates_enabled:
+            replay = self._match_template(_words(prompt))
+            if replay is not None:
+                return replay
+        calls = self.lookup(prompt)
+        return Replay(calls) if calls is not None else None
+
+    def _match_template(self, typed: str) -> Optional[Replay]:
+        """Values are taken as typed; only the template's words match regardless of case."""
+        best: Tuple[Optional[PlanTemplate], List[str]] = (None, [])
+        for template, _ in self._templates.items().values():
+            m = template.pattern.fullmatch(typed)
+            if m is None or (best[0] is not None and best[0].literal >= template.literal):
+                continue
+            values = [m.group(f"s{n}") for n in range(len(template.digits))]
+            if all(_fits_slot(value, digits) for value, digits in zip(values, template.digits)):
+                best = (template, values)
+        template, values = best
+        if template is None:
+            metrics_service.observe_cache_lookup("plan_template", hit=False)
+            return None
+        self._templates.get(template.pattern.pattern)
+        logger.debug("Running tool plan of template", extra={"template": template.template, "values": values})
+        return Replay(copy.deepcopy(template.steps), values)
+
+    def lookup(self, prompt: str) -> Optional[List[Dict[str, Any]]]:
+        """The stored tool calls for a request like `prompt`, or None."""
+        normalized = normalize(prompt)
+        vector = embed(normalized)
+        identifiers = _identifiers(normalized)
+        vocabulary = frozenset(terms(normalized))
+        best: Tuple[float, Optional[str]] = (settings.plan_cache_threshold, None)
+        for key, (plan, _) in self._plans.items().items():
+            # Any other term may be a filter the plan does not apply ('assigned to me', 'blocked', 'by alice')
+            if plan.identifiers != identifiers or not vocabulary <= plan.vocabulary:
+                continue
+            if not all(_contains(normalized, v) for v in plan.grounded):
+                continue
+            score = _similarity(vector, plan.vector)
+            if score >= best[0]:
+                best = (score, key)
+        if best[1] is None:
+            metrics_service.observe_cache_lookup("plan", hit=False)
+            return None
+        _, plan = self._plans.get(best[1])
+        logger.debug("Reusing tool plan", extra={"cached_prompt": plan.prompt, "similarity": round(best[0], 3)})
+        return copy.deepcopy(plan.calls)
+
+    def store(
+        self,
+        prompt: str,
+        calls: List[Dict[str, Any]],
+        responses: Optional[List[Any]] = None,
+        earlier: Sequence[Tuple[Dict[str, Any], Any]] = (),
+    ) -> bool:
+        """Keeps the plan of a request when it can be replayed safely; returns whether it was kept.
+
+        Plans with a write, and plans with arguments that the request does not spell out
+        (resolved from the session context), are not kept for reworded requests. With
+        the calls' `responses`, the plan is also kept as a template when each argument, numbers
+        included, is a word of the request or is looked up in an earlier result - of this request's
+        calls or of the `earlier` (call, response) pairs of the previous turn.
+        """
+        normalized = normalize(prompt)
+        if not calls or _CONTEXT_REFERENCE.search(normalized) or not terms(normalized):
+            return False
+        kept = False
+        if settings.plan_templates_enabled and responses is not None:
+            template = _build_template(_words(prompt), list(earlier) + list(zip(calls, responses)), len(earlier))
+            if template is not None:
+                self._templates.set(template.pattern.pattern, template)
+                kept = True
+        return self._store_plan(normalized, calls) or kept
+
+    def _store_plan(self, normalized: str, calls: List[Dict[str, Any]]) -> bool:
+        if any(call["name"] not in READ_ONLY_TOOLS for call in calls):
+            return False
+        # Arguments not found in the request, numbers included, came from the session context
+        # or the model's own guess; a reworded request in another session may need other values
+        grounded = tuple(v for call in calls for v in _values(call["args"]))
+        if not all(_contains(normalized, v) for v in grounded):
+            return False
+        vocabulary = frozenset(terms(normalized)) | _tool_words(" ".join(call["name"] for call in calls))
+        plan = CachedPlan(normalized, embed(normalized), copy.deepcopy(calls), grounded, _identifiers(normalized), vocabulary)
+        self._plans.set(normalized, plan)
+        return True
+
+    def clear(self) -> None:
+        self._plans.invalidate()
+        self._templates.invalidate()
@@ -0,0 +1,201 @@
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config.settings import settings
+from ..services import ai_service, metrics_service
+from ..services.ai_service import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# fit_value shortens long strings in a tool result down to this many characters before dropping list items
+MIN_STRING_CHARS = 200
+
+
+@dataclass
+class PromptSection:
+    """One part of an assembled prompt.
+
+    `parts` are ordered least important first (e.g. oldest conversation first): when the
+    section is over its `budget`, leading parts are dropped and then the last remaining
+    one is cut. A section without a budget - the user's request - is never trimmed. When
+    the whole prompt is over the total budget, sections are trimmed further in order of
+    `priority`, lowest first.
+    """
+
+    name: str
+    parts: List[str]
+    budget: Optional[int] = None
+    priority: int = 0
+    header: str = ""
+
+
+def fit_text(text: str, budget: int) -> str:
+    """Cuts `text` to about `budget` tokens at a line end, noting how much was left out."""
+    if estimate_tokens(text) <= budget:
+        return text
+    # Leave room for the note itself
+    max_chars = max(budget - 10, 0) * 4
+    cut = text.rfind("\n", 0, max_chars)
+    cut = cut if cut > max_chars // 2 else max_chars
+    return f"{text[:cut]}\n[... {estimate_tokens(text[cut:])} tokens omitted]\n"
+
+
+class _Omitted:
+    """Placeholder for the tail of a list cut by `fit_value`."""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def __str__(self) -> str:
+        return f"... {self.count} more items"
+
+
+def _plain(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return _plain(value.model_dump())
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def _cap_strings(value: Any, limit: int) -> Any:
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + " [... truncated]"
+    if isinstance(value, dict):
+        return {k: _cap_strings(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_cap_strings(v, limit) for v in value]
+    return value
+
+
+def _lists(parent: Any, key: Any) -> Iterator[Tuple[int, Any, Any]]:
+    """Yields (rendered size, parent, key) of every list of several items under parent[key]."""
+    node = parent[key]
+    if isinstance(node, list) and len(node) - isinstance(node[-1] if node else None, _Omitted) > 1:
+        yield len(_dump(node)), parent, key
+    if isinstance(node, dict):
+        for child in node:
+            yield from _lists(node, child)
+    elif isinstance(node, list):
+        for index in range(len(node)):
+            yield from _lists(node, index)
+
+
+def fit_value(value: Any, budget: int) -> str:
+    """Renders a tool result as compact JSON of at most about `budget` tokens.
+
+    Long strings (descriptions, bodies) are shortened first, down to MIN_STRING_CHARS;
+    then the largest list is cut to its first half, noting how many items were left out,
+    until the result fits. The result keeps its shape and first entries rather than
+    losing its end wholesale.
+    """
+    root = [_plain(value)]
+    text = _dump(root[0])
+    limit = len(text)
+    while estimate_tokens(text) > budget and limit > MIN_STRING_CHARS:
+        limit = max(limit // 2, MIN_STRING_CHARS)
+        root[0] = _cap_strings(root[0], limit)
+        text = _dump(root[0])
+    while estimate_tokens(text) > budget:
+        candidates = list(_lists(root, 0))
+        if not candidates:
+            return fit_text(text, budget)
+        _, parent, key = max(candidates, key=lambda candidate: candidate[0])
+        node = parent[key]
+        omitted = node.pop().count if isinstance(node[-1], _Omitted) else 0
+        keep = max(len(node) // 2, 1)
+        node[keep:] = [_Omitted(omitted + len(node) - keep)]
+        text = _dump(root[0])
+    return text
+
+
+def _render_result(value: Any, budget: int) -> Tuple[str, bool]:
+    text = _dump(_plain(value))
+    trimmed = estimate_tokens(text) > budget
+    if trimmed:
+        text = fit_value(value, budget)
+    metrics_service.observe_prompt_section("tool_results", estimate_tokens(text), trimmed=trimmed)
+    return text, trimmed
+
+
+def tool_result_text(value: Any, budget: int) -> str:
+    """A tool result rendered for a prompt within `budget` tokens; recorded as the `tool_results` section."""
+    return _render_result(value, budget)[0]
+
+
+def fit_tool_response(response: Any, budget: int) -> Any:
+    """A function response to send back to the model: `response` itself, or a cut-down rendering when too big."""
+    text, trimmed = _render_result(response, budget)
+    return {"result": text, "truncated": True} if trimmed else response
+
+
+def _section_text(section: PromptSection, parts: List[str]) -> str:
+    return section.header + "".join(parts) if parts else ""
+
+
+def _trim(section: PromptSection, parts: List[str], budget: int) -> List[str]:
+    """Drops leading parts, then cuts the last one, until the section fits `budget` tokens."""
+    parts = list(parts)
+    while len(parts) > 1 and estimate_tokens(_section_text(section, parts)) > budget:
+        parts.pop(0)
+    if parts and estimate_tokens(_section_text(section, parts)) > budget:
+        room = budget - estimate_tokens(section.header)
+        parts = [fit_text(parts[0], room)] if room > 0 else []
+    return parts
+
+
+def assemble_prompt(sections: List[PromptSection], total_budget: int) -> Tuple[str, Dict[str, int], List[str]]:
+    """Joins the sections within their own budgets and `total_budget` (tokens).
+
+    Returns the prompt, the estimated tokens of each section and the names of the
+    sections that had to be trimmed.
+    """
+    kept = {s.name: _trim(s, s.parts, s.budget) if s.budget is not None else list(s.parts) for s in sections}
+    trimmed = [s.name for s in sections if kept[s.name] != s.parts]
+
+    def tokens(section: PromptSection) -> int:
+        text = _section_text(section, kept[section.name])
+        return estimate_tokens(text) if text else 0
+
+    over = sum(tokens(s) for s in sections) - total_budget
+    for section in sorted((s for s in sections if s.budget is not None), key=lambda s: s.priority):
+        if over <= 0:
+            break
+        before = tokens(section)
+        kept[section.name] = _trim(section, kept[section.name], max(before - over, 0))
+        over -= before - tokens(section)
+        if section.name not in trimmed and kept[section.name] != section.parts:
+            trimmed.append(section.name)
+
+    prompt = "".join(_section_text(s, kept[s.name]) for s in sections)
+    return prompt, {s.name: tokens(s) for s in sections}, trimmed
+
+
+async def build_prompt(sections: List[PromptSection], total_budget: int, model=None) -> str:
+    """Assembles the prompt and records each section's size in the request's usage.
+
+    With PROMPT_EXACT_TOKEN_COUNT and a `model`, the result is also counted by Gemini;
+    if the local estimate turned out too low, the sections are assembled again against a
+    budget scaled down by the error.
+    """
+    prompt, counts, trimmed = assemble_prompt(sections, total_budget)
+    if model is not None and settings.prompt_exact_token_count:
+        try:
+            exact = await ai_service.count_tokens(model, prompt)
+        except Exception as e:
+            logger.info("Could not count prompt tokens, keeping the estimate: %s", e)
+        else:
+            estimate = sum(counts.values())
+            if exact > total_budget and estimate:
+                prompt, counts, trimmed = assemble_prompt(sections, total_budget * estimate // exact)
+    for name, count in counts.items():
+        metrics_service.observe_prompt_section(name, count, trimmed=name in trimmed)
+    return prompt
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any, List, Optional
+
+import google.generativeai as genai
+from google.generativeai import caching
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPrefixModel:
+    """Serves the orchestrator model with its static prefix held in a Gemini context cache.
+
+    The system instruction and tool declarations are the same on every call, so they are
+    uploaded once as a CachedContent and later calls only send the turn itself; Gemini
+    bills the cached prefix at the reduced cached-token rate. The cache is created on first
+    use, extended shortly before its TTL runs out and recreated if it is gone. When caching
+    is disabled or unsupported (prefix below the model's minimum size, an endpoint without
+    the cachedContents API, ...) `plain` - the same model without a cache - is served and
+    creation is retried after GEMINI_CONTEXT_CACHE_RETRY seconds.
+    """
+
+    # Extend the cache this long before it expires, so an in-flight call never races the expiry
+    REFRESH_MARGIN = 60.0
+
+    def __init__(self, model_name: str, system_instruction: str, tools: List[Any]):
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.tools = tools
+        self.plain = genai.GenerativeModel(model_name, tools=tools, system_instruction=system_instruction)
+        self._content: Optional[caching.CachedContent] = None
+        self._model = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def active(self) -> bool:
+        """True while calls go through the context cache."""
+        return self._model is not None and time.monotonic() < self._expires_at
+
+    async def get(self):
+        """Returns the cache-backed model, or `plain` when no cache is available."""
+        if not settings.gemini_context_cache_enabled:
+            return self.plain
+        now = time.monotonic()
+        if self._model is not None and now < self._expires_at - self.REFRESH_MARGIN:
+            return self._model
+        if now < self._retry_at:
+            return self._model if self.active else self.plain
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another call may have refreshed the cache while this one waited
+            if self._model is None or time.monotonic() >= self._expires_at - self.REFRESH_MARGIN:
+                await self._refresh()
+        return self._model if self.active else self.plain
+
+    async def _refresh(self) -> None:
+        ttl = timedelta(seconds=settings.gemini_context_cache_ttl)
+        if self._content is not None and self.active:
+            # Still alive: pushing the expiry out is cheaper than uploading the prefix again
+            try:
+                await asyncio.to_thread(self._content.update, ttl=ttl)
+                self._expires_at = time.monotonic() + settings.gemini_context_cache_ttl
+                return
+            except Exception as e:
+                logger.info("Could not extend Gemini context cache, recreating it: %s", e)
+        try:
+            self._content = await asyncio.to_thread(
+                caching.CachedContent.create,
+                model=self.model_name,
+                display_name="fastmcp-orchestrator",
+                system_instruction=self.system_instruction,
+                tools=self.tools,
+                ttl=ttl,
+            )
+            self._model = genai.GenerativeModel.from_cached_content(self._content)
+            self._expires_at = time.monotonic() + settings.gemini_context_cache_ttl
+            logger.info(
+                "Created Gemini context cache",
+                extra={"cache": self._content.name, "cached_tokens": _cached_tokens(self._content)},
+            )
+        except Exception as e:
+            self.invalidate()
+            logger.warning("Gemini context caching unavailable, sending the full prompt: %s", e)
+            self._retry_at = time.monotonic() + settings.gemini_context_cache_retry
+
+    def invalidate(self) -> None:
+        """Stops using the current cache, e.g. after a call reported it missing; the next get() recreates it."""
+        self._model = None
+        self._content = None
+        self._expires_at = 0.0
+
+
+def _cached_tokens(content: caching.CachedContent) -> Optional[int]:
+    try:
+        return content.usage_metadata.total_token_count
+    except AttributeError:
+        return None
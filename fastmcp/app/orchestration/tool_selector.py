@@ -0,0 +1,113 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Tools scoring below this fraction of the best match are not offered even within top_k
+RELATIVE_CUTOFF = 0.25
+
+# Words that say nothing about which tool is meant
+_STOPWORDS = {
+    "a", "all", "an", "and", "any", "are", "as", "at", "be", "by", "call", "can", "do", "for", "from", "get",
+    "i", "in", "is", "it", "me", "my", "of", "on", "or", "please", "show", "the", "then", "this", "to",
+    "use", "what", "with", "you",
+}
+
+
+def _phrases(pattern: str) -> List["re.Pattern"]:
+    """The request shapes a pattern quotes with placeholders ('move [ticket] to [status]') as regexes."""
+    shapes = []
+    for phrase in re.findall(r"'([^']*\[[^']*)'", pattern):
+        parts = (re.sub(r"\\\s+", r"\\s+", re.escape(part)) for part in re.split(r"\[[^\]]*\]", phrase.lower()))
+        shapes.append(re.compile(r"(?<!\w)" + ".+?".join(parts) + r"(?!\w)"))
+    return shapes
+
+
+def terms(text: str) -> List[str]:
+    """Lower-cased words of `text` without stopwords and numbers, plural 's' stripped; tool names split at '_'."""
+    words = re.findall(r"[a-z0-9]+", text.lower().replace("_", " "))
+    return [
+        w[:-1] if len(w) > 2 and w.endswith("s") and not w.endswith("ss") else w
+        for w in words
+        if w not in _STOPWORDS and not w.isdigit()
+    ]
+
+
+class ToolSelector:
+    """Picks the function declarations relevant to a prompt by TF-IDF similarity.
+
+    Each tool's document is its name, description and parameters plus every "Common
+    patterns" line that mentions it, so the phrasings users actually type ('merge this
+    pr', 'show sprints') count. Vectors are computed once when the agent starts; ranking a
+    prompt is one sparse dot product per tool, well under a millisecond.
+    """
+
+    def __init__(self, declarations: List[Dict[str, Any]], patterns: List[str], rules: str = ""):
+        self.declarations = declarations
+        self.names = [d["name"] for d in declarations]
+        self.patterns = patterns
+        # Tools the general rules refer to (follow-up workflows) are offered with every subset
+        self.always = set(self.mentioned(rules))
+        self._pattern_tools = [self.mentioned(p) for p in patterns]
+        self._pattern_shapes = [_phrases(p) for p in patterns]
+
+        docs = {d["name"]: [d["name"], d.get("description", "")] for d in declarations}
+        for d in declarations:
+            for param, schema in (d.get("parameters") or {}).get("properties", {}).items():
+                docs[d["name"]] += [param, schema.get("description", "")]
+        for pattern, tools in zip(patterns, self._pattern_tools):
+            for name in tools:
+                docs[name].append(pattern)
+
+        counts = {name: Counter(terms(" ".join(parts))) for name, parts in docs.items()}
+        document_frequency = Counter(term for terms in counts.values() for term in terms)
+        total = len(counts)
+        self._idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        self._vectors = {name: self._normalize(terms) for name, terms in counts.items()}
+
+    def mentioned(self, text: str) -> List[str]:
+        """Names of the tools that `text` refers to."""
+        return [name for name in self.names if re.search(rf"\b{name}\b", text)]
+
+    def _normalize(self, counts: Counter) -> Dict[str, float]:
+        weights = {term: (1 + math.log(n)) * self._idf[term] for term, n in counts.items() if term in self._idf}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {term: w / norm for term, w in weights.items()}
+
+    def scores(self, prompt: str) -> Dict[str, float]:
+        """Cosine similarity of the prompt to every tool."""
+        query = self._normalize(Counter(terms(prompt)))
+        return {name: sum(query.get(term, 0.0) * w for term, w in vector.items()) for name, vector in self._vectors.items()}
+
+    def select(self, prompt: str, top_k: int) -> Optional[List[str]]:
+        """Names of the tools to offer for `prompt`, in declaration order.
+
+        That is the `top_k` best matching tools (ignoring weak matches far below the best
+        one), the tools named in the same pattern as one of them (the second step of 'first
+        call X, then call Y'), the tools of every pattern whose quoted request shape the
+        prompt has ('move [ticket] to [status]'), however they score, and the `always` tools.
+        Returns None - offer every tool - when nothing in the prompt matches any tool, e.g.
+        questions about previous work that are answered from the session context.
+        """
+        scores = self.scores(prompt)
+        best = max(scores.values(), default=0.0)
+        if best <= 0:
+            return None
+        ranked = sorted((name for name in self.names if scores[name] >= best * RELATIVE_CUTOFF), key=lambda name: -scores[name])
+        chosen = set(ranked[:top_k]) | self.always
+        prompt = prompt.lower()
+        for tools, shapes in zip(self._pattern_tools, self._pattern_shapes):
+            if chosen.intersection(tools) - self.always or any(shape.search(prompt) for shape in shapes):
+                chosen.update(tools)
+        if len(chosen) >= len(self.names):
+            return None
+        return [name for name in self.names if name in chosen]
+
+    def declarations_for(self, names: List[str]) -> List[Dict[str, Any]]:
+        wanted = set(names)
+        return [d for d in self.declarations if d["name"] in wanted]
+
+    def patterns_for(self, names: List[str]) -> List[str]:
+        """The patterns that name one of `names` or no tool at all."""
+        wanted = set(names)
+        return [p for p, tools in zip(self.patterns, self._pattern_tools) if not tools or wanted.intersection(tools)]
@@ -0,0 +1,40 @@
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import PydanticSerializationError
+
+_ANY = TypeAdapter(Any)
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """Application-wide JSON response rendered with orjson.
+
+    Content FastAPI has already encoded goes straight to orjson. Anything orjson can't
+    encode itself (pydantic models handed over by json_response) is converted in a single
+    pydantic-core pass instead of going through jsonable_encoder; only content pydantic
+    can't serialize either (arbitrary objects) still goes through jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=_OPTIONS)
+        except TypeError:
+            pass
+        try:
+            return orjson.dumps(_ANY.dump_python(content, mode="json"), option=_OPTIONS)
+        except PydanticSerializationError:
+            return orjson.dumps(jsonable_encoder(content), option=_OPTIONS)
+
+
+def json_response(content: Any, status_code: int = 200) -> ORJSONResponse:
+    """Returns service-built content as-is.
+
+    Routes return this for models the services already constructed and validated, so
+    FastAPI skips re-validating them against the route's response_model (which still
+    documents the schema) and jsonable_encoder.
+    """
+    return ORJSONResponse(content, status_code=status_code)
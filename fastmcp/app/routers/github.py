@@ -1,19 +1,50 @@
 
-from fastapi import APIRouter, HTTPException, Body, status
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Body, Query, status
+from typing import List, Dict, Any, Optional, Union
 
-from ..services import github_service
+from ..services import github_service, pr_summary_service
+from ..responses import json_response
+from ..models.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, decode_cursor, encode_cursor
 from ..models.github_models import (
     GithubRepo, GithubBranch, CreatePullRequest, PullRequest, 
-    GithubIssue, CreateGithubIssue
+    GithubIssue, CreateGithubIssue, MultiRepoOverview, PullRequestSummary
 )
 
 router = APIRouter()
 
-@router.get("/repos", response_model=List[GithubRepo])
-async def get_repos():
+@router.get("/repos", response_model=Union[Page[GithubRepo], List[GithubRepo]])
+async def get_repos(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns a page object instead of a list"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+):
+    try:
+        if limit is None and cursor is None:
+            return json_response(await github_service.get_repos())
+        if cursor:
+            # The page size is part of the position: GitHub pages are numbered per size
+            position = decode_cursor(cursor, "github/repos")
+            page, per_page = position.get("p", 1), position.get("n", DEFAULT_PAGE_SIZE)
+            if not 1 <= per_page <= MAX_PAGE_SIZE:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        else:
+            page, per_page = 1, limit
+        repos, has_next = await github_service.get_repos_page(max(page, 1), per_page)
+        return json_response(Page[GithubRepo](
+            items=repos,
+            next_cursor=encode_cursor({"p": page + 1, "n": per_page}, "github/repos") if has_next else None,
+        ))
+    except HTTPException as e:
+        raise e
+
+@router.get("/overview", response_model=MultiRepoOverview)
+async def get_repos_overview(
+    repos: Optional[str] = Query(None, description="Comma-separated owner/repo names; all repositories when omitted"),
+    include: Optional[List[str]] = Query(None, description="branches, pull_requests and/or issues"),
+    state: str = Query("open", pattern="^(open|closed|all)$"),
+    max_items: int = Query(100, ge=1),
+):
     try:
-        return await github_service.get_repos()
+        return json_response(await github_service.get_repos_overview(repos, include, state, max_items))
     except HTTPException as e:
         raise e
 
@@ -59,10 +90,27 @@ async def merge_pull_request(owner: str, repo: str, pr_number: int):
     except HTTPException as e:
         raise e
 
+@router.get("/{owner}/{repo}/pulls/{pr_number}/summary", response_model=PullRequestSummary)
+async def summarize_pull_request(owner: str, repo: str, pr_number: int):
+    try:
+        return await pr_summary_service.summarize_pull_request(owner, repo, pr_number)
+    except HTTPException as e:
+        raise e
+
 @router.get("/{owner}/{repo}/issues", response_model=List[GithubIssue])
-async def get_issues(owner: str, repo: str):
+async def get_issues(
+    owner: str,
+    repo: str,
+    state: str = Query("open", pattern="^(open|closed|all)$"),
+    labels: Optional[str] = Query(None, description="Comma-separated label names"),
+    assignee: Optional[str] = Query(None, description="Login, 'none' or '*'"),
+    since: Optional[str] = Query(None, description="ISO 8601 timestamp"),
+    sort: Optional[str] = Query(None, pattern="^(created|updated|comments)$"),
+    direction: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+    max_items: Optional[int] = Query(None, ge=1),
+):
     try:
-        return await github_service.get_issues(owner, repo)
+        return json_response(await github_service.get_issues(owner, repo, state, labels, assignee, since, sort, direction, max_items))
     except HTTPException as e:
         raise e
 
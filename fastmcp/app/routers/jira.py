@@ -1,8 +1,10 @@
 
-from fastapi import APIRouter, HTTPException, Body, status
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Body, Query, status
+from typing import List, Dict, Any, Optional, Union
 from ..services import jira_service
-from ..models.jira_models import JiraIssue, JiraProject, JiraIssueBasic, CreateJiraIssue, JiraSprint
+from ..responses import json_response
+from ..models.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, decode_cursor, encode_cursor
+from ..models.jira_models import JiraBulkResult, JiraIssue, JiraIssueBatch, JiraProject, JiraIssueBasic, CreateJiraIssue, JiraSprint
 
 router = APIRouter()
 
@@ -13,6 +15,13 @@ async def get_issue(ticket_id: str):
     except HTTPException as e:
         raise e
 
+@router.get("/issues", response_model=JiraIssueBatch)
+async def get_issues(keys: str = Query(..., description="Comma-separated issue keys")):
+    try:
+        return await jira_service.fetch_jira_issues(keys.split(","))
+    except HTTPException as e:
+        raise e
+
 @router.get("/projects", response_model=List[JiraProject])
 async def list_projects():
     try:
@@ -20,10 +29,23 @@ async def list_projects():
     except HTTPException as e:
         raise e
 
-@router.get("/issues/{project_key}", response_model=List[JiraIssueBasic])
-async def list_issues(project_key: str, status: str = None):
+@router.get("/issues/{project_key}", response_model=Union[Page[JiraIssueBasic], List[JiraIssueBasic]])
+async def list_issues(
+    project_key: str,
+    status: str = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns a page object instead of a list"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+):
     try:
-        return await jira_service.get_issues_for_project(project_key, status)
+        if limit is None and cursor is None:
+            return json_response(await jira_service.get_issues_for_project(project_key, status))
+        scope = f"jira/issues/{project_key.upper()}/{status or ''}"
+        start_at = decode_cursor(cursor, scope).get("o", 0) if cursor else 0
+        issues, next_start = await jira_service.get_issues_page(project_key, status, start_at, limit or DEFAULT_PAGE_SIZE)
+        return json_response(Page[JiraIssueBasic](
+            items=issues,
+            next_cursor=encode_cursor({"o": next_start}, scope) if next_start is not None else None,
+        ))
     except HTTPException as e:
         raise e
 
@@ -86,3 +108,24 @@ async def move_issue_to_sprint(sprint_id: int, issue_key: str = Body(..., embed=
         return {"message": f"Issue {issue_key} moved to sprint {sprint_id} successfully."}
     except HTTPException as e:
         raise e
+
+@router.post("/issues/bulk/assign", response_model=JiraBulkResult)
+async def bulk_assign_issues(issue_keys: List[str] = Body(...), assignee_name: str = Body(...)):
+    try:
+        return await jira_service.bulk_assign_issues(issue_keys, assignee_name)
+    except HTTPException as e:
+        raise e
+
+@router.post("/issues/bulk/transition", response_model=JiraBulkResult)
+async def bulk_transition_issues(issue_keys: List[str] = Body(...), transition: str = Body(...)):
+    try:
+        return await jira_service.bulk_transition_issues(issue_keys, transition)
+    except HTTPException as e:
+        raise e
+
+@router.post("/sprint/{sprint_id}/issues", response_model=JiraBulkResult)
+async def bulk_move_issues_to_sprint(sprint_id: int, issue_keys: List[str] = Body(..., embed=True)):
+    try:
+        return await jira_service.bulk_move_issues_to_sprint(sprint_id, issue_keys)
+    except HTTPException as e:
+        raise e
@@ -0,0 +1,25 @@
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from ..services import issue_index
+from ..models.index_models import IssueSearchResult
+from ..responses import json_response
+
+router = APIRouter()
+
+@router.get("/issues", response_model=IssueSearchResult)
+async def search_issues(
+    q: Optional[str] = Query(None, description="Words to match in titles and bodies"),
+    source: Optional[str] = Query(None, pattern="^(jira|github)$"),
+    project: Optional[str] = Query(None, description="Jira project key or GitHub owner/repo"),
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[str] = None,
+    updated_since: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    try:
+        return json_response(await issue_index.search_issues(q, source, project, status, assignee, priority, due_before, updated_since, limit))
+    except HTTPException as e:
+        raise e
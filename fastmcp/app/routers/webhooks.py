@@ -0,0 +1,40 @@
+
+import json
+from fastapi import APIRouter, Header, HTTPException, Request
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+from ..services import webhook_service
+
+router = APIRouter()
+
+def _payload(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body is not JSON")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Webhook body is not a JSON object")
+    return payload
+
+@router.post("/github", response_model=Dict[str, Any])
+async def github_webhook(
+    request: Request,
+    x_github_event: str = Header("unknown"),
+    x_hub_signature_256: Optional[str] = Header(None),
+):
+    try:
+        body = await request.body()
+        webhook_service.verify_signature("github", settings.github_webhook_secret, body, x_hub_signature_256)
+        return webhook_service.apply_github_event(x_github_event, _payload(body))
+    except HTTPException as e:
+        raise e
+
+@router.post("/jira", response_model=Dict[str, Any])
+async def jira_webhook(request: Request, x_hub_signature: Optional[str] = Header(None)):
+    try:
+        body = await request.body()
+        webhook_service.verify_signature("jira", settings.jira_webhook_secret, body, x_hub_signature)
+        return webhook_service.apply_jira_event(_payload(body))
+    except HTTPException as e:
+        raise e
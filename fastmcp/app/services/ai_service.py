@@ -1,14 +1,49 @@
 
+import asyncio
+import time
 import google.generativeai as genai
 from fastapi import HTTPException
 
 from ..config.settings import settings
 from ..models.ai_models import ProcessedCommand, AIResponse
+from . import metrics_service
+
+def genai_client_options() -> dict:
+    """Keyword arguments for `genai.configure`, routing calls to GEMINI_API_ENDPOINT when set."""
+    if not settings.gemini_api_endpoint:
+        return {"api_key": settings.gemini_api_key}
+    return {
+        "api_key": settings.gemini_api_key,
+        "transport": "rest",
+        "client_options": {"api_endpoint": settings.gemini_api_endpoint},
+    }
 
 def configure_genai():
     if not settings.gemini_api_key:
         raise HTTPException(status_code=500, detail="GEMINI_API_KEY environment variable not set")
-    genai.configure(api_key=settings.gemini_api_key)
+    genai.configure(**genai_client_options())
+
+async def generate_content(model, contents):
+    """Runs `model.generate_content` without blocking the event loop.
+
+    The async gRPC client cannot be pointed at a plain-HTTP endpoint, so with a custom
+    GEMINI_API_ENDPOINT the sync REST client is run in a worker thread instead.
+    """
+    if settings.gemini_api_endpoint:
+        return await asyncio.to_thread(model.generate_content, contents)
+    return await model.generate_content_async(contents)
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count (about four characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+async def count_tokens(model, contents) -> int:
+    """Exact Gemini token count of `contents` for `model` (one countTokens call), without blocking the event loop."""
+    if settings.gemini_api_endpoint:
+        response = await asyncio.to_thread(model.count_tokens, contents)
+    else:
+        response = await model.count_tokens_async(contents)
+    return response.total_tokens
 
 async def process_natural_language(natural_language: str) -> ProcessedCommand:
     configure_genai()
@@ -35,9 +70,11 @@ async def process_natural_language(natural_language: str) -> ProcessedCommand:
     
     try:
         model = genai.GenerativeModel('gemini-2.5-flash-lite')
-        response = await model.generate_content_async(
-            f"{system_prompt}\n\nUser request: {natural_language}"
+        start = time.perf_counter()
+        response = await generate_content(
+            model, f"{system_prompt}\n\nUser request: {natural_language}"
         )
+        metrics_service.observe_gemini_call("process_nl", time.perf_counter() - start, response)
         
         command = response.text.strip().strip('"\'')
         
@@ -62,7 +99,9 @@ async def generate_ai_response(prompt: str) -> AIResponse:
     
     try:
         model = genai.GenerativeModel('gemini-2.5-flash-lite')
-        response = await model.generate_content_async(prompt)
+        start = time.perf_counter()
+        response = await generate_content(model, prompt)
+        metrics_service.observe_gemini_call("generate", time.perf_counter() - start, response)
         
         if not response.text:
             raise HTTPException(status_code=500, detail="Received empty response from AI service")
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from . import metrics_service
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Small in-process cache with per-entry expiry, LRU eviction and optional negative caching.
+
+    A cached `None` is a negative entry ("looked up, does not exist") and expires after
+    `negative_ttl`. Lookups are counted under `name` in fastmcp_cache_requests_total.
+    """
+
+    def __init__(self, name: str, ttl: float, negative_ttl: Optional[float] = None, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (hit, value); a hit may carry a negative (None) value."""
+        value = self._lookup(key)
+        hit = value is not _MISSING
+        metrics_service.observe_cache_lookup(self.name, hit)
+        return hit, (value if hit else None)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def items(self) -> Dict[Hashable, Tuple[Any, float]]:
+        """Live entries as {key: (value, seconds until expiry)}, e.g. for persisting to disk."""
+        now = time.monotonic()
+        return {key: (value, expires_at - now) for key, (expires_at, value) in self._entries.items() if expires_at > now}
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Drops one entry, or everything when called without a key."""
+        if key is _MISSING:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns the cached value or awaits `loader()` and caches its result.
+
+        Concurrent misses for the same key share one load instead of each calling upstream.
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
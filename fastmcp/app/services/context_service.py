@@ -1,9 +1,14 @@
 import json
+import logging
 import os
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+from . import metrics_service
+
+logger = logging.getLogger(__name__)
+
 class SessionContext:
     def __init__(self):
         self.session_id: str = ""
@@ -82,8 +87,7 @@ class SessionContext:
             result = response.get("result")
             tool_calls = response.get("toolCalls", [])
         
-        # Debug: print what we're extracting
-        print(f"DEBUG: Extracting context from response: result={result}, tool_calls={tool_calls}")
+        logger.debug("Extracting context from response: result=%s, tool_calls=%s", result, tool_calls)
         
         # Extract repository context
         for tool_call in tool_calls:
@@ -285,11 +289,12 @@ class ContextService:
         # Use a single context file for all sessions
         self.context_file = self.storage_dir / "context.json"
         self.current_context: Optional[SessionContext] = None
-        print(f"DEBUG: Context storage file: {self.context_file}")
+        metrics_service.observe_context_file(self.context_file)
+        logger.debug("Context storage file: %s", self.context_file)
     
     def get_or_create_context(self, session_id: str = None) -> SessionContext:
         """Get existing context or create new one"""
-        print(f"DEBUG: get_or_create_context called with session_id: {session_id}")
+        logger.debug("get_or_create_context called with session_id: %s", session_id)
         
         # Always use the same context file regardless of session_id
         if self.context_file.exists():
@@ -301,18 +306,18 @@ class ContextService:
                 if data and (data.get("conversation_history") or data.get("current_repository") or data.get("recent_actions")):
                     context = SessionContext.from_dict(data)
                     self.current_context = context
-                    print(f"DEBUG: Loaded existing context from {self.context_file}")
+                    logger.debug("Loaded existing context from %s", self.context_file)
                     return context
                 else:
-                    print(f"DEBUG: Context file exists but is empty, creating new context")
+                    logger.debug("Context file exists but is empty, creating new context")
             except Exception as e:
-                print(f"Error loading context: {e}")
+                logger.warning("Error loading context: %s", e)
         
         # Create new context
         context = SessionContext()
         context.session_id = "global_context"
         self.current_context = context
-        print(f"DEBUG: Created new context")
+        logger.debug("Created new context")
         return context
     
     def save_context(self):
@@ -321,11 +326,10 @@ class ContextService:
             try:
                 with open(self.context_file, 'w') as f:
                     json.dump(self.current_context.to_dict(), f, indent=2)
-                print(f"DEBUG: Saved context to {self.context_file}")
-            except Exception as e:
-                print(f"Error saving context: {e}")
-                import traceback
-                traceback.print_exc()
+                metrics_service.observe_context_file(self.context_file)
+                logger.debug("Saved context to %s", self.context_file)
+            except Exception:
+                logger.exception("Error saving context")
     
     def clear_context(self):
         """Clear current context and start fresh"""
@@ -337,9 +341,10 @@ class ContextService:
         try:
             with open(self.context_file, 'w') as f:
                 json.dump(self.current_context.to_dict(), f, indent=2)
-            print(f"DEBUG: Cleared context file content {self.context_file}")
+            metrics_service.observe_context_file(self.context_file)
+            logger.debug("Cleared context file content %s", self.context_file)
         except Exception as e:
-            print(f"Error clearing context: {e}")
+            logger.warning("Error clearing context: %s", e)
         
         return self.current_context
     
@@ -348,74 +353,86 @@ class ContextService:
         if not self.current_context:
             return ""
         
-        context_summary = self.current_context.get_context_summary()
+        context_summary, conversations = self.get_prompt_sections(user_input)
         
         # Add recent conversation context if relevant
         recent_context = ""
-        if self.current_context.conversation_history:
-            recent_conversations = self.current_context.conversation_history[-5:]  # Last 5 conversations
-            recent_context = "\nRecent conversation context:\n"
-            for i, conv in enumerate(recent_conversations, 1):
-                recent_context += f"{i}. User: {conv['user_input']}\n"
-                
-                # Extract tool calls and results
-                agent_response = conv.get('agent_response', {})
-                tool_calls = agent_response.get('toolCalls', [])
-                result = agent_response.get('result')
-                model_summary = agent_response.get('model_summary', '')
-                
-                if tool_calls:
-                    tools_used = [tc.get('name', 'unknown') for tc in tool_calls]
-                    recent_context += f"   Tools used: {', '.join(tools_used)}\n"
-                    
-                    # Extract repository/project info from tool call arguments
-                    for tc in tool_calls:
-                        args = tc.get('args', {})
-                        if 'owner' in args and 'repo' in args:
-                            recent_context += f"   Repository: {args['owner']}/{args['repo']}\n"
-                        elif 'project_key' in args:
-                            recent_context += f"   Jira Project: {args['project_key']}\n"
-                
-                if result:
-                    if isinstance(result, list) and result:
-                        # Extract repository/project info from list results
-                        repo_info = []
-                        project_info = []
-                        for item in result:
-                            if isinstance(item, dict):
-                                if 'full_name' in item:  # GitHub repo
-                                    repo_info.append(item['full_name'])
-                                elif 'name' in item and 'commit_sha' in item:  # GitHub branch
-                                    if 'owner' in conv.get('agent_response', {}).get('toolCalls', [{}])[0].get('args', {}):
-                                        owner = conv['agent_response']['toolCalls'][0]['args']['owner']
-                                        repo_info.append(f"{owner}/{conv['agent_response']['toolCalls'][0]['args'].get('repo', 'unknown')}")
-                                elif 'key' in item and 'name' in item:  # Jira project
-                                    project_info.append(f"{item['key']} ({item['name']})")
-                                elif 'key' in item and 'id' in item:  # Jira issue
-                                    project_info.append(f"issue {item['key']}")
-                        
-                        if repo_info:
-                            recent_context += f"   Repository: {', '.join(set(repo_info))}\n"
-                        if project_info:
-                            recent_context += f"   Project: {', '.join(set(project_info))}\n"
-                        if not repo_info and not project_info:
-                            recent_context += f"   Result: Found {len(result)} items\n"
-                    elif isinstance(result, dict):
-                        if 'number' in result:
-                            recent_context += f"   Result: Created/accessed #{result['number']}\n"
-                        elif 'key' in result:
-                            recent_context += f"   Result: Accessed {result['key']}\n"
-                        elif 'full_name' in result:  # GitHub repo
-                            recent_context += f"   Repository: {result['full_name']}\n"
-                        elif 'name' in result and 'commit_sha' in result:  # GitHub branch
-                            recent_context += f"   Branch: {result['name']}\n"
-                
-                if model_summary and len(model_summary) < 100:
-                    recent_context += f"   Summary: {model_summary.strip()}\n"
-                
-                recent_context += "\n"
+        if conversations:
+            recent_context = "\nRecent conversation context:\n" + "".join(conversations)
+        
+        return f"{context_summary}{recent_context}\n\n"
+    
+    def get_prompt_sections(self, user_input: str) -> Tuple[str, List[str]]:
+        """The session summary line and one entry per recent conversation (oldest first), for budgeted prompts"""
+        if not self.current_context:
+            return "", []
         
-        return f"Session Context: {context_summary}{recent_context}\n\n"
+        context_summary = f"Session Context: {self.current_context.get_context_summary()}"
+        recent_conversations = self.current_context.conversation_history[-5:]  # Last 5 conversations
+        return context_summary, [
+            self._format_conversation(i, conv) for i, conv in enumerate(recent_conversations, 1)
+        ]
+    
+    def _format_conversation(self, i: int, conv: Dict[str, Any]) -> str:
+        entry = f"{i}. User: {conv['user_input']}\n"
+
+        # Extract tool calls and results
+        agent_response = conv.get('agent_response', {})
+        tool_calls = agent_response.get('toolCalls', [])
+        result = agent_response.get('result')
+        model_summary = agent_response.get('model_summary', '')
+
+        if tool_calls:
+            tools_used = [tc.get('name', 'unknown') for tc in tool_calls]
+            entry += f"   Tools used: {', '.join(tools_used)}\n"
+
+            # Extract repository/project info from tool call arguments
+            for tc in tool_calls:
+                args = tc.get('args', {})
+                if 'owner' in args and 'repo' in args:
+                    entry += f"   Repository: {args['owner']}/{args['repo']}\n"
+                elif 'project_key' in args:
+                    entry += f"   Jira Project: {args['project_key']}\n"
+
+        if result:
+            if isinstance(result, list) and result:
+                # Extract repository/project info from list results
+                repo_info = []
+                project_info = []
+                for item in result:
+                    if isinstance(item, dict):
+                        if 'full_name' in item:  # GitHub repo
+                            repo_info.append(item['full_name'])
+                        elif 'name' in item and 'commit_sha' in item:  # GitHub branch
+                            if 'owner' in conv.get('agent_response', {}).get('toolCalls', [{}])[0].get('args', {}):
+                                owner = conv['agent_response']['toolCalls'][0]['args']['owner']
+                                repo_info.append(f"{owner}/{conv['agent_response']['toolCalls'][0]['args'].get('repo', 'unknown')}")
+                        elif 'key' in item and 'name' in item:  # Jira project
+                            project_info.append(f"{item['key']} ({item['name']})")
+                        elif 'key' in item and 'id' in item:  # Jira issue
+                            project_info.append(f"issue {item['key']}")
+
+                if repo_info:
+                    entry += f"   Repository: {', '.join(set(repo_info))}\n"
+                if project_info:
+                    entry += f"   Project: {', '.join(set(project_info))}\n"
+                if not repo_info and not project_info:
+                    entry += f"   Result: Found {len(result)} items\n"
+            elif isinstance(result, dict):
+                if 'number' in result:
+                    entry += f"   Result: Created/accessed #{result['number']}\n"
+                elif 'key' in result:
+                    entry += f"   Result: Accessed {result['key']}\n"
+                elif 'full_name' in result:  # GitHub repo
+                    entry += f"   Repository: {result['full_name']}\n"
+                elif 'name' in result and 'commit_sha' in result:  # GitHub branch
+                    entry += f"   Branch: {result['name']}\n"
+
+        if model_summary and len(model_summary) < 100:
+            entry += f"   Summary: {model_summary.strip()}\n"
+
+        entry += "\n"
+        return entry
 
 # Global context service instance
 context_service = ContextService()
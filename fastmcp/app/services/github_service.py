@@ -1,13 +1,22 @@
+import asyncio
+import logging
+import math
+from contextlib import aclosing
+from dataclasses import dataclass, replace
 import httpx
 from fastapi import HTTPException
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Tuple, Union
 
 from ..config.settings import settings
 from ..models.github_models import (
     GithubRepo, GithubBranch, CreatePullRequest, PullRequest, 
-    GithubIssue, CreateGithubIssue
+    GithubIssue, CreateGithubIssue, MultiRepoOverview, RepoOverview
 )
 from ..tools import tool
+from .http_client import upstream_client
+from .issue_index import issue_index
+
+logger = logging.getLogger(__name__)
 
 # Common headers for GitHub API
 def _get_github_headers():
@@ -17,6 +26,65 @@ def _get_github_headers():
         "User-Agent": settings.github_user_agent,
     }
 
+# Largest page GitHub's list endpoints serve
+GITHUB_PER_PAGE = 100
+
+def _last_page(response: httpx.Response) -> Optional[int]:
+    """Page count from GitHub's Link header; None when there is no rel="last" link."""
+    last = response.links.get("last", {}).get("url")
+    if not last:
+        return None
+    page = httpx.URL(last).params.get("page", "")
+    return int(page) if page.isdigit() else None
+
+async def _list_all(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, Any],
+    max_items: int,
+    keep: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> List[Dict[str, Any]]:
+    """(Internal) Collects up to `max_items` rows of a paginated GitHub list endpoint. Not a tool for the AI.
+
+    The first page's Link header tells how many pages exist; the rest are then requested
+    `github_page_concurrency` at a time and kept in page order. Without a `keep` filter only
+    as many pages as `max_items` needs are fetched. Rows rejected by `keep` don't count.
+    """
+    headers = _get_github_headers()
+    per_page = GITHUB_PER_PAGE if keep else min(max_items, GITHUB_PER_PAGE)
+
+    async def _page(number: int) -> httpx.Response:
+        response = await client.get(
+            url, headers=headers, params={**params, "per_page": per_page, "page": number}, timeout=settings.http_timeout
+        )
+        response.raise_for_status()
+        return response
+
+    def _rows(response: httpx.Response) -> List[Dict[str, Any]]:
+        return [row for row in response.json() if keep is None or keep(row)]
+
+    response = await _page(1)
+    rows = _rows(response)
+    last = _last_page(response)
+    page = 2
+    while "next" in response.links and len(rows) < max_items:
+        if last is None:
+            # No page count to plan with: follow the next links one at a time
+            batch = [page]
+        else:
+            size = settings.github_page_concurrency
+            if keep is None:
+                size = min(size, math.ceil((max_items - len(rows)) / per_page))
+            batch = list(range(page, min(page + max(size, 1), last + 1))) or [page]
+        responses = await asyncio.gather(*(_page(number) for number in batch))
+        for response in responses:
+            rows.extend(_rows(response))
+        page = batch[-1] + 1
+    return rows[:max_items]
+
+def _list_params(**filters: Any) -> Dict[str, Any]:
+    return {name: value for name, value in filters.items() if value is not None}
+
 @tool(name="github_get_repos")
 async def get_repos() -> List[GithubRepo]:
     """Gets a list of repositories for the authenticated user."""
@@ -28,7 +96,7 @@ async def get_repos() -> List[GithubRepo]:
     url = f"{settings.github_api_url}/user/repos"
     headers = _get_github_headers()
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         try:
             repos: List[GithubRepo] = []
             page = 1
@@ -46,6 +114,27 @@ async def get_repos() -> List[GithubRepo]:
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
 
+async def get_repos_page(page: int = 1, per_page: int = 100) -> Tuple[List[GithubRepo], bool]:
+    """(Internal) Fetches one page of the authenticated user's repositories. Not a tool for the AI.
+
+    Returns the repositories and whether GitHub reports a next page.
+    """
+    if settings.github_mock:
+        repos = await get_repos()
+        start = (page - 1) * per_page
+        return repos[start:start + per_page], start + per_page < len(repos)
+
+    url = f"{settings.github_api_url}/user/repos"
+    headers = _get_github_headers()
+
+    async with upstream_client("github") as client:
+        try:
+            response = await client.get(url, headers=headers, params={"per_page": per_page, "page": page}, timeout=settings.http_timeout)
+            response.raise_for_status()
+            return [GithubRepo(**repo) for repo in response.json()], "next" in response.links
+        except httpx.RequestError as e:
+            raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
+
 @tool(name="github_get_branches")
 async def get_branches(owner: str, repo: str) -> List[GithubBranch]:
     """Gets a list of all branches for a specific repository."""
@@ -58,7 +147,7 @@ async def get_branches(owner: str, repo: str) -> List[GithubBranch]:
     page = 1
     per_page = 100  # Max per page
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         while True:
             try:
                 params = {"per_page": per_page, "page": page}
@@ -86,7 +175,7 @@ async def create_branch(owner: str, repo: str, branch_name: str, source_branch:
         return GithubBranch(name=branch_name, commit_sha="xyz")
 
     headers = _get_github_headers()
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         try:
             # 1. Get the SHA of the source branch
             source_branch_url = f"{settings.github_api_url}/repos/{owner}/{repo}/git/refs/heads/{source_branch}"
@@ -127,7 +216,7 @@ async def create_pull_request(owner: str, repo: str, pr_data: CreatePullRequest)
     headers = _get_github_headers()
     payload = pr_data.dict()
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         try:
             response = await client.post(url, headers=headers, json=payload, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -152,7 +241,7 @@ async def merge_pull_request(owner: str, repo: str, pr_number: int, commit_title
     if not commit_title or not commit_message:
         try:
             pr_url = f"{settings.github_api_url}/repos/{owner}/{repo}/pulls/{pr_number}"
-            async with httpx.AsyncClient() as client:
+            async with upstream_client("github") as client:
                 pr_response = await client.get(pr_url, headers=_get_github_headers(), timeout=settings.http_timeout)
                 pr_response.raise_for_status()
                 pr_data = pr_response.json()
@@ -181,7 +270,7 @@ async def merge_pull_request(owner: str, repo: str, pr_number: int, commit_title
     if commit_message:
         merge_data["commit_message"] = commit_message
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         try:
             response = await client.put(url, headers=headers, json=merge_data, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -202,7 +291,7 @@ async def close_pull_request(owner: str, repo: str, pr_number: int) -> Dict[str,
     headers = _get_github_headers()
     data = {"state": "closed"}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         try:
             response = await client.patch(url, headers=headers, json=data, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -210,63 +299,189 @@ async def close_pull_request(owner: str, repo: str, pr_number: int) -> Dict[str,
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
 
-@tool(name="github_get_pr_files")
-async def get_pull_request_files(owner: str, repo: str, pr_number: int) -> List[Dict[str, Any]]:
-    """Gets the list of files changed in a pull request."""
+async def get_pull_request(owner: str, repo: str, pr_number: int) -> Dict[str, Any]:
+    """(Internal) Fetches one pull request as GitHub returns it (title, body, head SHA, ...). Not a tool for the AI."""
     if settings.github_mock:
-        return [
-            {
-                "filename": "src/main.py",
-                "status": "modified",
-                "additions": 10,
-                "deletions": 5,
-                "changes": 15,
-                "patch": "@@ -1,3 +1,8 @@\n def main():\n-    print('Hello')\n+    print('Hello World')\n+    print('New feature')\n"
-            },
-            {
-                "filename": "README.md",
-                "status": "added",
-                "additions": 20,
-                "deletions": 0,
-                "changes": 20,
-                "patch": "@@ -0,0 +1,20 @@\n+# Project Documentation\n+This is a new README file.\n"
-            }
-        ]
-
-    url = f"{settings.github_api_url}/repos/{owner}/{repo}/pulls/{pr_number}/files"
-    headers = _get_github_headers()
+        return {"number": pr_number, "title": f"Mock PR {pr_number}", "body": "", "state": "open", "head": {"sha": f"mock-pr{pr_number}-head"}}
 
-    async with httpx.AsyncClient() as client:
+    url = f"{settings.github_api_url}/repos/{owner}/{repo}/pulls/{pr_number}"
+    async with upstream_client("github") as client:
         try:
-            response = await client.get(url, headers=headers, timeout=settings.http_timeout)
-            response.raise_for_status()
-            return response.json()
+            response = await client.get(url, headers=_get_github_headers(), timeout=settings.http_timeout)
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
+    if response.status_code == 404:
+        raise HTTPException(status_code=404, detail=f"Pull request #{pr_number} not found in {owner}/{repo}")
+    response.raise_for_status()
+    return response.json()
+
+# Mock-mode files of every pull request
+_MOCK_PR_FILES = [
+    {
+        "filename": "src/main.py",
+        "status": "modified",
+        "additions": 10,
+        "deletions": 5,
+        "changes": 15,
+        "patch": "@@ -1,3 +1,8 @@\n def main():\n-    print('Hello')\n+    print('Hello World')\n+    print('New feature')\n"
+    },
+    {
+        "filename": "README.md",
+        "status": "added",
+        "additions": 20,
+        "deletions": 0,
+        "changes": 20,
+        "patch": "@@ -0,0 +1,20 @@\n+# Project Documentation\n+This is a new README file.\n"
+    }
+]
+
+# Per-file fields kept in listings; everything else GitHub sends (blob URLs, sha) is dropped
+_PR_FILE_FIELDS = ("filename", "status", "additions", "deletions", "changes", "previous_filename")
+
+async def iter_pull_request_files(owner: str, repo: str, pr_number: int) -> AsyncIterator[Dict[str, Any]]:
+    """(Internal) Streams the files changed in a pull request. Not a tool for the AI.
+
+    Pages of 100 files are requested only as the caller consumes them, so a caller that
+    stops early (file found, cap reached) never fetches the rest. Use with
+    contextlib.aclosing when breaking out of the loop.
+    """
+    if settings.github_mock:
+        for file in _MOCK_PR_FILES:
+            yield dict(file)
+        return
+
+    url = f"{settings.github_api_url}/repos/{owner}/{repo}/pulls/{pr_number}/files"
+    headers = _get_github_headers()
+
+    async with upstream_client("github", hedge="pr_files") as client:
+        page = 1
+        while True:
+            try:
+                response = await client.get(
+                    url, headers=headers, params={"per_page": GITHUB_PER_PAGE, "page": page}, timeout=settings.http_timeout
+                )
+                response.raise_for_status()
+            except httpx.RequestError as e:
+                raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
+            for file in response.json():
+                yield file
+            if "next" not in response.links:
+                return
+            page += 1
+
+def _truncate_patch(patch: str, limit: int) -> Tuple[str, bool]:
+    """Cuts a patch to the whole lines that fit in `limit` UTF-8 bytes."""
+    data = patch.encode()
+    if len(data) <= limit:
+        return patch, False
+    cut = data[:max(limit, 0)].decode("utf-8", "ignore")
+    return cut[:cut.rfind("\n") + 1], True
+
+@tool(name="github_get_pr_files")
+async def get_pull_request_files(
+    owner: str,
+    repo: str,
+    pr_number: int,
+    include_patch: bool = True,
+    max_files: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Gets the files changed in a pull request, with size-bounded patches.
+
+    Each patch is cut to GITHUB_PR_PATCH_MAX_BYTES and all patches together to
+    GITHUB_PR_PATCH_TOTAL_BYTES; cut or dropped patches are flagged `patch_truncated`.
+    With include_patch=False only metadata (filename, status, additions, deletions) is
+    returned; github_get_pr_file_patch fetches a single file's patch.
+    """
+    max_files = max(max_files or settings.github_pr_max_files, 1)
+    budget = settings.github_pr_patch_total_bytes
+    files: List[Dict[str, Any]] = []
+    async with aclosing(iter_pull_request_files(owner, repo, pr_number)) as stream:
+        async for raw in stream:
+            file = {field: raw[field] for field in _PR_FILE_FIELDS if field in raw}
+            patch = raw.get("patch")
+            if include_patch and patch is not None:
+                kept, truncated = _truncate_patch(patch, min(settings.github_pr_patch_max_bytes, budget))
+                if kept:
+                    file["patch"] = kept
+                    budget -= len(kept.encode())
+                if truncated:
+                    file["patch_truncated"] = True
+            files.append(file)
+            if len(files) >= max_files:
+                break
+    return files
+
+@tool(name="github_get_pr_file_patch")
+async def get_pull_request_file_patch(
+    owner: str, repo: str, pr_number: int, filename: str, max_bytes: Optional[int] = None
+) -> Dict[str, Any]:
+    """Gets the patch of one file changed in a pull request, up to max_bytes (default GITHUB_PR_PATCH_TOTAL_BYTES)."""
+    async with aclosing(iter_pull_request_files(owner, repo, pr_number)) as stream:
+        async for raw in stream:
+            if filename not in (raw.get("filename"), raw.get("previous_filename")):
+                continue
+            file = {field: raw[field] for field in _PR_FILE_FIELDS if field in raw}
+            if raw.get("patch") is None:
+                # GitHub leaves out patches of binary files and very large diffs
+                file["patch"] = None
+                return file
+            file["patch"], truncated = _truncate_patch(raw["patch"], max_bytes or settings.github_pr_patch_total_bytes)
+            if truncated:
+                file["patch_truncated"] = True
+            return file
+    raise HTTPException(status_code=404, detail=f"File '{filename}' is not changed in pull request #{pr_number}")
 
 @tool(name="github_get_issues")
-async def get_issues(owner: str, repo: str) -> List[GithubIssue]:
-    """Gets a list of issues for a repository."""
+async def get_issues(
+    owner: str,
+    repo: str,
+    state: str = "open",
+    labels: Optional[str] = None,
+    assignee: Optional[str] = None,
+    since: Optional[str] = None,
+    sort: Optional[str] = None,
+    direction: Optional[str] = None,
+    max_items: Optional[int] = None,
+) -> List[GithubIssue]:
+    """Gets the issues of a repository, filtered by GitHub (state, comma-separated labels, assignee, since, sort)."""
     if settings.github_mock:
         return [GithubIssue(id=1, number=1, title="Test Issue", state="open", html_url="http://example.com/issue/1")]
 
     url = f"{settings.github_api_url}/repos/{owner}/{repo}/issues"
-    headers = _get_github_headers()
+    params = _list_params(state=state, labels=labels, assignee=assignee, since=since, sort=sort, direction=direction)
+    max_items = max(max_items or settings.github_max_items, 1)
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github", hedge="issues") as client:
         try:
-            response = await client.get(url, headers=headers, timeout=settings.http_timeout)
-            response.raise_for_status()
-            raw = response.json()
-            # Filter out PRs (issues API includes PRs when 'pull_request' key exists)
-            only_issues = [issue for issue in raw if "pull_request" not in issue]
-            return [GithubIssue(**issue) for issue in only_issues]
+            # The issues API also lists PRs (rows with a 'pull_request' key) and has no filter for them
+            raw = await _list_all(client, url, params, max_items, keep=lambda issue: "pull_request" not in issue)
+            issues = [GithubIssue(**issue) for issue in raw]
+            # Only an unfiltered, uncapped listing says which issues no longer exist
+            complete = state == "all" and not (labels or assignee or since) and len(issues) < max_items
+            issue_index.index_github(owner, repo, issues, replace=complete)
+            return issues
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
 
+def apply_issue_event(owner: str, repo: str, issue: Dict[str, Any], deleted: bool = False) -> None:
+    """(Internal) Applies a pushed issue (webhook payload) to the local issue index. Not a tool for the AI."""
+    if deleted:
+        issue_index.remove("github", f"{owner}/{repo}#{issue['number']}")
+    else:
+        issue_index.index_github(owner, repo, [GithubIssue(**issue)])
+
 @tool(name="github_get_pull_requests")
-async def get_pull_requests(owner: str, repo: str, state: str = "open") -> List[PullRequest]:
-    """Gets a list of pull requests for a repository."""
+async def get_pull_requests(
+    owner: str,
+    repo: str,
+    state: str = "open",
+    base: Optional[str] = None,
+    head: Optional[str] = None,
+    sort: Optional[str] = None,
+    direction: Optional[str] = None,
+    max_items: Optional[int] = None,
+) -> List[PullRequest]:
+    """Gets the pull requests of a repository, filtered by GitHub (state, base/head branch, sort)."""
     if settings.github_mock:
         return [
             PullRequest(
@@ -281,14 +496,11 @@ async def get_pull_requests(owner: str, repo: str, state: str = "open") -> List[
         ]
 
     url = f"{settings.github_api_url}/repos/{owner}/{repo}/pulls"
-    headers = _get_github_headers()
-    params = {"state": state}
+    params = _list_params(state=state, base=base, head=head, sort=sort, direction=direction)
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github", hedge="pull_requests") as client:
         try:
-            response = await client.get(url, headers=headers, params=params, timeout=settings.http_timeout)
-            response.raise_for_status()
-            raw = response.json()
+            raw = await _list_all(client, url, params, max(max_items or settings.github_max_items, 1))
             return [PullRequest(**pr) for pr in raw]
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
@@ -303,7 +515,7 @@ async def create_issue(owner: str, repo: str, issue_data: CreateGithubIssue) ->
     headers = _get_github_headers()
     payload = issue_data.dict()
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         try:
             response = await client.post(url, headers=headers, json=payload, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -321,10 +533,200 @@ async def comment_issue(owner: str, repo: str, issue_number: int, comment_body:
     headers = _get_github_headers()
     payload = {"body": comment_body}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("github") as client:
         try:
             response = await client.post(url, headers=headers, json=payload, timeout=settings.http_timeout)
             response.raise_for_status()
             return response.json()
         except httpx.RequestError as e:
-            raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
\ No newline at end of file
+            raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
+
+# Multi-repository reads. One GraphQL query covers a page of every requested listing of
+# many repositories; the REST path below is the fallback when GraphQL is disabled.
+
+# listing -> (GraphQL connection, fixed arguments, node fields)
+_GRAPHQL_LISTINGS = {
+    "branches": ("refs", 'refPrefix: "refs/heads/", orderBy: {field: ALPHABETICAL, direction: ASC}', "name target { oid }"),
+    "pull_requests": ("pullRequests", "orderBy: {field: CREATED_AT, direction: DESC}", "databaseId number title state url"),
+    "issues": ("issues", "orderBy: {field: CREATED_AT, direction: DESC}", "databaseId number title state url body"),
+}
+# (listing, REST state) -> GraphQL states filter; "all" sends none
+_GRAPHQL_STATES = {
+    ("pull_requests", "open"): "[OPEN]",
+    ("pull_requests", "closed"): "[CLOSED, MERGED]",
+    ("issues", "open"): "[OPEN]",
+    ("issues", "closed"): "[CLOSED]",
+}
+
+@dataclass
+class _GraphqlTask:
+    """One page of one listing of one repository."""
+    index: int  # position in the requested repositories
+    owner: str
+    name: str
+    listing: str
+    first: int
+    cursor: Optional[str] = None
+
+def _graphql_query(tasks: List[_GraphqlTask], state: str) -> Tuple[str, Dict[str, Any]]:
+    """Builds one query reading every task's page under its own alias (t0, t1, ...)."""
+    declarations, selections, variables = [], [], {}
+    for i, task in enumerate(tasks):
+        connection, arguments, fields = _GRAPHQL_LISTINGS[task.listing]
+        arguments = f"first: {task.first}, after: $a{i}, {arguments}"
+        states = _GRAPHQL_STATES.get((task.listing, state))
+        if states:
+            arguments += f", states: {states}"
+        declarations.append(f"$o{i}: String!, $n{i}: String!, $a{i}: String")
+        variables.update({f"o{i}": task.owner, f"n{i}": task.name, f"a{i}": task.cursor})
+        selections.append(
+            f"t{i}: repository(owner: $o{i}, name: $n{i}) {{ {connection}({arguments}) "
+            f"{{ nodes {{ {fields} }} pageInfo {{ hasNextPage endCursor }} }} }}"
+        )
+    query = f"query({', '.join(declarations)}) {{ rateLimit {{ cost remaining }} {' '.join(selections)} }}"
+    return query, variables
+
+def _graphql_chunks(tasks: List[_GraphqlTask]) -> List[List[_GraphqlTask]]:
+    """Groups tasks into queries asking for at most github_graphql_max_nodes nodes each.
+
+    GitHub limits and prices a query by the nodes its connections may return, so large
+    multi-repo reads are split instead of sent as one query that risks a timeout.
+    """
+    chunks: List[List[_GraphqlTask]] = []
+    nodes = 0
+    for task in tasks:
+        if not chunks or nodes + task.first > settings.github_graphql_max_nodes:
+            chunks.append([])
+            nodes = 0
+        chunks[-1].append(task)
+        nodes += task.first
+    return chunks
+
+async def _graphql_post(client: httpx.AsyncClient, url: str, tasks: List[_GraphqlTask], state: str) -> Dict[str, Any]:
+    query, variables = _graphql_query(tasks, state)
+    response = await client.post(
+        url, headers=_get_github_headers(), json={"query": query, "variables": variables},
+        timeout=settings.http_timeout, extensions={"idempotent": True},
+    )
+    response.raise_for_status()
+    body = response.json()
+    if body.get("data") is None:
+        messages = "; ".join(error.get("message", "") for error in body.get("errors") or [])
+        raise HTTPException(status_code=502, detail=f"GitHub GraphQL error: {messages}")
+    rate = body["data"].get("rateLimit") or {}
+    if rate.get("remaining") is not None and rate["remaining"] < 10 * (rate.get("cost") or 1):
+        logger.warning("GitHub GraphQL rate limit nearly used up: %s points left", rate["remaining"])
+    return body
+
+def _graphql_node(listing: str, node: Dict[str, Any]) -> Union[GithubBranch, PullRequest, GithubIssue]:
+    if listing == "branches":
+        return GithubBranch(name=node["name"], commit_sha=(node.get("target") or {}).get("oid", ""))
+    # REST reports merged pull requests as closed
+    state = "closed" if node["state"] == "MERGED" else node["state"].lower()
+    if listing == "pull_requests":
+        return PullRequest(id=node["databaseId"], number=node["number"], title=node["title"], state=state, html_url=node["url"])
+    return GithubIssue(id=node["databaseId"], number=node["number"], title=node["title"], state=state,
+                       html_url=node["url"], body=node.get("body"))
+
+async def _graphql_overview(repos: List[Tuple[str, str]], listings: List[str], state: str, max_items: int) -> MultiRepoOverview:
+    """(Internal) Reads the listings of every repository through batched GraphQL queries. Not a tool for the AI.
+
+    Each round sends one aliased connection per (repository, listing) that still has pages,
+    continuing from its endCursor, until every listing is complete or holds max_items rows.
+    """
+    url = settings.github_graphql_url or f"{settings.github_api_url}/graphql"
+    nodes: Dict[Tuple[int, str], List[Dict[str, Any]]] = {(i, listing): [] for i in range(len(repos)) for listing in listings}
+    errors: Dict[int, str] = {}
+    pending = [
+        _GraphqlTask(i, repos[i][0], repos[i][1], listing, min(max_items, GITHUB_PER_PAGE))
+        for i, listing in nodes
+    ]
+    semaphore = asyncio.Semaphore(settings.github_page_concurrency)
+
+    async with upstream_client("github") as client:
+        async def _run(chunk: List[_GraphqlTask]) -> Tuple[List[_GraphqlTask], Dict[str, Any]]:
+            async with semaphore:
+                return chunk, await _graphql_post(client, url, chunk, state)
+
+        try:
+            while pending:
+                rounds = await asyncio.gather(*(_run(chunk) for chunk in _graphql_chunks(pending)))
+                pending = []
+                for chunk, body in rounds:
+                    failures = {e["path"][0]: e.get("message") for e in body.get("errors") or [] if e.get("path")}
+                    for i, task in enumerate(chunk):
+                        repository = body["data"].get(f"t{i}")
+                        if repository is None:
+                            errors[task.index] = failures.get(f"t{i}") or "Repository not found"
+                            continue
+                        connection = repository[_GRAPHQL_LISTINGS[task.listing][0]]
+                        collected = nodes[(task.index, task.listing)]
+                        collected.extend(connection["nodes"])
+                        remaining = max_items - len(collected)
+                        if connection["pageInfo"]["hasNextPage"] and remaining > 0:
+                            pending.append(replace(task, first=min(remaining, GITHUB_PER_PAGE), cursor=connection["pageInfo"]["endCursor"]))
+        except httpx.RequestError as e:
+            raise HTTPException(status_code=502, detail=f"GitHub API error: {e}")
+
+    overviews = []
+    for i, (owner, name) in enumerate(repos):
+        if i in errors:
+            overviews.append(RepoOverview(full_name=f"{owner}/{name}", error=errors[i]))
+            continue
+        listed = {listing: [_graphql_node(listing, node) for node in nodes[(i, listing)]] for listing in listings}
+        if "issues" in listed:
+            issue_index.index_github(owner, name, listed["issues"])
+        overviews.append(RepoOverview(full_name=f"{owner}/{name}", **listed))
+    return MultiRepoOverview(repositories=overviews)
+
+async def _rest_overview(repos: List[Tuple[str, str]], listings: List[str], state: str, max_items: int) -> MultiRepoOverview:
+    """(Internal) Reads the listings with the per-repository REST tools. Not a tool for the AI."""
+    semaphore = asyncio.Semaphore(settings.github_page_concurrency)
+
+    async def _one(owner: str, name: str) -> RepoOverview:
+        async with semaphore:
+            listed: Dict[str, Any] = {}
+            try:
+                if "branches" in listings:
+                    listed["branches"] = (await get_branches(owner, name))[:max_items]
+                if "pull_requests" in listings:
+                    listed["pull_requests"] = await get_pull_requests(owner, name, state, max_items=max_items)
+                if "issues" in listings:
+                    listed["issues"] = await get_issues(owner, name, state, max_items=max_items)
+            except httpx.HTTPStatusError as e:
+                return RepoOverview(full_name=f"{owner}/{name}", error=f"{e.response.status_code} {e.response.reason_phrase}")
+            return RepoOverview(full_name=f"{owner}/{name}", **listed)
+
+    return MultiRepoOverview(repositories=list(await asyncio.gather(*(_one(owner, name) for owner, name in repos))))
+
+@tool(name="github_get_repos_overview")
+async def get_repos_overview(
+    repos: Union[str, List[str], None] = None,
+    include: Optional[List[str]] = None,
+    state: str = "open",
+    max_items: int = GITHUB_PER_PAGE,
+) -> MultiRepoOverview:
+    """Gets branches, pull requests and/or issues of many repositories at once.
+
+    `repos` are "owner/repo" names (a list or comma-separated); all of the user's
+    repositories when omitted. `include` picks listings from branches, pull_requests and
+    issues; `state` and `max_items` apply to each listing of each repository.
+    """
+    listings = list(dict.fromkeys(include or _GRAPHQL_LISTINGS))
+    unknown = [listing for listing in listings if listing not in _GRAPHQL_LISTINGS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown listing(s) {', '.join(unknown)}; use {', '.join(_GRAPHQL_LISTINGS)}")
+    if repos is None:
+        names = [repo.full_name for repo in await get_repos()]
+    else:
+        names = repos.split(",") if isinstance(repos, str) else repos
+    pairs = []
+    for full_name in dict.fromkeys(n.strip() for n in names if n.strip()):
+        owner, _, name = full_name.partition("/")
+        if not owner or not name or "/" in name:
+            raise HTTPException(status_code=400, detail=f"Repository '{full_name}' must be given as owner/repo")
+        pairs.append((owner, name))
+
+    if settings.github_mock or not settings.github_graphql_enabled:
+        return await _rest_overview(pairs, listings, state, max(max_items, 1))
+    return await _graphql_overview(pairs, listings, state, max(max_items, 1))
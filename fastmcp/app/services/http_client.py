@@ -0,0 +1,26 @@
+from typing import Optional
+
+import httpx
+
+from ..config.settings import settings
+from . import metrics_service
+from .resilience import HedgedTransport, ResilientTransport
+
+
+def upstream_client(upstream: str, hedge: Optional[str] = None) -> httpx.AsyncClient:
+    """(Internal) Creates the AsyncClient used for calls to an upstream API ("github" or "jira").
+
+    Requests go through ResilientTransport (retries with jittered backoff and a per-host
+    circuit breaker), and every final response is counted per upstream, method and status
+    code for the /metrics endpoint.
+
+    Read-only call sites may pass `hedge`, a name for the call whose latency distribution
+    decides when a duplicate request is sent (only when HTTP_HEDGE_ENABLED is set).
+    """
+    transport = None
+    if hedge and settings.http_hedge_enabled:
+        transport = HedgedTransport(upstream, f"{upstream}.{hedge}")
+    return httpx.AsyncClient(
+        transport=ResilientTransport(upstream, transport),
+        event_hooks={"response": [metrics_service.upstream_response_hook(upstream)]},
+    )
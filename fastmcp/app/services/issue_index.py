@@ -0,0 +1,213 @@
+import re
+import sqlite3
+import threading
+from typing import Iterable, List, Optional
+
+from ..config.settings import settings
+from ..models.github_models import GithubIssue
+from ..models.index_models import IndexedIssue, IssueSearchResult
+from ..models.jira_models import JiraIssueBasic
+from ..tools import tool
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    container TEXT NOT NULL COLLATE NOCASE,
+    key TEXT NOT NULL COLLATE NOCASE,
+    title TEXT NOT NULL,
+    body TEXT,
+    status TEXT COLLATE NOCASE,
+    assignee TEXT COLLATE NOCASE,
+    priority TEXT COLLATE NOCASE,
+    due_date TEXT,
+    updated TEXT,
+    url TEXT,
+    UNIQUE (source, key)
+);
+CREATE INDEX IF NOT EXISTS issues_status ON issues (source, container, status, updated);
+CREATE INDEX IF NOT EXISTS issues_assignee ON issues (assignee, updated);
+CREATE INDEX IF NOT EXISTS issues_priority ON issues (priority, updated);
+CREATE INDEX IF NOT EXISTS issues_updated ON issues (updated);
+CREATE INDEX IF NOT EXISTS issues_due_date ON issues (due_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5 (title, body, content='issues', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+    INSERT INTO issues_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO issues_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+_COLUMNS = ("source", "container", "key", "title", "body", "status", "assignee", "priority", "due_date", "updated", "url")
+_RESULT_COLUMNS = ", ".join(f"issues.{c}" for c in _COLUMNS if c != "body")
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_query(text: str) -> Optional[str]:
+    """Turns free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+class IssueIndex:
+    """SQLite index of synced Jira and GitHub issues for local filtering and full-text search.
+
+    Rows are written by the services whenever they list issues, so filters over data that
+    was already fetched never go back to Jira or GitHub. `path` defaults to an in-memory
+    database; a file path keeps the index across restarts.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            # Keys of a complete listing, for dropping the rows not in it without one variable per key
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS listed_keys (key TEXT PRIMARY KEY COLLATE NOCASE)")
+
+    def _upsert(self, rows: Iterable[tuple]) -> None:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS if c not in ("source", "key"))
+        self._conn.executemany(
+            f"INSERT INTO issues ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT (source, key) DO UPDATE SET {updates}",
+            rows,
+        )
+
+    def _write(self, source: str, container: str, rows: List[tuple], replace: bool) -> None:
+        with self._lock, self._conn:
+            if replace:
+                # A complete listing: anything not in it was deleted or moved away
+                self._conn.execute("DELETE FROM listed_keys")
+                self._conn.executemany("INSERT OR IGNORE INTO listed_keys (key) VALUES (?)", ((row[2],) for row in rows))
+                self._conn.execute(
+                    "DELETE FROM issues WHERE source = ? AND container = ? AND key NOT IN (SELECT key FROM listed_keys)",
+                    (source, container),
+                )
+            self._upsert(rows)
+
+    def index_jira(self, project_key: str, issues: Iterable[JiraIssueBasic], replace: bool = False) -> None:
+        """Stores Jira issues of one project; `replace` drops the project's rows not listed."""
+        project_key = project_key.upper()
+        base = settings.jira_base_url.rstrip("/")
+        rows = [
+            ("jira", project_key, i.key, i.summary, None, i.status, i.assignee, i.priority, i.due_date, i.updated, f"{base}/browse/{i.key}")
+            for i in issues
+        ]
+        self._write("jira", project_key, rows, replace)
+
+    def index_github(self, owner: str, repo: str, issues: Iterable[GithubIssue], replace: bool = False) -> None:
+        """Stores GitHub issues of one repository; `replace` drops the repository's rows not listed."""
+        container = f"{owner}/{repo}"
+        rows = [
+            ("github", container, f"{container}#{i.number}", i.title, i.body, i.state, None, None, None, None, i.html_url)
+            for i in issues
+        ]
+        self._write("github", container, rows, replace)
+
+    def remove(self, source: str, key: str) -> None:
+        """Drops one issue, e.g. after a webhook reports it deleted."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM issues WHERE source = ? AND key = ?", (source, key))
+
+    def count(self, source: Optional[str] = None, container: Optional[str] = None) -> int:
+        clauses, params = self._filters(source=source, container=container)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM issues WHERE {clauses}", params).fetchone()[0]
+
+    @staticmethod
+    def _filters(source=None, container=None, status=None, assignee=None, priority=None,
+                 due_before=None, updated_since=None):
+        clauses, params = ["1 = 1"], []
+        for column, value in (("source", source), ("container", container), ("status", status), ("priority", priority)):
+            if value:
+                clauses.append(f"issues.{column} = ?")
+                params.append(value)
+        if assignee:
+            # Match the full name or any word in it, so "alice" finds "Alice Smith"
+            clauses.append("(issues.assignee LIKE ? ESCAPE '\\' OR issues.assignee LIKE ? ESCAPE '\\')")
+            params += [f"{_like_escape(assignee)}%", f"% {_like_escape(assignee)}%"]
+        if due_before:
+            clauses.append("issues.due_date IS NOT NULL AND issues.due_date <= ?")
+            params.append(due_before)
+        if updated_since:
+            clauses.append("issues.updated >= ?")
+            params.append(updated_since)
+        return " AND ".join(clauses), params
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        source: Optional[str] = None,
+        container: Optional[str] = None,
+        status: Optional[str] = None,
+        assignee: Optional[str] = None,
+        priority: Optional[str] = None,
+        due_before: Optional[str] = None,
+        updated_since: Optional[str] = None,
+        limit: int = 50,
+    ) -> IssueSearchResult:
+        """Filters indexed issues; `text` searches titles and bodies, best matches first."""
+        clauses, params = self._filters(source, container, status, assignee, priority, due_before, updated_since)
+        match = _fts_query(text) if text else None
+        if match:
+            from_clause = "issues JOIN issues_fts ON issues_fts.rowid = issues.id"
+            clauses += " AND issues_fts MATCH ?"
+            params.append(match)
+            order = "issues_fts.rank"
+        else:
+            from_clause = "issues"
+            order = "issues.updated DESC, issues.id DESC"
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM {from_clause} WHERE {clauses}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {_RESULT_COLUMNS} FROM {from_clause} WHERE {clauses} ORDER BY {order} LIMIT ?",
+                (*params, max(limit, 0)),
+            ).fetchall()
+        return IssueSearchResult(issues=[IndexedIssue(**dict(row)) for row in rows], total=total)
+
+    def clear(self, source: Optional[str] = None) -> None:
+        """Removes every row, or only those of one source."""
+        clauses, params = self._filters(source=source)
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM issues WHERE {clauses}", params)
+
+
+issue_index = IssueIndex(settings.issue_index_path)
+
+
+@tool(name="issues_search")
+async def search_issues(
+    query: Optional[str] = None,
+    source: Optional[str] = None,
+    project: Optional[str] = None,
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[str] = None,
+    updated_since: Optional[str] = None,
+    limit: int = 20,
+) -> IssueSearchResult:
+    """Filters and full-text searches Jira and GitHub issues in the local index."""
+    # `project` is a Jira project key or a GitHub owner/repo
+    if source is None and project:
+        source = "github" if "/" in project else "jira"
+    if source == "jira" and project:
+        project = project.upper()
+        if not issue_index.count("jira", project):
+            # First look at this project: list it once so the index has something to answer from
+            from . import jira_service
+            await jira_service.get_issues_for_project(project)
+    return issue_index.search(
+        text=query, source=source, container=project, status=status, assignee=assignee,
+        priority=priority, due_before=due_before, updated_since=updated_since, limit=limit,
+    )
@@ -1,10 +1,22 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from pathlib import Path
 import httpx
 from fastapi import HTTPException
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from ..config.settings import settings
-from ..models.jira_models import JiraIssue, JiraProject, JiraIssueBasic, JiraSprint, CreateJiraIssue
+from ..models.jira_models import JiraBulkItemResult, JiraBulkResult, JiraIssue, JiraIssueBatch, JiraProject, JiraIssueBasic, JiraSprint, CreateJiraIssue
 from ..tools import tool
+from .cache import TTLCache
+from .http_client import upstream_client
+from .issue_index import issue_index
+from .jira_sync import issue_store
+
+logger = logging.getLogger(__name__)
 
 @tool(name="jira_fetch_issue")
 async def fetch_jira_issue(ticket_id: str) -> JiraIssue:
@@ -22,27 +34,60 @@ async def fetch_jira_issue(ticket_id: str) -> JiraIssue:
     auth = (settings.jira_email, settings.jira_api_token)
     headers = {"Accept": "application/json"}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira", hedge="issue") as client:
         try:
             r = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
             if r.status_code == 404:
                 raise HTTPException(status_code=404, detail="Ticket not found")
             r.raise_for_status()
-            data = r.json()
-            fields = data.get("fields", {}) or {}
-            status = fields.get("status") or {}
-            assignee = fields.get("assignee") or {}
-            description = extract_description(fields.get("description")) or ""
-            return JiraIssue(
-                ticket=data.get("key", ticket_id),
-                title=fields.get("summary", ""),
-                status=status.get("name", ""),
-                assignee=assignee.get("displayName", ""),
-                description=description
-            )
+            return _to_jira_issue(r.json(), ticket_id)
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"Jira API error: {e}")
 
+# Keys per `key in (...)` search; keeps the JQL and URL well under Jira's limits
+JQL_KEYS_PER_REQUEST = 50
+_ISSUE_KEY_RE = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+
+@tool(name="jira_fetch_issues")
+async def fetch_jira_issues(ticket_ids: List[str]) -> JiraIssueBatch:
+    """Fetches several Jira issues at once, in the requested order, reporting keys that were not found."""
+    keys = list(dict.fromkeys(k.strip().upper() for k in ticket_ids if k and k.strip()))
+    valid = [k for k in keys if _ISSUE_KEY_RE.match(k)]
+    if settings.jira_mock:
+        return JiraIssueBatch(
+            issues=[JiraIssue(ticket=k, title="Login bug", status="Open", assignee="alex", description="A mock description") for k in valid],
+            not_found=[k for k in keys if k not in valid],
+        )
+
+    url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/search"
+    auth = (settings.jira_email, settings.jira_api_token)
+    headers = {"Accept": "application/json"}
+
+    async def _search(client: httpx.AsyncClient, chunk: List[str]) -> List[Dict[str, Any]]:
+        params = {
+            "jql": f"key in ({', '.join(chunk)})",
+            "fields": "summary,status,assignee,description",
+            "maxResults": len(chunk),
+            # Unknown keys become warnings instead of failing the whole query
+            "validateQuery": "warn",
+        }
+        response = await client.get(url, auth=auth, headers=headers, params=params, timeout=settings.http_timeout)
+        response.raise_for_status()
+        return response.json().get("issues", [])
+
+    async with upstream_client("jira") as client:
+        try:
+            chunks = [valid[i:i + JQL_KEYS_PER_REQUEST] for i in range(0, len(valid), JQL_KEYS_PER_REQUEST)]
+            pages = await asyncio.gather(*(_search(client, chunk) for chunk in chunks))
+        except httpx.RequestError as e:
+            raise HTTPException(status_code=502, detail=f"Failed to fetch Jira issues: {e}")
+
+    found = {issue.get("key", "").upper(): _to_jira_issue(issue, issue.get("key", "")) for page in pages for issue in page}
+    return JiraIssueBatch(
+        issues=[found[k] for k in keys if k in found],
+        not_found=[k for k in keys if k not in found],
+    )
+
 @tool(name="jira_get_projects")
 async def get_jira_projects() -> List[JiraProject]:
     """Gets a list of all available Jira projects."""
@@ -56,7 +101,7 @@ async def get_jira_projects() -> List[JiraProject]:
     auth = (settings.jira_email, settings.jira_api_token)
     headers = {"Accept": "application/json"}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
             response = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -69,7 +114,7 @@ async def get_jira_projects() -> List[JiraProject]:
 async def get_issues_for_project(project_key: str, status: str = None) -> List[JiraIssueBasic]:
     """Gets a list of issues for a specific project, optionally filtered by status."""
     if settings.jira_mock:
-        return [
+        issues = [
             JiraIssueBasic(
                 key=f"{project_key}-1", 
                 summary="Sample issue 1", 
@@ -93,62 +138,137 @@ async def get_issues_for_project(project_key: str, status: str = None) -> List[J
                 updated="2025-09-03"
             )
         ]
-
-    jql = f"project = {project_key}"
+    elif settings.jira_incremental_sync:
+        issues = await sync_project_issues(project_key)
+        if status:
+            issues = [i for i in issues if (i.status or "").casefold() == status.casefold()]
+        return issues
+    else:
+        jql = f"project = {_jql_string(project_key)}"
+        if status:
+            jql += f" AND status = {_jql_string(status)}"
+
+        async with upstream_client("jira") as client:
+            try:
+                issues = [_to_jira_issue_basic(issue) for issue in await _search_all(client, jql, _ISSUE_LIST_FIELDS)]
+            except httpx.RequestError as e:
+                raise HTTPException(status_code=502, detail=f"Failed to fetch issues for project {project_key}: {str(e)}")
+    # An unfiltered listing is complete, so it also drops issues that disappeared
+    issue_index.index_jira(project_key, issues, replace=not status)
+    return issues
+
+async def get_issues_page(project_key: str, status: str = None, start_at: int = 0, limit: int = 50) -> Tuple[List[JiraIssueBasic], Optional[int]]:
+    """(Internal) Fetches one page of a project's issues. Not a tool for the AI.
+
+    Returns the issues and the offset of the next page, or None after the last one.
+    Only the requested page is fetched from Jira (or sliced from the local sync store).
+    """
+    if settings.jira_mock or settings.jira_incremental_sync:
+        issues = await get_issues_for_project(project_key, status)
+        end = start_at + limit
+        return issues[start_at:end], end if end < len(issues) else None
+
+    jql = f"project = {_jql_string(project_key)}"
     if status:
-        jql += f" AND status = '{status}'"
-    
+        jql += f" AND status = {_jql_string(status)}"
     url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/search"
     auth = (settings.jira_email, settings.jira_api_token)
     headers = {"Accept": "application/json"}
-    params = {
-        "jql": jql,
-        "fields": "summary,status,assignee,priority,duedate,reporter,created,updated",
-        "maxResults": 50,
-        "startAt": 0,
-    }
+    # A fixed order keeps offsets stable between page requests
+    params = {"jql": jql + " ORDER BY key DESC", "fields": _ISSUE_LIST_FIELDS, "maxResults": limit, "startAt": start_at}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
-            issues: List[JiraIssueBasic] = []
-            while True:
-                response = await client.get(url, auth=auth, headers=headers, params=params, timeout=settings.http_timeout)
-                response.raise_for_status()
-                data = response.json()
-                for issue in data.get("issues", []):
-                    fields = issue.get("fields", {})
-                    status_data = fields.get("status", {})
-                    assignee_data = fields.get("assignee", {})
-                    priority_data = fields.get("priority", {})
-                    reporter_data = fields.get("reporter", {})
-                    
-                    # Format dates for better readability
-                    created_date = fields.get("created")
-                    updated_date = fields.get("updated")
-                    due_date = fields.get("duedate")
-                    
-                    if created_date:
-                        created_date = created_date.split("T")[0]  # Extract just the date part
-                    if updated_date:
-                        updated_date = updated_date.split("T")[0]  # Extract just the date part
-                    
-                    issues.append(JiraIssueBasic(
-                        key=issue.get("key"),
-                        summary=fields.get("summary"),
-                        status=status_data.get("name") if status_data else None,
-                        assignee=assignee_data.get("displayName") if assignee_data else "Unassigned",
-                        priority=priority_data.get("name") if priority_data else None,
-                        due_date=due_date,
-                        reporter=reporter_data.get("displayName") if reporter_data else None,
-                        created=created_date,
-                        updated=updated_date
-                    ))
-                if len(data.get("issues", [])) < params["maxResults"]:
-                    break
-                params["startAt"] += params["maxResults"]
-            return issues
+            response = await client.get(url, auth=auth, headers=headers, params=params, timeout=settings.http_timeout)
+            response.raise_for_status()
+            data = response.json()
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"Failed to fetch issues for project {project_key}: {str(e)}")
+    issues = [_to_jira_issue_basic(issue) for issue in data.get("issues", [])]
+    issue_index.index_jira(project_key, issues)
+    # Jira may return fewer than maxResults, so advance by what actually came back
+    next_start = start_at + len(issues)
+    return issues, next_start if issues and next_start < data.get("total", 0) else None
+
+def _jql_string(value: str) -> str:
+    """(Internal) Quotes a value as a JQL string literal. Not a tool for the AI."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+_ISSUE_LIST_FIELDS = "summary,status,assignee,priority,duedate,reporter,created,updated"
+
+async def _search_all(client: httpx.AsyncClient, jql: str, fields: str) -> List[Dict[str, Any]]:
+    """(Internal) Pages through a JQL search and returns the raw issues. Not a tool for the AI."""
+    url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/search"
+    auth = (settings.jira_email, settings.jira_api_token)
+    headers = {"Accept": "application/json"}
+    params = {"jql": jql, "fields": fields, "maxResults": 50, "startAt": 0}
+    issues: List[Dict[str, Any]] = []
+    while True:
+        response = await client.get(url, auth=auth, headers=headers, params=params, timeout=settings.http_timeout)
+        response.raise_for_status()
+        page = response.json().get("issues", [])
+        issues.extend(page)
+        if len(page) < params["maxResults"]:
+            break
+        params["startAt"] += params["maxResults"]
+    return issues
+
+def _to_jira_issue_basic(issue: Dict[str, Any]) -> JiraIssueBasic:
+    """(Internal) Builds a JiraIssueBasic from a search result. Not a tool for the AI."""
+    fields = issue.get("fields", {})
+    status_data = fields.get("status", {})
+    assignee_data = fields.get("assignee", {})
+    priority_data = fields.get("priority", {})
+    reporter_data = fields.get("reporter", {})
+
+    # Format dates for better readability
+    created_date = fields.get("created")
+    updated_date = fields.get("updated")
+    due_date = fields.get("duedate")
+
+    if created_date:
+        created_date = created_date.split("T")[0]  # Extract just the date part
+    if updated_date:
+        updated_date = updated_date.split("T")[0]  # Extract just the date part
+
+    return JiraIssueBasic(
+        key=issue.get("key"),
+        summary=fields.get("summary"),
+        status=status_data.get("name") if status_data else None,
+        assignee=assignee_data.get("displayName") if assignee_data else "Unassigned",
+        priority=priority_data.get("name") if priority_data else None,
+        due_date=due_date,
+        reporter=reporter_data.get("displayName") if reporter_data else None,
+        created=created_date,
+        updated=updated_date
+    )
+
+async def sync_project_issues(project_key: str, full: bool = False) -> List[JiraIssueBasic]:
+    """(Internal) Refreshes the local copy of a project's issues and returns it. Not a tool for the AI.
+
+    After the first full crawl only issues with `updated` past the store's high-water mark
+    are fetched, so a steady-state refresh is one small search.
+    """
+    project_key = project_key.upper()
+    async with issue_store.lock(project_key):
+        if not full and issue_store.fresh(project_key):
+            return issue_store.issues(project_key)
+        minutes = None if full else issue_store.delta_minutes(project_key)
+        jql = f"project = {_jql_string(project_key)}"
+        if minutes is not None:
+            jql += f' AND updated >= "-{minutes}m"'
+        async with upstream_client("jira") as client:
+            try:
+                raw = await _search_all(client, jql + " ORDER BY updated ASC", _ISSUE_LIST_FIELDS)
+            except httpx.RequestError as e:
+                raise HTTPException(status_code=502, detail=f"Failed to sync issues for project {project_key}: {e}")
+        records = [((issue.get("fields") or {}).get("updated"), _to_jira_issue_basic(issue)) for issue in raw]
+        issue_store.apply(project_key, records, full=minutes is None)
+        if minutes is None:
+            issue_index.index_jira(project_key, issue_store.issues(project_key), replace=True)
+        else:
+            issue_index.index_jira(project_key, [issue for _, issue in records])
+        return issue_store.issues(project_key)
 
 @tool(name="jira_create_issue")
 async def create_issue(issue_data: CreateJiraIssue) -> Dict[str, Any]:
@@ -173,7 +293,7 @@ async def create_issue(issue_data: CreateJiraIssue) -> Dict[str, Any]:
         }
     }
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
             response = await client.post(url, auth=auth, headers=headers, json=payload, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -187,21 +307,14 @@ async def assign_issue(issue_key: str, assignee_name: str) -> None:
     if settings.jira_mock:
         return
 
-    user_url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/user/search?query={assignee_name}"
     auth = (settings.jira_email, settings.jira_api_token)
     headers = {"Accept": "application/json"}
     
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
-            user_response = await client.get(user_url, auth=auth, headers=headers, timeout=settings.http_timeout)
-            user_response.raise_for_status()
-            users = user_response.json()
-            if not users:
-                raise HTTPException(status_code=404, detail=f"User '{assignee_name}' not found in Jira.")
-            
-            account_id = users[0].get("accountId")
+            account_id = await _resolve_account_id(client, issue_key, assignee_name)
             if not account_id:
-                raise HTTPException(status_code=404, detail=f"Could not find accountId for user '{assignee_name}'.")
+                raise HTTPException(status_code=404, detail=f"User '{assignee_name}' not found in Jira.")
 
             assign_url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/issue/{issue_key}/assignee"
             payload = {"accountId": account_id}
@@ -212,6 +325,151 @@ async def assign_issue(issue_key: str, assignee_name: str) -> None:
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"Failed to assign issue {issue_key}: {e}")
 
+# Display name / email (casefolded) -> accountId, or None for names Jira did not find
+_account_ids = TTLCache("jira_account_id", ttl=settings.jira_user_cache_ttl, negative_ttl=settings.jira_user_negative_ttl)
+# Projects whose assignable users are already in _account_ids
+_prefetched_projects = TTLCache("jira_assignable_users", ttl=settings.jira_user_cache_ttl)
+
+async def _resolve_account_id(client: httpx.AsyncClient, issue_key: str, assignee_name: str):
+    """(Internal) Looks up a user's accountId through the directory cache. Not a tool for the AI."""
+    name = assignee_name.strip().casefold()
+
+    async def _load():
+        project_key = issue_key.rpartition("-")[0].upper()
+        if settings.jira_prefetch_assignable_users and project_key:
+            await prefetch_assignable_users(project_key, client)
+            hit, account_id = _account_ids.get(name)
+            if hit and account_id:
+                return account_id
+
+        url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/user/search"
+        response = await client.get(
+            url, params={"query": assignee_name.strip()}, auth=(settings.jira_email, settings.jira_api_token),
+            headers={"Accept": "application/json"}, timeout=settings.http_timeout,
+        )
+        response.raise_for_status()
+        users = response.json()
+        # Prefer an exact name/email match over Jira's fuzzy ordering
+        exact = [u for u in users if name in (str(u.get("displayName", "")).casefold(), str(u.get("emailAddress", "")).casefold())]
+        return ((exact or users)[0].get("accountId") if users else None) or None
+
+    return await _account_ids.get_or_load(name, _load)
+
+async def prefetch_assignable_users(project_key: str, client: httpx.AsyncClient = None) -> int:
+    """(Internal) Loads every assignable user of a project into the accountId cache. Not a tool for the AI.
+
+    Returns the number of users cached; a project is fetched at most once per cache TTL.
+    """
+    project_key = project_key.upper()
+    hit, _ = _prefetched_projects.get(project_key)
+    if hit:
+        return 0
+    if client is None:
+        async with upstream_client("jira") as own_client:
+            return await prefetch_assignable_users(project_key, own_client)
+
+    url = f"{settings.jira_base_url.rstrip('/')}/rest/api/3/user/assignable/search"
+    auth = (settings.jira_email, settings.jira_api_token)
+    headers = {"Accept": "application/json"}
+    params = {"project": project_key, "startAt": 0, "maxResults": 1000}
+    count = 0
+    while True:
+        response = await client.get(url, params=params, auth=auth, headers=headers, timeout=settings.http_timeout)
+        response.raise_for_status()
+        users = response.json()
+        for user in users:
+            for label in (user.get("displayName"), user.get("emailAddress")):
+                if label and user.get("accountId"):
+                    _account_ids.set(label.casefold(), user["accountId"])
+            count += 1
+        # Jira may return short pages (it filters users after paging), so only an empty one means the end
+        if not users:
+            break
+        params["startAt"] += len(users)
+    _prefetched_projects.set(project_key, True)
+    return count
+
+# Project key -> board id; boards practically never move, so entries live for a day by default
+_board_ids = TTLCache("jira_board_id", ttl=settings.jira_board_cache_ttl)
+# Board id -> sprint list; kept short since sprints are started and closed from the Jira UI too
+_sprints = TTLCache("jira_sprints", ttl=settings.jira_sprint_cache_ttl)
+
+def _save_board_ids() -> None:
+    """(Internal) Writes the board map to JIRA_BOARD_CACHE_FILE, if configured. Not a tool for the AI."""
+    if not settings.jira_board_cache_file:
+        return
+    now = time.time()
+    entries = {key: {"board_id": board_id, "expires_at": now + ttl} for key, (board_id, ttl) in _board_ids.items().items()}
+    try:
+        path = Path(settings.jira_board_cache_file)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(entries, indent=2))
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning("Could not write Jira board cache %s: %s", settings.jira_board_cache_file, e)
+
+def _load_board_ids() -> None:
+    """(Internal) Restores unexpired board ids from JIRA_BOARD_CACHE_FILE. Not a tool for the AI."""
+    path = Path(settings.jira_board_cache_file) if settings.jira_board_cache_file else None
+    if path is None or not path.exists():
+        return
+    try:
+        entries = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable Jira board cache %s: %s", path, e)
+        return
+    now = time.time()
+    for key, entry in entries.items():
+        ttl = entry.get("expires_at", 0) - now
+        if ttl > 0 and "board_id" in entry:
+            _board_ids.set(key, entry["board_id"], ttl=ttl)
+
+async def warm_caches() -> None:
+    """(Internal) Resolves board ids for JIRA_WARM_PROJECTS at startup. Not a tool for the AI."""
+    if settings.jira_mock:
+        return
+    _load_board_ids()
+    keys = [k.strip().upper() for k in (settings.jira_warm_projects or settings.jira_default_project_key or "").split(",") if k.strip()]
+    results = await asyncio.gather(*(get_board_id_for_project(key) for key in keys), return_exceptions=True)
+    for key, result in zip(keys, results):
+        if isinstance(result, Exception):
+            logger.warning("Could not warm Jira board id for %s: %s", key, getattr(result, "detail", result))
+
+def apply_issue_event(issue: Dict[str, Any], deleted: bool = False) -> Optional[str]:
+    """(Internal) Applies a pushed Jira issue (webhook payload) to the sync store and index. Not a tool for the AI.
+
+    Returns the issue key, or None when the payload carries no key.
+    """
+    key = (issue.get("key") or "").upper()
+    if not key:
+        return None
+    project_key = ((issue.get("fields") or {}).get("project") or {}).get("key") or key.rpartition("-")[0]
+    project_key = project_key.upper()
+    if deleted:
+        issue_store.remove(project_key, key)
+        issue_index.remove("jira", key)
+    else:
+        basic = _to_jira_issue_basic(issue)
+        issue_store.put(project_key, basic)
+        issue_index.index_jira(project_key, [basic])
+    return key
+
+def invalidate_sprints(board_id: Optional[int] = None) -> None:
+    """(Internal) Drops cached sprint lists of one board, or of all boards. Not a tool for the AI."""
+    if board_id is None:
+        _sprints.invalidate()
+    else:
+        _sprints.invalidate(board_id)
+
+def clear_caches() -> None:
+    """(Internal) Drops all cached Jira lookups. Not a tool for the AI."""
+    _account_ids.invalidate()
+    _prefetched_projects.invalidate()
+    _board_ids.invalidate()
+    _sprints.invalidate()
+    issue_store.clear()
+    issue_index.clear("jira")
+
 @tool(name="jira_get_possible_transitions")
 async def get_possible_transitions(issue_key: str) -> List[Dict[str, Any]]:
     """Gets the possible workflow transitions for a Jira issue."""
@@ -222,7 +480,7 @@ async def get_possible_transitions(issue_key: str) -> List[Dict[str, Any]]:
     auth = (settings.jira_email, settings.jira_api_token)
     headers = {"Accept": "application/json"}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
             response = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -241,7 +499,7 @@ async def transition_issue(issue_key: str, transition_id: str) -> Dict[str, Any]
     headers = {"Accept": "application/json", "Content-Type": "application/json"}
     payload = {"transition": {"id": transition_id}}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
             response = await client.post(url, auth=auth, headers=headers, json=payload, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -261,7 +519,7 @@ async def get_issue_comments(issue_key: str) -> List[Dict[str, Any]]:
     auth = (settings.jira_email, settings.jira_api_token)
     headers = {"Accept": "application/json"}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira", hedge="comments") as client:
         try:
             response = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -285,7 +543,7 @@ async def comment_issue(issue_key: str, comment_text: str) -> Dict[str, Any]:
         }
     }
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
             response = await client.post(url, auth=auth, headers=headers, json=payload, timeout=settings.http_timeout)
             response.raise_for_status()
@@ -295,20 +553,31 @@ async def comment_issue(issue_key: str, comment_text: str) -> Dict[str, Any]:
 
 async def get_board_id_for_project(project_key: str) -> int:
     """(Internal) Gets the board ID for a project. Not a tool for the AI."""
-    url = f"{settings.jira_base_url.rstrip('/')}/rest/agile/1.0/board?projectKeyOrId={project_key}"
-    auth = (settings.jira_email, settings.jira_api_token)
-    headers = {"Accept": "application/json"}
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
-            response.raise_for_status()
-            boards = response.json().get("values", [])
-            if not boards:
-                raise HTTPException(status_code=404, detail=f"No board found for project {project_key}")
-            return boards[0]['id']
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=502, detail=f"Failed to get board for project {project_key}: {e}")
+    project_key = project_key.upper()
+    loaded = False
+
+    async def _load() -> int:
+        nonlocal loaded
+        url = f"{settings.jira_base_url.rstrip('/')}/rest/agile/1.0/board"
+        auth = (settings.jira_email, settings.jira_api_token)
+        headers = {"Accept": "application/json"}
+
+        async with upstream_client("jira") as client:
+            try:
+                response = await client.get(url, params={"projectKeyOrId": project_key}, auth=auth, headers=headers, timeout=settings.http_timeout)
+                response.raise_for_status()
+                boards = response.json().get("values", [])
+                if not boards:
+                    raise HTTPException(status_code=404, detail=f"No board found for project {project_key}")
+                loaded = True
+                return boards[0]['id']
+            except httpx.RequestError as e:
+                raise HTTPException(status_code=502, detail=f"Failed to get board for project {project_key}: {e}")
+
+    board_id = await _board_ids.get_or_load(project_key, _load)
+    if loaded:
+        _save_board_ids()
+    return board_id
 
 @tool(name="jira_get_sprints")
 async def get_sprints(project_key: str) -> List[JiraSprint]:
@@ -324,29 +593,33 @@ async def get_sprints(project_key: str) -> List[JiraSprint]:
     auth = (settings.jira_email, settings.jira_api_token)
     headers = {"Accept": "application/json"}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
-            response.raise_for_status()
-            sprints: List[JiraSprint] = []
-            data = response.json()
-            sprints.extend([JiraSprint(**s) for s in data.get("values", [])])
-            # Jira Agile sprint list supports pagination with 'startAt' and 'maxResults' via query params; implement simple forward paging
-            start_at = data.get("startAt", 0)
-            max_results = data.get("maxResults", len(sprints))
-            is_last = data.get("isLast", True)
-            while not is_last:
-                params = {"startAt": start_at + max_results}
-                response = await client.get(url, auth=auth, headers=headers, params=params, timeout=settings.http_timeout)
+    async def _load() -> List[JiraSprint]:
+        async with upstream_client("jira") as client:
+            try:
+                response = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
                 response.raise_for_status()
+                sprints: List[JiraSprint] = []
                 data = response.json()
                 sprints.extend([JiraSprint(**s) for s in data.get("values", [])])
-                start_at = data.get("startAt", start_at + max_results)
-                max_results = data.get("maxResults", max_results)
+                # Jira Agile sprint list supports pagination with 'startAt' and 'maxResults' via query params; implement simple forward paging
+                start_at = data.get("startAt", 0)
+                max_results = data.get("maxResults", len(sprints))
                 is_last = data.get("isLast", True)
-            return sprints
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=502, detail=f"Failed to get sprints for project {project_key}: {e}")
+                while not is_last:
+                    params = {"startAt": start_at + max_results}
+                    response = await client.get(url, auth=auth, headers=headers, params=params, timeout=settings.http_timeout)
+                    response.raise_for_status()
+                    data = response.json()
+                    sprints.extend([JiraSprint(**s) for s in data.get("values", [])])
+                    start_at = data.get("startAt", start_at + max_results)
+                    max_results = data.get("maxResults", max_results)
+                    is_last = data.get("isLast", True)
+                return sprints
+            except httpx.RequestError as e:
+                raise HTTPException(status_code=502, detail=f"Failed to get sprints for project {project_key}: {e}")
+
+    # Copy so callers can't mutate the cached list
+    return list(await _sprints.get_or_load(board_id, _load))
 
 @tool(name="jira_move_issue_to_sprint")
 async def move_issue_to_sprint(sprint_id: int, issue_key: str) -> None:
@@ -359,12 +632,187 @@ async def move_issue_to_sprint(sprint_id: int, issue_key: str) -> None:
     headers = {"Content-Type": "application/json"}
     payload = {"issues": [issue_key]}
 
-    async with httpx.AsyncClient() as client:
+    async with upstream_client("jira") as client:
         try:
             response = await client.post(url, auth=auth, headers=headers, json=payload, timeout=settings.http_timeout)
             response.raise_for_status()
         except httpx.RequestError as e:
             raise HTTPException(status_code=502, detail=f"Failed to move issue {issue_key} to sprint {sprint_id}: {e}")
+    # The sprint id alone doesn't say which board it belongs to, so drop every cached list
+    _sprints.invalidate()
+
+# The Agile API accepts at most 50 issues per move request
+SPRINT_MOVE_BATCH_SIZE = 50
+# Upper bound for one bulk call, so a mistyped range can't touch a whole project
+MAX_BULK_ISSUES = 500
+_KEY_RANGE_RE = re.compile(r"^([A-Z][A-Z0-9_]*)-(\d+)\s*\.\.\s*(?:\1-)?(\d+)$")
+
+def parse_issue_keys(ticket_ids) -> List[str]:
+    """(Internal) Normalizes a list or comma-separated string of keys, expanding ranges like TP-1..TP-40. Not a tool for the AI."""
+    if isinstance(ticket_ids, str):
+        ticket_ids = ticket_ids.split(",")
+    keys: List[str] = []
+    for raw in ticket_ids:
+        key = str(raw).strip().upper()
+        match = _KEY_RANGE_RE.match(key)
+        if match:
+            project, start, end = match.group(1), int(match.group(2)), int(match.group(3))
+            keys.extend(f"{project}-{n}" for n in range(start, end + 1))
+        elif key:
+            keys.append(key)
+    keys = list(dict.fromkeys(keys))
+    if len(keys) > MAX_BULK_ISSUES:
+        raise HTTPException(status_code=400, detail=f"Bulk operations are limited to {MAX_BULK_ISSUES} issues, got {len(keys)}.")
+    return keys
+
+def _error_detail(error: Exception) -> str:
+    """(Internal) Short per-issue error text for bulk results. Not a tool for the AI."""
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            messages = error.response.json().get("errorMessages") or []
+        except ValueError:
+            messages = []
+        return f"HTTP {error.response.status_code}" + (f": {'; '.join(messages)}" if messages else "")
+    return str(error) or type(error).__name__
+
+def _bulk_result(outcomes: Dict[str, Any]) -> JiraBulkResult:
+    """(Internal) Builds a JiraBulkResult from {issue_key: None or error}. Not a tool for the AI."""
+    results = [
+        JiraBulkItemResult(issue_key=key, status="success") if error is None
+        else JiraBulkItemResult(issue_key=key, status="error", detail=_error_detail(error))
+        for key, error in outcomes.items()
+    ]
+    failed = sum(r.status == "error" for r in results)
+    return JiraBulkResult(results=results, succeeded=len(results) - failed, failed=failed)
+
+async def _for_each_issue(keys: List[str], operation) -> Dict[str, Any]:
+    """(Internal) Runs `operation(key)` for every key with bounded concurrency. Not a tool for the AI.
+
+    Returns {key: None} on success or {key: exception}; one failing issue never stops the others.
+    """
+    limit = asyncio.Semaphore(max(settings.jira_bulk_concurrency, 1))
+
+    async def _run(key: str):
+        async with limit:
+            try:
+                await operation(key)
+            except (HTTPException, httpx.HTTPError) as e:
+                return e
+            return None
+
+    return dict(zip(keys, await asyncio.gather(*(_run(key) for key in keys))))
+
+@tool(name="jira_bulk_move_issues_to_sprint")
+async def bulk_move_issues_to_sprint(sprint_id: int, issue_keys: List[str]) -> JiraBulkResult:
+    """Moves many Jira issues to a sprint, up to 50 per request."""
+    keys = parse_issue_keys(issue_keys)
+    if settings.jira_mock:
+        return _bulk_result({key: None for key in keys})
+
+    url = f"{settings.jira_base_url.rstrip('/')}/rest/agile/1.0/sprint/{sprint_id}/issue"
+    auth = (settings.jira_email, settings.jira_api_token)
+    headers = {"Content-Type": "application/json"}
+    outcomes: Dict[str, Any] = {}
+
+    async with upstream_client("jira") as client:
+        async def _post(chunk: List[str]):
+            response = await client.post(url, auth=auth, headers=headers, json={"issues": chunk}, timeout=settings.http_timeout)
+            response.raise_for_status()
+
+        async def _move(chunk: List[str]) -> Dict[str, Any]:
+            try:
+                await _post(chunk)
+            except httpx.HTTPStatusError as e:
+                # The Agile API rejects a whole batch for one bad key; moving the keys one by one finds it
+                if len(chunk) > 1 and e.response.status_code < 500 and e.response.status_code != 429:
+                    return await _for_each_issue(chunk, lambda key: _post([key]))
+                return dict.fromkeys(chunk, e)
+            except httpx.HTTPError as e:
+                # The batch never got an answer, so the error belongs to every key in it
+                return dict.fromkeys(chunk, e)
+            return dict.fromkeys(chunk)
+
+        chunks = [keys[i:i + SPRINT_MOVE_BATCH_SIZE] for i in range(0, len(keys), SPRINT_MOVE_BATCH_SIZE)]
+        for chunk_outcomes in await asyncio.gather(*(_move(chunk) for chunk in chunks)):
+            outcomes.update(chunk_outcomes)
+    _sprints.invalidate()
+    return _bulk_result(outcomes)
+
+@tool(name="jira_bulk_transition_issues")
+async def bulk_transition_issues(issue_keys: List[str], transition: str) -> JiraBulkResult:
+    """Transitions many Jira issues, by transition ID or by target status / transition name."""
+    keys = parse_issue_keys(issue_keys)
+    if settings.jira_mock:
+        return _bulk_result({key: None for key in keys})
+
+    base = settings.jira_base_url.rstrip('/')
+    auth = (settings.jira_email, settings.jira_api_token)
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    wanted = str(transition).strip()
+
+    async with upstream_client("jira") as client:
+        async def _transition(key: str):
+            url = f"{base}/rest/api/3/issue/{key}/transitions"
+            transition_id = wanted
+            if not wanted.isdigit():
+                # Workflows differ per issue type, so a status name is resolved per issue
+                response = await client.get(url, auth=auth, headers=headers, timeout=settings.http_timeout)
+                response.raise_for_status()
+                options = response.json().get("transitions", [])
+                match = next((t for t in options if wanted.casefold() in (
+                    str(t.get("name", "")).casefold(), str((t.get("to") or {}).get("name", "")).casefold())), None)
+                if match is None:
+                    available = ", ".join(t.get("name", "") for t in options) or "none"
+                    raise HTTPException(status_code=400, detail=f"No transition to '{wanted}' for {key} (available: {available}).")
+                transition_id = match["id"]
+            response = await client.post(url, auth=auth, headers=headers, json={"transition": {"id": transition_id}}, timeout=settings.http_timeout)
+            response.raise_for_status()
+
+        return _bulk_result(await _for_each_issue(keys, _transition))
+
+@tool(name="jira_bulk_assign_issues")
+async def bulk_assign_issues(issue_keys: List[str], assignee_name: str) -> JiraBulkResult:
+    """Assigns many Jira issues to one user, resolving the user once."""
+    keys = parse_issue_keys(issue_keys)
+    if settings.jira_mock:
+        return _bulk_result({key: None for key in keys})
+
+    base = settings.jira_base_url.rstrip('/')
+    auth = (settings.jira_email, settings.jira_api_token)
+    headers = {"Accept": "application/json"}
+
+    async with upstream_client("jira") as client:
+        try:
+            account_id = await _resolve_account_id(client, keys[0] if keys else "", assignee_name)
+            if not account_id:
+                raise HTTPException(status_code=404, detail=f"User '{assignee_name}' not found in Jira.")
+        except (HTTPException, httpx.HTTPError) as e:
+            # Without the user no issue can be assigned; report that per issue like the other bulk tools
+            if isinstance(e, httpx.HTTPError) and not isinstance(e, httpx.HTTPStatusError):
+                e = HTTPException(status_code=502, detail=f"Failed to look up user '{assignee_name}': {e}")
+            return _bulk_result(dict.fromkeys(keys, e))
+
+        async def _assign(key: str):
+            response = await client.put(f"{base}/rest/api/3/issue/{key}/assignee", auth=auth, headers=headers,
+                                        json={"accountId": account_id}, timeout=settings.http_timeout)
+            response.raise_for_status()
+
+        return _bulk_result(await _for_each_issue(keys, _assign))
+
+def _to_jira_issue(data: Dict[str, Any], ticket_id: str) -> JiraIssue:
+    """(Internal) Builds a JiraIssue from an issue resource. Not a tool for the AI."""
+    fields = data.get("fields", {}) or {}
+    status = fields.get("status") or {}
+    assignee = fields.get("assignee") or {}
+    return JiraIssue(
+        ticket=data.get("key", ticket_id),
+        title=fields.get("summary", ""),
+        status=status.get("name", ""),
+        assignee=assignee.get("displayName", ""),
+        description=extract_description(fields.get("description")) or ""
+    )
 
 def extract_description(description_doc: dict) -> str:
     """(Internal) Extracts text from Jira's description document. Not a tool for the AI."""
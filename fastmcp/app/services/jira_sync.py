@@ -0,0 +1,177 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config.settings import settings
+from ..models.jira_models import JiraIssueBasic
+
+logger = logging.getLogger(__name__)
+
+# Jira's timestamp format, e.g. 2025-09-01T12:30:00.000+0000
+_JIRA_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+def parse_jira_time(value: Optional[str]) -> Optional[datetime]:
+    """Parses a Jira `updated`/`created` timestamp; returns None for missing or odd values."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, _JIRA_TIME_FORMAT)
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+
+def _issue_number(key: str) -> int:
+    number = key.rpartition("-")[2]
+    return int(number) if number.isdigit() else 0
+
+
+@dataclass
+class ProjectSnapshot:
+    """Everything known locally about one project's issues."""
+
+    issues: Dict[str, JiraIssueBasic] = field(default_factory=dict)
+    # Latest raw `updated` timestamp seen; deltas are fetched from here on
+    high_water: Optional[str] = None
+    # Wall-clock time of the last full crawl
+    full_synced_at: float = 0.0
+    # Wall-clock time of the last crawl or delta search (not persisted)
+    synced_at: float = 0.0
+
+
+class IssueStore:
+    """Local copy of `JiraIssueBasic` rows per project with an `updated` high-water mark.
+
+    The store does no HTTP itself: jira_service crawls Jira and feeds results in with
+    `apply`. When `path` is given the snapshots are also kept in a JSON file, so a restart
+    resumes with a delta instead of a full crawl.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.projects: Dict[str, ProjectSnapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._load()
+
+    def lock(self, project_key: str) -> asyncio.Lock:
+        """Serializes refreshes of one project so concurrent callers share the result."""
+        return self._locks.setdefault(project_key, asyncio.Lock())
+
+    def delta_minutes(self, project_key: str) -> Optional[int]:
+        """Minutes of history a delta refresh must cover, or None when a full crawl is due.
+
+        Jira evaluates absolute JQL dates in the caller's profile timezone, so the window is
+        expressed relative to now (`updated >= "-Nm"`) and padded by the configured overlap
+        to absorb clock skew and JQL's minute granularity.
+        """
+        snapshot = self.projects.get(project_key)
+        if snapshot is None or snapshot.high_water is None:
+            return None
+        if time.time() - snapshot.full_synced_at >= settings.jira_sync_full_interval:
+            # Deltas can't see deletions or moves to another project; a periodic crawl does
+            return None
+        mark = parse_jira_time(snapshot.high_water)
+        if mark is None:
+            return None
+        elapsed = (datetime.now(timezone.utc) - mark).total_seconds()
+        return max(math.ceil(elapsed / 60), 0) + settings.jira_sync_overlap_minutes
+
+    def fresh(self, project_key: str) -> bool:
+        """True while the last search is younger than JIRA_SYNC_MIN_INTERVAL.
+
+        With Jira webhooks keeping the snapshot current between searches, reads inside that
+        window are served from the store without asking Jira.
+        """
+        snapshot = self.projects.get(project_key)
+        return snapshot is not None and time.time() - snapshot.synced_at < settings.jira_sync_min_interval
+
+    def apply(self, project_key: str, records: Iterable[Tuple[str, JiraIssueBasic]], full: bool) -> None:
+        """Merges (raw updated timestamp, issue) pairs; a full crawl replaces the snapshot."""
+        if full:
+            snapshot = self.projects[project_key] = ProjectSnapshot(full_synced_at=time.time())
+        else:
+            snapshot = self.projects.setdefault(project_key, ProjectSnapshot())
+        snapshot.synced_at = time.time()
+        mark = parse_jira_time(snapshot.high_water)
+        for raw_updated, issue in records:
+            snapshot.issues[issue.key] = issue
+            updated = parse_jira_time(raw_updated)
+            if updated is not None and (mark is None or updated > mark):
+                mark, snapshot.high_water = updated, raw_updated
+        self._save()
+
+    def put(self, project_key: str, issue: JiraIssueBasic) -> bool:
+        """Stores one pushed issue (e.g. from a webhook) in an already synced project.
+
+        The high-water mark is left alone: a pushed change says nothing about other issues,
+        so the next delta search must still cover everything since the last one. Returns
+        False when the project has no snapshot yet.
+        """
+        snapshot = self.projects.get(project_key)
+        if snapshot is None:
+            return False
+        snapshot.issues[issue.key] = issue
+        self._save()
+        return True
+
+    def remove(self, project_key: str, issue_key: str) -> None:
+        """Forgets one issue, e.g. after Jira reports it deleted."""
+        snapshot = self.projects.get(project_key)
+        if snapshot is not None and snapshot.issues.pop(issue_key, None) is not None:
+            self._save()
+
+    def issues(self, project_key: str) -> List[JiraIssueBasic]:
+        """The project's issues, newest key first."""
+        snapshot = self.projects.get(project_key)
+        if snapshot is None:
+            return []
+        return sorted(snapshot.issues.values(), key=lambda issue: _issue_number(issue.key), reverse=True)
+
+    def clear(self) -> None:
+        """Forgets every project in memory; the file is rewritten on the next apply."""
+        self.projects.clear()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        data = {
+            key: {
+                "high_water": snapshot.high_water,
+                "full_synced_at": snapshot.full_synced_at,
+                "issues": [issue.model_dump() for issue in snapshot.issues.values()],
+            }
+            for key, snapshot in self.projects.items()
+        }
+        try:
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning("Could not write Jira sync store %s: %s", self.path, e)
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            for key, entry in data.items():
+                self.projects[key] = ProjectSnapshot(
+                    issues={i["key"]: JiraIssueBasic(**i) for i in entry.get("issues", [])},
+                    high_water=entry.get("high_water"),
+                    full_synced_at=entry.get("full_synced_at", 0.0),
+                )
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning("Ignoring unreadable Jira sync store %s: %s", self.path, e)
+            self.projects.clear()
+
+
+issue_store = IssueStore(settings.jira_sync_store_file)
@@ -0,0 +1,247 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+
+# Dedicated registry so the /metrics output only contains what this service exports
+registry = CollectorRegistry()
+
+HTTP_REQUESTS = Counter(
+    "fastmcp_http_requests_total",
+    "HTTP requests handled by the API, by route template and status code.",
+    ["method", "route", "status"],
+    registry=registry,
+)
+HTTP_REQUEST_LATENCY = Histogram(
+    "fastmcp_http_request_duration_seconds",
+    "Latency of HTTP requests handled by the API.",
+    ["method", "route"],
+    registry=registry,
+)
+TOOL_CALLS = Counter(
+    "fastmcp_tool_calls_total",
+    "Tool runner invocations by tool name and outcome (success or error).",
+    ["tool", "outcome"],
+    registry=registry,
+)
+TOOL_LATENCY = Histogram(
+    "fastmcp_tool_call_duration_seconds",
+    "Latency of tool runner invocations.",
+    ["tool"],
+    registry=registry,
+)
+UPSTREAM_RESPONSES = Counter(
+    "fastmcp_upstream_responses_total",
+    "Responses received from upstream APIs (github, jira) by method and status code.",
+    ["upstream", "method", "status"],
+    registry=registry,
+)
+UPSTREAM_RETRIES = Counter(
+    "fastmcp_upstream_retries_total",
+    "Upstream requests retried, by upstream and reason (status code or transport error).",
+    ["upstream", "reason"],
+    registry=registry,
+)
+CIRCUIT_STATE = Gauge(
+    "fastmcp_circuit_breaker_open",
+    "1 while the circuit breaker for an upstream host is open or half-open, else 0.",
+    ["host"],
+    registry=registry,
+)
+CIRCUIT_REJECTIONS = Counter(
+    "fastmcp_circuit_breaker_rejections_total",
+    "Upstream calls failed fast because the circuit was open.",
+    ["upstream"],
+    registry=registry,
+)
+UPSTREAM_HEDGES = Counter(
+    "fastmcp_upstream_hedges_total",
+    "Hedged upstream GETs, by whether the duplicate request won or lost the race.",
+    ["upstream", "result"],
+    registry=registry,
+)
+GEMINI_LATENCY = Histogram(
+    "fastmcp_gemini_call_duration_seconds",
+    "Latency of Gemini generate_content calls by call site.",
+    ["call"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0),
+    registry=registry,
+)
+GEMINI_TOKENS = Counter(
+    "fastmcp_gemini_tokens_total",
+    "Gemini token usage by call site and kind (prompt, candidates, cached, total).",
+    ["call", "kind"],
+    registry=registry,
+)
+PROMPT_SECTION_TOKENS = Histogram(
+    "fastmcp_prompt_section_tokens",
+    "Estimated tokens of each assembled prompt section (context, history, request, tool_results) after budgeting.",
+    ["section"],
+    buckets=(50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000),
+    registry=registry,
+)
+PROMPT_TRIMS = Counter(
+    "fastmcp_prompt_trims_total",
+    "Prompt sections cut down to fit their token budget, by section.",
+    ["section"],
+    registry=registry,
+)
+CACHE_REQUESTS = Counter(
+    "fastmcp_cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ["cache", "result"],
+    registry=registry,
+)
+WEBHOOK_EVENTS = Counter(
+    "fastmcp_webhook_events_total",
+    "Webhook deliveries by source, event and result (applied, ignored or rejected).",
+    ["source", "event", "result"],
+    registry=registry,
+)
+CONTEXT_FILE_BYTES = Gauge(
+    "fastmcp_context_file_bytes",
+    "Size of the persisted session context file in bytes.",
+    registry=registry,
+)
+
+# Usage metadata attribute -> token kind label
+_TOKEN_FIELDS = {
+    "prompt_token_count": "prompt",
+    "candidates_token_count": "candidates",
+    "cached_content_token_count": "cached",
+    "total_token_count": "total",
+}
+
+
+@dataclass
+class GeminiUsage:
+    """Token counts of the Gemini calls made while handling one request."""
+
+    calls: int = 0
+    prompt: int = 0
+    candidates: int = 0
+    # Part of `prompt` served from a context cache, billed at the reduced cached rate
+    cached: int = 0
+    total: int = 0
+    # Estimated tokens per assembled prompt section, and the sections that had to be cut
+    sections: Dict[str, int] = field(default_factory=dict)
+    trimmed: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        fields = asdict(self)
+        fields["cached_ratio"] = round(self.cached / self.prompt, 3) if self.prompt else 0.0
+        return fields
+
+
+_gemini_usage: ContextVar[Optional[GeminiUsage]] = ContextVar("gemini_usage", default=None)
+
+
+@contextmanager
+def track_gemini_usage() -> Iterator[GeminiUsage]:
+    """Totals the tokens of every Gemini call made inside the block.
+
+    Calls from tasks started inside the block (e.g. concurrent tool calls) count as well,
+    since they inherit the context.
+    """
+    usage = GeminiUsage()
+    token = _gemini_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _gemini_usage.reset(token)
+
+
+def render_latest() -> bytes:
+    """(Internal) Renders all metrics in the Prometheus text exposition format."""
+    return generate_latest(registry)
+
+
+def observe_http_request(method: str, route: str, status: int, duration: float) -> None:
+    HTTP_REQUESTS.labels(method=method, route=route, status=str(status)).inc()
+    HTTP_REQUEST_LATENCY.labels(method=method, route=route).observe(duration)
+
+
+def is_error_result(result: Any) -> bool:
+    """Tool runners report some failures as {"status": "error"} / {"error": ...} dicts instead of raising."""
+    return isinstance(result, dict) and (result.get("status") == "error" or "error" in result)
+
+
+def observe_tool_call(tool: str, duration: float, ok: bool) -> None:
+    TOOL_CALLS.labels(tool=tool, outcome="success" if ok else "error").inc()
+    TOOL_LATENCY.labels(tool=tool).observe(duration)
+
+
+def observe_gemini_call(call: str, duration: float, response: Any = None) -> None:
+    """Records latency and, when the response carries usage metadata, token counts."""
+    GEMINI_LATENCY.labels(call=call).observe(duration)
+    tracked = _gemini_usage.get()
+    if tracked is not None:
+        tracked.calls += 1
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for field, kind in _TOKEN_FIELDS.items():
+        value = getattr(usage, field, None)
+        if isinstance(value, int) and value > 0:
+            GEMINI_TOKENS.labels(call=call, kind=kind).inc(value)
+            if tracked is not None:
+                setattr(tracked, kind, getattr(tracked, kind) + value)
+
+
+def observe_prompt_section(section: str, tokens: int, trimmed: bool) -> None:
+    """Records the size of an assembled prompt section, also in the request's tracked usage."""
+    PROMPT_SECTION_TOKENS.labels(section=section).observe(tokens)
+    if trimmed:
+        PROMPT_TRIMS.labels(section=section).inc()
+    tracked = _gemini_usage.get()
+    if tracked is not None:
+        tracked.sections[section] = tracked.sections.get(section, 0) + tokens
+        if trimmed and section not in tracked.trimmed:
+            tracked.trimmed.append(section)
+
+
+def observe_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def observe_webhook_event(source: str, event: str, result: str) -> None:
+    WEBHOOK_EVENTS.labels(source=source, event=event, result=result).inc()
+
+
+def observe_context_file(path: Path) -> None:
+    try:
+        CONTEXT_FILE_BYTES.set(Path(path).stat().st_size)
+    except OSError:
+        pass
+
+
+def observe_retry(upstream: str, reason: str) -> None:
+    UPSTREAM_RETRIES.labels(upstream=upstream, reason=reason).inc()
+
+
+def observe_hedge(upstream: str, result: str) -> None:
+    UPSTREAM_HEDGES.labels(upstream=upstream, result=result).inc()
+
+
+def set_circuit_state(host: str, state: str) -> None:
+    CIRCUIT_STATE.labels(host=host).set(0 if state == "closed" else 1)
+
+
+def observe_circuit_rejection(upstream: str) -> None:
+    CIRCUIT_REJECTIONS.labels(upstream=upstream).inc()
+
+
+def upstream_response_hook(upstream: str):
+    """Builds an httpx response event hook that counts responses for the given upstream."""
+    async def _hook(response: httpx.Response) -> None:
+        UPSTREAM_RESPONSES.labels(
+            upstream=upstream,
+            method=response.request.method,
+            status=str(response.status_code),
+        ).inc()
+    return _hook
+
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Any, Dict, List, Optional
+
+import google.generativeai as genai
+from fastapi import HTTPException
+
+from ..config.settings import settings
+from ..models.github_models import PullRequestSummary
+from ..tools import tool
+from . import ai_service, github_service, metrics_service
+from .ai_service import estimate_tokens
+from .cache import TTLCache
+
+# One entry per (owner, repo, PR, head SHA): a new push changes the SHA and so the key
+_summaries = TTLCache("pr_summary", ttl=settings.pr_summary_cache_ttl, maxsize=256)
+
+_MAP_PROMPT = (
+    "You are reviewing part of the diff of pull request #{number} \"{title}\". "
+    "Summarize what these changes do, file by file, in a few short bullet points. "
+    "Mention behaviour changes, new or removed APIs and anything risky; skip formatting-only edits.\n\n{diff}"
+)
+
+_WHOLE_PROMPT = (
+    "Summarize pull request #{number} \"{title}\" from its diff.\n"
+    "PR description: {body}\n\n"
+    "Start with one or two sentences on its purpose, then the notable changes as bullet points, "
+    "then any risks worth a reviewer's attention.\n\n{diff}"
+)
+
+_REDUCE_PROMPT = (
+    "Below are summaries of consecutive parts of the diff of pull request #{number} \"{title}\".\n"
+    "PR description: {body}\n\n"
+    "Combine them into one summary of the whole pull request: start with one or two sentences "
+    "on its purpose, then the notable changes as bullet points, then any risks worth a reviewer's attention.\n\n{parts}"
+)
+
+
+def _split_lines(text: str, limit: int) -> List[str]:
+    """(Internal) Cuts text into pieces of whole lines of at most `limit` tokens each. Not a tool for the AI.
+
+    A single line longer than the limit is cut mid-line rather than overflowing the chunk.
+    """
+    max_chars = max(limit, 1) * 4
+    pieces: List[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if len(current) + len(line) > max_chars:
+            pieces.append(current)
+            current = ""
+        current += line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _file_sections(file: Dict[str, Any], limit: int) -> List[str]:
+    """(Internal) Renders one changed file as diff text, split so no section exceeds `limit` tokens. Not a tool for the AI."""
+    name = file.get("filename", "?")
+    if file.get("previous_filename"):
+        name = f"{file['previous_filename']} -> {name}"
+    header = f"--- {name} ({file.get('status', 'modified')}, +{file.get('additions', 0)} -{file.get('deletions', 0)})\n"
+    patch = file.get("patch")
+    if not patch:
+        # Binary files and diffs GitHub considers too large come without a patch
+        return [header + "(no textual diff)\n"]
+    body_limit = max(limit - estimate_tokens(header), 1)
+    pieces = _split_lines(patch if patch.endswith("\n") else patch + "\n", body_limit)
+    if len(pieces) == 1:
+        return [header + pieces[0]]
+    return [f"{header.rstrip()} [part {i} of {len(pieces)}]\n{piece}" for i, piece in enumerate(pieces, 1)]
+
+
+async def _generate(prompt: str, call: str) -> str:
+    """(Internal) One plain-text Gemini call, timed under `call`. Not a tool for the AI."""
+    model = genai.GenerativeModel("gemini-2.5-flash-lite")
+    start = time.perf_counter()
+    try:
+        response = await ai_service.generate_content(model, prompt)
+        metrics_service.observe_gemini_call(call, time.perf_counter() - start, response)
+        return (response.text or "").strip()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
+
+
+async def _reduce(summaries: List[str], number: int, title: str, body: str) -> str:
+    """(Internal) Folds chunk summaries into one, in rounds when they don't fit one prompt. Not a tool for the AI."""
+    limit = settings.pr_summary_chunk_tokens
+    semaphore = asyncio.Semaphore(max(settings.pr_summary_concurrency, 1))
+
+    async def _combine(group: List[str]) -> str:
+        parts = "\n\n".join(f"Part {i}:\n{text}" for i, text in enumerate(group, 1))
+        async with semaphore:
+            return await _generate(
+                _REDUCE_PROMPT.format(number=number, title=title, body=body or "(none)", parts=parts), "pr_summary_reduce"
+            )
+
+    while True:
+        groups: List[List[str]] = [[]]
+        used = 0
+        for text in summaries:
+            tokens = estimate_tokens(text)
+            # At least two per group, so every round shrinks the list even for oversized summaries
+            if len(groups[-1]) >= 2 and used + tokens > limit:
+                groups.append([])
+                used = 0
+            groups[-1].append(text)
+            used += tokens
+        if len(groups) == 1:
+            return await _combine(groups[0])
+        summaries = list(await asyncio.gather(*(_combine(group) for group in groups)))
+
+
+async def _summarize(owner: str, repo: str, pr_number: int, pr: Dict[str, Any]) -> PullRequestSummary:
+    """(Internal) Map-reduce summary of a PR's diff. Not a tool for the AI.
+
+    Files are streamed and packed into chunks of up to PR_SUMMARY_CHUNK_TOKENS; each full
+    chunk is summarized right away (at most PR_SUMMARY_CONCURRENCY at a time) while later
+    pages are still being fetched. A diff that fits one chunk takes a single call.
+    """
+    limit = max(settings.pr_summary_chunk_tokens, 1)
+    title = pr.get("title") or ""
+    semaphore = asyncio.Semaphore(max(settings.pr_summary_concurrency, 1))
+    tasks: List[asyncio.Task] = []
+
+    async def _map(diff: str) -> str:
+        async with semaphore:
+            return await _generate(_MAP_PROMPT.format(number=pr_number, title=title, diff=diff), "pr_summary_map")
+
+    async def _whole(diff: str) -> str:
+        prompt = _WHOLE_PROMPT.format(number=pr_number, title=title, body=pr.get("body") or "(none)", diff=diff)
+        return await _generate(prompt, "pr_summary")
+
+    chunk: List[str] = []
+    used = 0
+    files = 0
+    try:
+        async with aclosing(github_service.iter_pull_request_files(owner, repo, pr_number)) as stream:
+            async for file in stream:
+                files += 1
+                for section in _file_sections(file, limit):
+                    tokens = estimate_tokens(section)
+                    if chunk and used + tokens > limit:
+                        tasks.append(asyncio.create_task(_map("\n".join(chunk))))
+                        chunk, used = [], 0
+                    chunk.append(section)
+                    used += tokens
+                if files >= settings.github_pr_max_files:
+                    break
+        if chunk:
+            # With nothing split off yet, the whole diff fits one prompt and needs no reduce step
+            tasks.append(asyncio.create_task((_map if tasks else _whole)("\n".join(chunk))))
+        summaries = list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    if not summaries:
+        summary = "This pull request has no file changes."
+    elif len(summaries) == 1:
+        summary = summaries[0]
+    else:
+        summary = await _reduce(summaries, pr_number, title, pr.get("body") or "")
+    return PullRequestSummary(
+        pr_number=pr_number, head_sha=pr["head"]["sha"], title=title, summary=summary, files=files, chunks=len(summaries)
+    )
+
+
+def forget_pull_request(owner: str, repo: str, pr_number: int, keep_sha: Optional[str] = None) -> int:
+    """(Internal) Drops cached summaries of a PR other than the one for `keep_sha`; returns how many. Not a tool for the AI."""
+    prefix = (owner.lower(), repo.lower(), pr_number)
+    stale = [key for key in _summaries.items() if key[:3] == prefix and key[3] != keep_sha]
+    for key in stale:
+        _summaries.invalidate(key)
+    return len(stale)
+
+
+@tool(name="github_summarize_pr")
+async def summarize_pull_request(owner: str, repo: str, pr_number: int) -> PullRequestSummary:
+    """Summarizes a pull request of any size from its diff.
+
+    Large diffs are split into token-bounded chunks that are summarized concurrently and
+    then combined. Summaries are cached per head commit, so asking again about an
+    unchanged PR costs one GitHub request and no model calls.
+    """
+    pr = await github_service.get_pull_request(owner, repo, pr_number)
+    key = (owner.lower(), repo.lower(), pr_number, pr["head"]["sha"])
+    return await _summaries.get_or_load(key, lambda: _summarize(owner, repo, pr_number, pr))
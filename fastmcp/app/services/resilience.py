@@ -0,0 +1,285 @@
+import asyncio
+import email.utils
+import logging
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+import httpx
+
+from ..config.settings import settings
+from . import metrics_service
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+# Errors raised before the request reached the server; retrying these is safe for any method
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling an upstream whose circuit is open.
+
+    Subclasses httpx.RequestError so the services' existing handlers turn it into a 502.
+    """
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        return cls(
+            max_attempts=max(settings.http_retry_attempts, 1),
+            backoff_base=settings.http_retry_backoff_base,
+            backoff_max=settings.http_retry_backoff_max,
+        )
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff; an upstream Retry-After wins when it fits under the cap."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(parsed.timestamp() - time.time(), 0.0) if parsed else None
+
+
+class CircuitBreaker:
+    """Per-host breaker: opens after `failure_threshold` consecutive failures, then lets a
+    single probe through every `reset_timeout` seconds until one succeeds."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, host: str, failure_threshold: int, reset_timeout: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probe_in_flight = False
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def release_probe(self) -> None:
+        """Frees the probe slot of a call that ended without a verdict (cancelled, or failed outside the transport)."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                self._set_state(self.OPEN)
+
+    def _set_state(self, state: str) -> None:
+        logger.warning("Circuit for %s is now %s", self.host, state)
+        self.state = state
+        metrics_service.set_circuit_state(self.host, state)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Returns the process-wide breaker for a host, creating it from settings on first use."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(
+            host, settings.circuit_failure_threshold, settings.circuit_reset_timeout
+        )
+    return breaker
+
+
+def reset_breakers() -> None:
+    """(Internal) Forgets all breaker and hedging state; used by tests."""
+    _breakers.clear()
+    _trackers.clear()
+    _budgets.clear()
+
+
+class LatencyTracker:
+    """Rolling window of recent response times for one hedged call."""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+class HedgeBudget:
+    """Token bucket limiting hedges to roughly `ratio` of requests, so slow upstreams
+    are not hit with double the load."""
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+
+    def on_request(self) -> None:
+        self.tokens = min(self.tokens + self.ratio, self.burst)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_budgets: Dict[str, HedgeBudget] = {}
+
+# Hedge only once this many samples exist, so the threshold reflects real latency
+MIN_HEDGE_SAMPLES = 20
+
+
+class HedgedTransport(httpx.AsyncBaseTransport):
+    """Sends a duplicate GET when the first has not answered within the call's recent
+    `http_hedge_percentile` latency, and returns whichever response arrives first."""
+
+    def __init__(self, upstream: str, call: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.upstream = upstream
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.tracker = _trackers.setdefault(call, LatencyTracker())
+        self.budget = _budgets.setdefault(upstream, HedgeBudget(settings.http_hedge_budget))
+
+    def _hedge_delay(self) -> Optional[float]:
+        if len(self.tracker.samples) < MIN_HEDGE_SAMPLES:
+            return None
+        threshold = self.tracker.percentile(settings.http_hedge_percentile)
+        return max(threshold, settings.http_hedge_min_delay_ms / 1000)
+
+    async def _timed(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        self.tracker.record(time.perf_counter() - start)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.budget.on_request()
+        delay = self._hedge_delay()
+        if request.method != "GET" or delay is None:
+            return await self._timed(request)
+
+        primary = asyncio.create_task(self._timed(request))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.budget.try_spend():
+            return await primary
+
+        hedge = asyncio.create_task(self._timed(request))
+        tasks = (primary, hedge)
+        winner = None
+        try:
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in tasks if t in done and t.exception() is None), None)
+        finally:
+            for task in tasks:
+                if task is not winner:
+                    task.cancel()
+        for task in tasks:
+            # A loser that completed in the same tick still holds a connection
+            if task is not winner and task.done() and not task.cancelled() and task.exception() is None:
+                await task.result().aclose()
+        if winner is None:
+            raise primary.exception()
+        metrics_service.observe_hedge(self.upstream, "won" if winner is hedge else "lost")
+        return winner.result()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """httpx transport adding retries with jittered backoff and a per-host circuit breaker.
+
+    Idempotent methods are retried on transport errors and 429/502/503/504; other methods
+    are only retried when the request provably never reached the server. Read-only POSTs
+    (GraphQL queries) opt in with `extensions={"idempotent": True}`.
+    """
+
+    def __init__(self, upstream: str, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 policy: Optional[RetryPolicy] = None):
+        self.upstream = upstream
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.policy = policy or RetryPolicy.from_settings()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = get_breaker(request.url.host)
+        idempotent = request.method in IDEMPOTENT_METHODS or bool(request.extensions.get("idempotent"))
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                metrics_service.observe_circuit_rejection(self.upstream)
+                raise CircuitOpenError(f"Circuit open for {request.url.host}", request=request)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                retryable = idempotent or isinstance(e, _NOT_SENT_ERRORS)
+                if not retryable or attempt + 1 >= self.policy.max_attempts:
+                    raise
+                reason, delay = type(e).__name__, self.policy.backoff(attempt)
+            except BaseException:
+                # Otherwise a cancelled half-open probe would hold the slot, and the host stay rejected, for good
+                breaker.release_probe()
+                raise
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if (not idempotent or response.status_code not in RETRYABLE_STATUSES
+                        or attempt + 1 >= self.policy.max_attempts):
+                    return response
+                reason = str(response.status_code)
+                delay = self.policy.backoff(attempt, _retry_after(response))
+                await response.aclose()
+
+            metrics_service.observe_retry(self.upstream, reason)
+            logger.debug("Retrying %s %s after %s (attempt %d, sleeping %.2fs)",
+                         request.method, request.url, reason, attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
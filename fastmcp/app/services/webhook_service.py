@@ -0,0 +1,82 @@
+import hashlib
+import hmac
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from . import github_service, jira_service, metrics_service, pr_summary_service
+
+# GitHub issue actions after which the issue is gone from the repository
+_GITHUB_ISSUE_REMOVED = {"deleted", "transferred"}
+# Pull request actions that can move the head commit or retire the PR
+_GITHUB_PR_ACTIONS = {"synchronize", "closed", "reopened", "edited"}
+
+
+def verify_signature(source: str, secret: Optional[str], body: bytes, signature: Optional[str]) -> None:
+    """Checks a `sha256=<hex>` HMAC signature of the raw request body.
+
+    Raises 404 while no secret is configured (the receiver is off) and 401 when the
+    signature is missing or does not match.
+    """
+    if not secret:
+        raise HTTPException(status_code=404, detail=f"{source} webhooks are not configured")
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    if not signature or not hmac.compare_digest(expected, signature.strip()):
+        metrics_service.observe_webhook_event(source, "unverified", "rejected")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+
+def _result(source: str, event: str, applied: bool, **details: Any) -> Dict[str, Any]:
+    result = "applied" if applied else "ignored"
+    metrics_service.observe_webhook_event(source, event, result)
+    return {"event": event, "result": result, **details}
+
+
+def apply_github_event(event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Applies one GitHub delivery (X-GitHub-Event `event`) to the local caches.
+
+    `issues` events upsert or remove the issue in the issue index; `pull_request` events
+    that can change the head commit drop the PR's outdated cached summaries. Other events
+    (ping, push, ...) are acknowledged and ignored: nothing cached depends on them.
+    """
+    repository = payload.get("repository") or {}
+    owner = (repository.get("owner") or {}).get("login")
+    repo = repository.get("name")
+    action = payload.get("action")
+    if not (owner and repo):
+        return _result("github", event, False)
+
+    if event == "issues" and payload.get("issue"):
+        issue = payload["issue"]
+        if "pull_request" in issue:
+            return _result("github", event, False)
+        github_service.apply_issue_event(owner, repo, issue, deleted=action in _GITHUB_ISSUE_REMOVED)
+        return _result("github", event, True, key=f"{owner}/{repo}#{issue['number']}")
+
+    if event == "pull_request" and action in _GITHUB_PR_ACTIONS and payload.get("pull_request"):
+        pull = payload["pull_request"]
+        keep = (pull.get("head") or {}).get("sha") if pull.get("state") == "open" else None
+        dropped = pr_summary_service.forget_pull_request(owner, repo, pull["number"], keep_sha=keep)
+        return _result("github", event, True, key=f"{owner}/{repo}#{pull['number']}", dropped=dropped)
+
+    return _result("github", event, False)
+
+
+def apply_jira_event(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Applies one Jira webhook delivery to the local caches.
+
+    Issue created/updated/deleted events update the incremental sync store and the issue
+    index in place; sprint events drop the cached sprint list of the sprint's board.
+    """
+    event = payload.get("webhookEvent") or "unknown"
+
+    if event in ("jira:issue_created", "jira:issue_updated", "jira:issue_deleted") and payload.get("issue"):
+        key = jira_service.apply_issue_event(payload["issue"], deleted=event == "jira:issue_deleted")
+        return _result("jira", event, key is not None, key=key)
+
+    if event.startswith("sprint_"):
+        board_id = (payload.get("sprint") or {}).get("originBoardId")
+        jira_service.invalidate_sprints(board_id if isinstance(board_id, int) else None)
+        return _result("jira", event, True, board_id=board_id)
+
+    return _result("jira", event, False)
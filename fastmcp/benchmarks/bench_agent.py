@@ -0,0 +1,124 @@
+"""
+End-to-end /adk/agent benchmarks: the FastAPI app is driven in-process through
+httpx's ASGI transport, tools hit the stand-in upstreams over loopback HTTP and
+the planner is the scripted Gemini stand-in.
+"""
+import asyncio
+import gc
+import itertools
+import tracemalloc
+
+import httpx
+import pytest
+
+from .fake_gemini import AGENT_PLANS
+from .harness import load_config, measure, run_sessions
+
+PROMPTS = list(AGENT_PLANS)
+
+
+def _client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+
+async def _post(client: httpx.AsyncClient, prompt: str, session_id: str) -> dict:
+    response = await client.post("/adk/agent", json={"prompt": prompt, "session_id": session_id})
+    response.raise_for_status()
+    body = response.json()
+    if "error" in body:
+        raise RuntimeError(body["error"])
+    return body
+
+
+def test_agent_turn_latency(agent_app, fresh_context, results, bench_config):
+    """Sequential single-session latency, cycling through the scripted prompts."""
+    prompts = itertools.cycle(PROMPTS)
+
+    async def _run():
+        async with _client(agent_app) as client:
+            return await measure(lambda: _post(client, next(prompts), "bench-seq"), bench_config["iterations"])
+
+    summary = asyncio.run(_run())
+    results.add("agent.turn", summary.to_dict())
+    assert summary.errors == 0
+
+
+@pytest.mark.parametrize("sessions", [pytest.param(n, id=f"{n}-sessions") for n in load_config()["concurrency"]])
+def test_agent_concurrent_sessions(sessions, agent_app, fresh_context, results, bench_config):
+    """Throughput and tail latency with N sessions issuing turns concurrently."""
+
+    async def _run():
+        async with _client(agent_app) as client:
+            return await run_sessions(
+                lambda s, i: _post(client, PROMPTS[(s + i) % len(PROMPTS)], f"bench-{s}"),
+                sessions,
+                bench_config["turns_per_session"],
+            )
+
+    summary = asyncio.run(_run())
+    results.add(f"agent.concurrent.{sessions}", summary.to_dict())
+    assert summary.errors == 0
+
+
+def test_agent_prompt_tokens(agent_app, fresh_context, results, bench_config):
+    """Gemini input tokens per turn, and the share served from the context cache."""
+    from app.services import metrics_service
+
+    def _tokens(kind: str) -> float:
+        return sum(
+            sample.value
+            for metric in metrics_service.GEMINI_TOKENS.collect()
+            for sample in metric.samples
+            if sample.name.endswith("_total") and sample.labels["kind"] == kind
+        )
+
+    turns = bench_config["iterations"]
+    before = {kind: _tokens(kind) for kind in ("prompt", "cached")}
+
+    async def _run():
+        async with _client(agent_app) as client:
+            for i in range(turns):
+                await _post(client, PROMPTS[i % len(PROMPTS)], "bench-tokens")
+
+    asyncio.run(_run())
+    prompt, cached = (_tokens(kind) - before[kind] for kind in ("prompt", "cached"))
+    results.add("agent.tokens", {
+        "turns": turns,
+        "prompt_tokens_per_turn": prompt / turns,
+        "cached_tokens_per_turn": cached / turns,
+        "uncached_tokens_per_turn": (prompt - cached) / turns,
+    })
+
+
+def test_agent_memory_growth(agent_app, fresh_context, results, bench_config):
+    """Python heap and context-file growth over thousands of turns in one session."""
+    turns = bench_config["memory_turns"]
+    checkpoints = {}
+
+    async def _run():
+        async with _client(agent_app) as client:
+            for i in range(turns):
+                await _post(client, PROMPTS[i % len(PROMPTS)], "bench-memory")
+                if (i + 1) % max(turns // 10, 1) == 0:
+                    gc.collect()
+                    checkpoints[i + 1] = tracemalloc.get_traced_memory()[0]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        asyncio.run(_run())
+        gc.collect()
+        final, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    growth = final - baseline
+    results.add("agent.memory", {
+        "turns": turns,
+        "heap_growth_kb": growth / 1024,
+        "heap_growth_per_1k_turns_kb": growth / 1024 / turns * 1000,
+        "peak_kb": peak / 1024,
+        "context_file_kb": fresh_context.context_file.stat().st_size / 1024,
+        "checkpoints_kb": {turn: (size - baseline) / 1024 for turn, size in checkpoints.items()},
+    })
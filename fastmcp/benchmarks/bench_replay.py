@@ -0,0 +1,30 @@
+"""
+Replays a recorded CLI session file (BENCH_REPLAY_FILE) against the in-process app,
+at each configured concurrency, and records throughput, tail latency, error rate
+and the per-tool breakdown.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from .harness import load_config
+from .replay import load_recording, replay
+
+
+@pytest.mark.parametrize("concurrency", [pytest.param(n, id=f"{n}-concurrent") for n in load_config()["concurrency"]])
+def test_replay_recorded_sessions(concurrency, agent_app, fresh_context, results, bench_config):
+    sessions = load_recording(bench_config["replay_file"])
+
+    async def _run():
+        transport = httpx.ASGITransport(app=agent_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await replay(
+                client, sessions, concurrency=concurrency,
+                rate=bench_config["replay_rate"], repeat=bench_config["replay_repeat"], seed=0,
+            )
+
+    report = asyncio.run(_run())
+    for name, metrics in report.to_results().items():
+        results.add(f"{name}.c{concurrency}", metrics)
+    assert report.turns.errors == 0, dict(report.errors)
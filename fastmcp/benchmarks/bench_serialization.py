@@ -0,0 +1,78 @@
+"""
+Serialization cost of large (BENCH_SERIALIZATION_ITEMS) API responses: the previous
+jsonable_encoder + JSONResponse path, a response_model route rendered by ORJSONResponse,
+and json_response, which sends service-built models without re-validating them.
+"""
+import asyncio
+import json
+from typing import Any, List
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.github_models import GithubRepo
+from app.models.jira_models import JiraIssueBasic
+from app.responses import ORJSONResponse, json_response
+
+from .harness import measure
+
+
+def _repos(count: int) -> List[GithubRepo]:
+    return [
+        GithubRepo(name=f"repo-{n}", full_name=f"bench/repo-{n}", private=bool(n % 2),
+                   html_url=f"https://github.com/bench/repo-{n}", description=f"Benchmark repository {n}")
+        for n in range(count)
+    ]
+
+
+def _issues(count: int) -> List[JiraIssueBasic]:
+    return [
+        JiraIssueBasic(key=f"BENCH-{n}", summary=f"Issue {n} of BENCH", status="In Progress", assignee="Alice Smith",
+                       priority="High", due_date="2025-10-01", reporter="Admin User",
+                       created="2025-09-01T09:00:00.000+0000", updated="2025-09-01T12:30:00.000+0000")
+        for n in range(count)
+    ]
+
+
+# payload name -> (builder, response_model annotation)
+PAYLOADS = {
+    "github_repos": (_repos, List[GithubRepo]),
+    "jira_issues": (_issues, List[JiraIssueBasic]),
+    # Shape of an /adk/agent reply carrying a tool result
+    "agent_reply": (lambda count: {"result": _issues(count), "toolCalls": [{"name": "jira_get_issues_for_project"}]}, Any),
+}
+
+
+def _stdlib(content, adapter):
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def _response_model(content, adapter):
+    # What FastAPI does for a route that returns models under a response_model
+    return ORJSONResponse(adapter.dump_python(adapter.validate_python(content), mode="json")).body
+
+
+def _direct(content, adapter):
+    return json_response(content).body
+
+
+STRATEGIES = {"jsonable_encoder": _stdlib, "response_model": _response_model, "json_response": _direct}
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+@pytest.mark.parametrize("payload", sorted(PAYLOADS))
+def test_serialization_latency(payload, strategy, results, bench_config):
+    build, annotation = PAYLOADS[payload]
+    content, adapter = build(bench_config["serialization_items"]), TypeAdapter(annotation)
+    render = STRATEGIES[strategy]
+
+    async def _call():
+        return render(content, adapter)
+
+    summary = asyncio.run(measure(_call, bench_config["iterations"]))
+
+    results.add(f"serialization.{payload}.{strategy}", summary.to_dict())
+    assert summary.errors == 0
+    assert json.loads(render(content, adapter)) == json.loads(_stdlib(content, adapter))
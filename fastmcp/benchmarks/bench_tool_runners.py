@@ -0,0 +1,67 @@
+"""
+Per-tool latency of every ALL_TOOL_RUNNERS entry against the stand-in upstreams.
+"""
+import asyncio
+
+import pytest
+
+from app.adk_tools import ALL_TOOL_RUNNERS
+
+from .harness import measure
+
+# Representative arguments for each runner; keep in sync when tools are added
+TOOL_ARGS = {
+    "jira_fetch_issue": {"ticket_id": "BENCH-1"},
+    "jira_fetch_issues": {"ticket_ids": [f"BENCH-{n}" for n in range(1, 21)]},
+    "jira_get_projects": {},
+    "jira_get_issues_for_project": {"project_key": "BENCH"},
+    "jira_create_issue": {"project_key": "BENCH", "summary": "Bench issue", "description": "Created by benchmark"},
+    "jira_assign_issue": {"ticket_id": "BENCH-2", "assignee": "Alice"},
+    "jira_get_possible_transitions": {"ticket_id": "BENCH-3"},
+    "jira_transition_issue": {"ticket_id": "BENCH-3", "transition_id": "31"},
+    "jira_summarize_and_email_issue": {"issue_key": "BENCH-4", "to_email": "team@example.com"},
+    "jira_comment_issue": {"issue_key": "BENCH-5", "comment_text": "Benchmark comment"},
+    "jira_get_issue_comments": {"issue_key": "BENCH-5"},
+    "jira_get_sprints": {"project_key": "BENCH"},
+    "jira_move_issue_to_sprint": {"ticket_id": "BENCH-6", "sprint_id": 103},
+    "jira_bulk_assign_issues": {"ticket_ids": "BENCH-10..BENCH-29", "assignee": "Bob Jones"},
+    "jira_bulk_transition_issues": {"ticket_ids": "BENCH-10..BENCH-29", "transition": "Done"},
+    "jira_bulk_move_issues_to_sprint": {"ticket_ids": "BENCH-10..BENCH-29", "sprint_id": 103},
+    "issues_search": {"project": "BENCH", "status": "In Progress", "query": "issue"},
+    "github_get_repos": {},
+    "github_get_branches": {"owner": "bench", "repo": "repo-1"},
+    "github_create_branch": {"owner": "bench", "repo": "repo-1", "branch_name": "bench/new", "source_branch": "main"},
+    "github_create_pull_request": {"owner": "bench", "repo": "repo-1", "title": "Bench PR", "head": "feature-1", "base": "main", "body": "Benchmark"},
+    "github_merge_pull_request": {"owner": "bench", "repo": "repo-1", "pr_number": 2},
+    "github_close_pull_request": {"owner": "bench", "repo": "repo-1", "pr_number": 3},
+    "github_get_issues": {"owner": "bench", "repo": "repo-1"},
+    "github_get_pull_requests": {"owner": "bench", "repo": "repo-1", "state": "open"},
+    "github_get_repos_overview": {"repos": [f"bench/repo-{i}" for i in range(20)], "include": ["branches", "pull_requests"]},
+    "github_get_pr_files": {"owner": "bench", "repo": "repo-1", "pr_number": 4},
+    "github_get_pr_file_patch": {"owner": "bench", "repo": "repo-1", "pr_number": 4, "filename": "src/module_3.py"},
+    "github_summarize_pr": {"owner": "bench", "repo": "repo-1", "pr_number": 4},
+    "github_create_issue": {"owner": "bench", "repo": "repo-1", "title": "Bench issue", "body": "Benchmark"},
+    "github_comment_issue": {"owner": "bench", "repo": "repo-1", "issue_number": 1, "comment_body": "Benchmark"},
+    "email_send": {"to": "team@example.com", "subject": "Bench", "body": "Benchmark"},
+    "email_confirm_and_send": {"to": "team@example.com", "subject": "Bench", "body": "Benchmark", "action_type": "PR created"},
+    "regenerate_email_summary": {"initial_summary": "Summary", "user_feedback": "More detail", "pr_details": {"number": 1, "title": "Bench PR"}},
+    "finalize_email_summary": {"final_summary": "Summary", "to_email": "team@example.com", "pr_details": {"pr_number": 1, "repository": "bench/repo-1"}},
+}
+
+
+def test_every_runner_has_sample_args():
+    missing = sorted(set(ALL_TOOL_RUNNERS) - set(TOOL_ARGS))
+    assert not missing, f"Add benchmark arguments for: {missing}"
+
+
+@pytest.mark.parametrize("tool_name", sorted(TOOL_ARGS))
+def test_tool_runner_latency(tool_name, upstreams, scripted_gemini, results, bench_config):
+    runner = ALL_TOOL_RUNNERS.get(tool_name)
+    if runner is None:
+        pytest.skip(f"{tool_name} is not registered")
+    args = TOOL_ARGS[tool_name]
+
+    summary = asyncio.run(measure(lambda: runner(**args), bench_config["iterations"]))
+
+    results.add(f"tool.{tool_name}", summary.to_dict())
+    assert summary.errors == 0
@@ -0,0 +1,65 @@
+"""
+Compare two benchmark result files:
+
+    python -m benchmarks.compare benchmarks/results/BASE.json benchmarks/results/latest.json
+
+Exits with status 1 when any latency metric regresses (or throughput drops) by more
+than --threshold (default 10%).
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+# Metric -> True when higher is better
+TRACKED = {
+    "p50_ms": False,
+    "p99_ms": False,
+    "throughput_rps": True,
+    "error_rate": False,
+    "heap_growth_per_1k_turns_kb": False,
+}
+
+
+def compare(base: Dict, new: Dict, threshold: float) -> Tuple[List[str], List[str]]:
+    lines, regressions = [], []
+    for name in sorted(set(base["results"]) & set(new["results"])):
+        for metric, higher_is_better in TRACKED.items():
+            old_value = base["results"][name].get(metric)
+            new_value = new["results"][name].get(metric)
+            if not isinstance(old_value, (int, float)) or not isinstance(new_value, (int, float)) or old_value == 0:
+                continue
+            change = (new_value - old_value) / old_value
+            worse = -change if higher_is_better else change
+            marker = "REGRESSION" if worse > threshold else ("improved" if worse < -threshold else "")
+            line = f"{name:45s} {metric:28s} {old_value:12.2f} -> {new_value:12.2f} ({change:+.1%}) {marker}"
+            lines.append(line)
+            if marker == "REGRESSION":
+                regressions.append(line)
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    lines, regressions = compare(base, new, args.threshold)
+    print(f"base: {base.get('git_revision')} ({base.get('created_at')})")
+    print(f"new:  {new.get('git_revision')} ({new.get('created_at')})")
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
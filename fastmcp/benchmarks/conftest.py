@@ -0,0 +1,119 @@
+"""
+Fixtures for the benchmark suite: stand-in upstream servers, a scripted Gemini model
+and a result store that is written to benchmarks/results/ at the end of the session.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+# Settings are read at import time; provide placeholders so the app imports without a .env
+for _name, _value in {
+    "GEMINI_API_KEY": "bench-key",
+    "GITHUB_TOKEN": "bench-token",
+    "JIRA_BASE_URL": "http://127.0.0.1:1",
+    "JIRA_EMAIL": "bench@example.com",
+    "JIRA_API_TOKEN": "bench-token",
+    "LOG_LEVEL": "WARNING",
+}.items():
+    os.environ.setdefault(_name, _value)
+os.environ["GITHUB_MOCK"] = "false"
+os.environ["JIRA_MOCK"] = "false"
+
+from mock_servers import (  # noqa: E402
+    Behavior,
+    GeminiScript,
+    ServerThread,
+    create_gemini_app,
+    create_github_app,
+    create_jira_app,
+)
+
+from .fake_gemini import AGENT_PLANS, ScriptedGeminiModel  # noqa: E402
+from .harness import ResultStore, load_config  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def bench_config():
+    return load_config()
+
+
+@pytest.fixture(scope="session")
+def results(bench_config):
+    directory = Path(os.environ.get("BENCH_RESULTS_DIR", Path(__file__).parent / "results"))
+    store = ResultStore(directory, bench_config)
+    yield store
+    path = store.save()
+    if path:
+        print(f"\n[bench] results written to {path}")
+
+
+@pytest.fixture(scope="session")
+def upstreams(bench_config):
+    """Starts the GitHub and Jira stand-ins and points the app settings at them."""
+    from app.config.settings import settings
+
+    behavior = Behavior(latency_ms=bench_config["upstream_latency_ms"])
+    github = ServerThread(create_github_app(behavior)).start()
+    jira = ServerThread(create_jira_app(behavior)).start()
+    previous = (settings.github_api_url, settings.jira_base_url, settings.github_mock, settings.jira_mock)
+    settings.github_api_url = github.url
+    settings.jira_base_url = jira.url
+    settings.github_mock = False
+    settings.jira_mock = False
+    yield {"github": github, "jira": jira}
+    settings.github_api_url, settings.jira_base_url, settings.github_mock, settings.jira_mock = previous
+    github.stop()
+    jira.stop()
+
+
+@pytest.fixture
+def scripted_gemini(monkeypatch, bench_config):
+    """Points plain `genai.GenerativeModel` calls made by tools (e.g. PR summaries) at the scripted model."""
+    import google.generativeai as genai
+
+    monkeypatch.setattr(genai, "GenerativeModel", lambda *args, **kwargs: ScriptedGeminiModel(latency_ms=bench_config["gemini_latency_ms"]))
+
+
+@pytest.fixture(scope="session")
+def isolated_context(tmp_path_factory):
+    """Keeps benchmark turns from touching the real context.json."""
+    from app.services.context_service import context_service
+
+    original = context_service.context_file
+    context_service.context_file = tmp_path_factory.mktemp("context") / "context.json"
+    yield context_service
+    context_service.context_file = original
+
+
+@pytest.fixture
+def fresh_context(isolated_context):
+    isolated_context.clear_context()
+    return isolated_context
+
+
+@pytest.fixture(scope="session")
+def agent_app(upstreams, isolated_context, bench_config):
+    """The FastAPI app with the orchestrator wired to a Gemini stand-in (see BENCH_GEMINI)."""
+    from app import main
+    from app.config.settings import settings
+    from app.orchestration.coordinator import create_orchestrator_agent
+
+    if not hasattr(main, "agent"):
+        pytest.skip(f"Orchestrator unavailable: {getattr(main, 'adk_error_detail', 'unknown error')}")
+    original = main.agent.model, main.agent.prefix
+    server = None
+    if bench_config["gemini"] == "http":
+        behavior = Behavior(latency_ms=bench_config["gemini_latency_ms"])
+        server = ServerThread(create_gemini_app(behavior, GeminiScript(AGENT_PLANS, rules=[]))).start()
+        settings.gemini_api_endpoint = server.url
+        # A fresh agent talks to the stand-in, including its context cache
+        fresh = create_orchestrator_agent()
+        main.agent.model, main.agent.prefix = fresh.model, fresh.prefix
+    else:
+        main.agent.model = ScriptedGeminiModel(latency_ms=bench_config["gemini_latency_ms"])
+    yield main.app
+    main.agent.model, main.agent.prefix = original
+    if server is not None:
+        settings.gemini_api_endpoint = None
+        server.stop()
@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, Tuple
+
+from mock_servers import GeminiScript
+
+# Benchmark prompt -> (tool name, args) the stand-in model "plans" for it
+AGENT_PLANS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "list my repos": ("github_get_repos", {}),
+    "show branches for bench/repo-1": ("github_get_branches", {"owner": "bench", "repo": "repo-1"}),
+    "show open PRs in bench/repo-2": ("github_get_pull_requests", {"owner": "bench", "repo": "repo-2", "state": "open"}),
+    "what files changed in PR 3 of bench/repo-2": ("github_get_pr_files", {"owner": "bench", "repo": "repo-2", "pr_number": 3}),
+    "list issues in bench/repo-3": ("github_get_issues", {"owner": "bench", "repo": "repo-3"}),
+    "get jira issue BENCH-7": ("jira_fetch_issue", {"ticket_id": "BENCH-7"}),
+    "list issues in BENCH": ("jira_get_issues_for_project", {"project_key": "BENCH"}),
+    "show sprints for BENCH": ("jira_get_sprints", {"project_key": "BENCH"}),
+    "show comments for BENCH-4": ("jira_get_issue_comments", {"issue_key": "BENCH-4"}),
+    "list jira projects": ("jira_get_projects", {}),
+}
+
+
+class _Response:
+    """Mimics the parts of a google.generativeai GenerateContentResponse the coordinator reads."""
+
+    def __init__(self, parts, prompt_tokens: int, output_tokens: int):
+        self.candidates = [SimpleNamespace(content=SimpleNamespace(parts=parts))]
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+
+    @property
+    def text(self) -> str:
+        texts = [p.text for p in self.candidates[0].content.parts if p.text]
+        if not texts:
+            raise ValueError("Response contains a function_call, not text")
+        return "".join(texts)
+
+
+def _function_call_response(name: str, args: Dict[str, Any], prompt_tokens: int) -> _Response:
+    part = SimpleNamespace(function_call=SimpleNamespace(name=name, args=dict(args)), text=None)
+    return _Response([part], prompt_tokens, 12)
+
+
+def _text_response(text: str, prompt_tokens: int) -> _Response:
+    return _Response([SimpleNamespace(function_call=None, text=text)], prompt_tokens, len(text) // 4 + 1)
+
+
+class ScriptedGeminiModel:
+    """In-process stand-in for `genai.GenerativeModel` with configurable latency.
+
+    Prompts found in `plans` produce a function call; everything else (result summaries,
+    tool follow-ups) produces a short text answer.
+    """
+
+    def __init__(self, plans: Dict[str, Tuple[str, Dict[str, Any]]] = None, latency_ms: float = 0.0):
+        self.script = GeminiScript(AGENT_PLANS if plans is None else plans, rules=[])
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    async def generate_content_async(self, contents, **kwargs):
+        self.calls += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        text = contents if isinstance(contents, str) else str(contents)
+        prompt_tokens = len(text) // 4 + 1
+        plan = self.script.plan(text.rsplit("User request: ", 1)[-1])
+        if plan:
+            name, args = plan
+            return _function_call_response(name, args, prompt_tokens)
+        return _text_response("Done.", prompt_tokens)
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def env_int_list(name: str, default: str) -> List[int]:
+    return [int(v) for v in os.environ.get(name, default).split(",") if v.strip()]
+
+
+def load_config() -> Dict[str, Any]:
+    """Benchmark knobs, overridable through BENCH_* environment variables."""
+    return {
+        "upstream_latency_ms": env_float("BENCH_UPSTREAM_LATENCY_MS", 20.0),
+        "gemini_latency_ms": env_float("BENCH_GEMINI_LATENCY_MS", 50.0),
+        # "inprocess" uses ScriptedGeminiModel; "http" drives the real SDK against the Gemini stand-in
+        "gemini": os.environ.get("BENCH_GEMINI", "inprocess"),
+        "iterations": env_int("BENCH_ITERATIONS", 30),
+        "concurrency": env_int_list("BENCH_CONCURRENCY", "1,8,32"),
+        "turns_per_session": env_int("BENCH_TURNS_PER_SESSION", 5),
+        "memory_turns": env_int("BENCH_MEMORY_TURNS", 1000),
+        "replay_file": os.environ.get(
+            "BENCH_REPLAY_FILE", str(Path(__file__).parent / "recordings" / "sample_sessions.jsonl")
+        ),
+        "replay_rate": env_float("BENCH_REPLAY_RATE", 0.0),
+        "replay_repeat": env_int("BENCH_REPLAY_REPEAT", 5),
+        "serialization_items": env_int("BENCH_SERIALIZATION_ITEMS", 10000),
+    }
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile; `pct` is in [0, 100]."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class LatencySummary:
+    samples: List[float] = field(default_factory=list)
+    wall_time: float = 0.0
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        count = len(self.samples)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "mean_ms": (sum(self.samples) / count * 1000) if count else 0.0,
+            "p50_ms": percentile(self.samples, 50) * 1000,
+            "p90_ms": percentile(self.samples, 90) * 1000,
+            "p99_ms": percentile(self.samples, 99) * 1000,
+            "max_ms": max(self.samples) * 1000 if count else 0.0,
+            "throughput_rps": count / self.wall_time if self.wall_time else 0.0,
+        }
+
+
+async def measure(call: Callable[[], Awaitable[Any]], iterations: int, warmup: int = 2) -> LatencySummary:
+    """Runs `call` sequentially and collects per-call latency."""
+    for _ in range(warmup):
+        await call()
+    summary = LatencySummary()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        try:
+            await call()
+        except Exception:
+            summary.errors += 1
+        summary.samples.append(time.perf_counter() - t0)
+    summary.wall_time = time.perf_counter() - start
+    return summary
+
+
+async def run_sessions(turn: Callable[[int, int], Awaitable[Any]], sessions: int, turns: int) -> LatencySummary:
+    """Runs `sessions` concurrent sessions, each issuing `turns` sequential calls of turn(session, i)."""
+    summary = LatencySummary()
+
+    async def _session(session: int) -> None:
+        for i in range(turns):
+            t0 = time.perf_counter()
+            try:
+                await turn(session, i)
+            except Exception:
+                summary.errors += 1
+            summary.samples.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_session(s) for s in range(sessions)))
+    summary.wall_time = time.perf_counter() - start
+    return summary
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+class ResultStore:
+    """Collects benchmark results and writes them as JSON for later comparison.
+
+    Each run is written to `<dir>/<timestamp>.json` and copied to `<dir>/latest.json`;
+    compare two files with `python -m benchmarks.compare BASE NEW`.
+    """
+
+    def __init__(self, directory: Path, config: Dict[str, Any]):
+        self.directory = Path(directory)
+        self.config = config
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, name: str, metrics: Dict[str, Any]) -> None:
+        self.results[name] = metrics
+        printable = ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in metrics.items())
+        print(f"\n[bench] {name}: {printable}")
+
+    def save(self) -> Optional[Path]:
+        if not self.results:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "config": self.config,
+            "results": self.results,
+        }
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.directory / f"{stamp}.json"
+        text = json.dumps(payload, indent=2, sort_keys=True)
+        path.write_text(text)
+        (self.directory / "latest.json").write_text(text)
+        return path
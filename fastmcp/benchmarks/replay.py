@@ -0,0 +1,203 @@
+"""
+Replay recorded /adk/agent traffic against a running server:
+
+    python -m benchmarks.replay benchmarks/recordings/sample_sessions.jsonl \\
+        --url http://127.0.0.1:8000 --concurrency 16 --rate 4 --repeat 5
+
+A recording is either JSON Lines with one turn per line
+(`{"session_id": "...", "prompt": "...", "timestamp": "..."}`, the request body the
+Ink CLI sends plus an optional ISO timestamp) or a `context.json` written by the
+backend, whose conversation_history is replayed as a single session.
+
+Sessions start as a Poisson process at --rate sessions/s (0 starts them all at once),
+at most --concurrency are active, and turns within a session run in order. The report
+is written in the ResultStore format, so two runs compare with `python -m benchmarks.compare`.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .harness import LatencySummary, ResultStore
+
+
+@dataclass
+class Turn:
+    session_id: str
+    prompt: str
+    timestamp: Optional[datetime] = None
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def load_recording(path: Path) -> Dict[str, List[Turn]]:
+    """Reads a recording and groups its turns by session, keeping their order."""
+    path = Path(path)
+    text = path.read_text()
+    sessions: Dict[str, List[Turn]] = defaultdict(list)
+    if path.suffix == ".json":
+        data = json.loads(text)
+        session_id = data.get("session_id") or path.stem
+        for entry in data.get("conversation_history", []):
+            if entry.get("user_input"):
+                sessions[session_id].append(Turn(session_id, entry["user_input"], _parse_timestamp(entry.get("timestamp"))))
+        return dict(sessions)
+
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not record.get("prompt"):
+            raise ValueError(f"{path}:{number}: missing 'prompt'")
+        session_id = record.get("session_id") or f"line-{number}"
+        sessions[session_id].append(Turn(session_id, record["prompt"], _parse_timestamp(record.get("timestamp"))))
+    return dict(sessions)
+
+
+@dataclass
+class ReplayReport:
+    """Turn latencies overall and per tool, plus error counts by kind."""
+
+    turns: LatencySummary = field(default_factory=LatencySummary)
+    tools: Dict[str, LatencySummary] = field(default_factory=lambda: defaultdict(LatencySummary))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    sessions: int = 0
+
+    def record(self, latency: float, tool_names: List[str], error: Optional[str]) -> None:
+        self.turns.samples.append(latency)
+        if error:
+            self.turns.errors += 1
+            self.errors[error] += 1
+        # A turn's latency is attributed to every tool it called
+        for name in tool_names or ["(no tool)"]:
+            self.tools[name].samples.append(latency)
+            if error:
+                self.tools[name].errors += 1
+
+    def to_results(self) -> Dict[str, Dict[str, Any]]:
+        overall = self.turns.to_dict()
+        overall.update(
+            sessions=self.sessions,
+            error_rate=self.turns.errors / len(self.turns.samples) if self.turns.samples else 0.0,
+            errors_by_kind=dict(self.errors),
+        )
+        results = {"replay": overall}
+        for name, summary in sorted(self.tools.items()):
+            summary.wall_time = self.turns.wall_time
+            metrics = summary.to_dict()
+            metrics["error_rate"] = summary.errors / len(summary.samples)
+            results[f"replay.tool.{name}"] = metrics
+        return results
+
+
+async def _send(client: httpx.AsyncClient, turn: Turn, session_id: str, headers: Dict[str, str]):
+    """Issues one turn; returns (tool names, error kind or None)."""
+    try:
+        response = await client.post("/adk/agent", json={"prompt": turn.prompt, "session_id": session_id}, headers=headers)
+    except httpx.HTTPError as e:
+        return [], type(e).__name__
+    if response.status_code >= 400:
+        return [], f"http_{response.status_code}"
+    try:
+        body = response.json()
+    except ValueError:
+        return [], "invalid_json"
+    tools = [call.get("name", "?") for call in body.get("toolCalls") or [] if isinstance(call, dict)]
+    return tools, "agent_error" if body.get("error") else None
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    sessions: Dict[str, List[Turn]],
+    concurrency: int = 8,
+    rate: float = 0.0,
+    repeat: int = 1,
+    think_scale: float = 0.0,
+    max_think_s: float = 5.0,
+    api_key: Optional[str] = None,
+    seed: Optional[int] = None,
+) -> ReplayReport:
+    """Replays every recorded session `repeat` times and returns the aggregated report.
+
+    Each repetition gets a distinct session id so the server sees independent users.
+    `think_scale` replays the recorded gaps between turns (1.0 = real time, 0 = back-to-back).
+    """
+    rng = random.Random(seed)
+    report = ReplayReport()
+    limit = asyncio.Semaphore(max(concurrency, 1))
+    headers = {"X-API-Key": api_key} if api_key else {}
+
+    async def _session(turns: List[Turn], session_id: str) -> None:
+        async with limit:
+            previous = None
+            for turn in turns:
+                if think_scale and previous and turn.timestamp and previous.timestamp:
+                    gap = (turn.timestamp - previous.timestamp).total_seconds()
+                    await asyncio.sleep(min(max(gap, 0.0) * think_scale, max_think_s))
+                previous = turn
+                start = time.perf_counter()
+                tools, error = await _send(client, turn, session_id, headers)
+                report.record(time.perf_counter() - start, tools, error)
+
+    work = [(turns, f"{session_id}#{n}") for n in range(repeat) for session_id, turns in sessions.items()]
+    report.sessions = len(work)
+    tasks = []
+    start = time.perf_counter()
+    for turns, session_id in work:
+        tasks.append(asyncio.create_task(_session(turns, session_id)))
+        if rate > 0:
+            await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+    report.turns.wall_time = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the backend")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum sessions in flight")
+    parser.add_argument("--rate", type=float, default=0.0, help="Session arrivals per second (0 = all at once)")
+    parser.add_argument("--repeat", type=int, default=1, help="Times each recorded session is replayed")
+    parser.add_argument("--think-scale", type=float, default=0.0, help="Scale of recorded gaps between turns")
+    parser.add_argument("--api-key", default=None, help="Sent as X-API-Key")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--results-dir", type=Path, default=Path(__file__).parent / "results")
+    args = parser.parse_args()
+
+    sessions = load_recording(args.recording)
+
+    async def _run() -> ReplayReport:
+        limits = httpx.Limits(max_connections=max(args.concurrency, 1))
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            return await replay(
+                client, sessions, args.concurrency, args.rate, args.repeat, args.think_scale,
+                api_key=args.api_key, seed=args.seed,
+            )
+
+    report = asyncio.run(_run())
+    store = ResultStore(args.results_dir, {
+        "recording": str(args.recording), "url": args.url, "concurrency": args.concurrency,
+        "rate": args.rate, "repeat": args.repeat, "think_scale": args.think_scale,
+    })
+    for name, metrics in report.to_results().items():
+        store.add(name, metrics)
+    print(f"\n[replay] results written to {store.save()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""
+Local stand-in HTTP servers for the GitHub, Jira and Gemini APIs.
+
+They speak just enough of each upstream API for every tool runner to work, including
+pagination and rate-limit headers, ETag/304 revalidation, latency/jitter and injected
+failures, so the real httpx I/O paths can be load-tested and profiled offline.
+"""
+from .behavior import Behavior, install_behavior
+from .gemini import GeminiScript, create_gemini_app
+from .github import create_github_app
+from .jira import create_jira_app
+from .runner import ServerThread
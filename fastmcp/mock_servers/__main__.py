@@ -0,0 +1,50 @@
+"""
+Run the stand-in servers from the command line:
+
+    python -m mock_servers --latency-ms 40 --jitter-ms 10 --failure-rate 0.01 --rate-limit 5000
+
+and paste the printed exports into the backend's environment. Per-server overrides
+can be given as MOCK_GITHUB_*, MOCK_JIRA_* and MOCK_GEMINI_* variables (see Behavior.from_env).
+"""
+import argparse
+import time
+
+from . import Behavior, ServerThread, create_gemini_app, create_github_app, create_jira_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local GitHub/Jira/Gemini stand-in servers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--github-port", type=int, default=9001)
+    parser.add_argument("--jira-port", type=int, default=9002)
+    parser.add_argument("--gemini-port", type=int, default=9003)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around the delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per minute before 429 (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    defaults = Behavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    github = ServerThread(create_github_app(Behavior.from_env("MOCK_GITHUB", defaults)), host=args.host, port=args.github_port).start()
+    jira = ServerThread(create_jira_app(Behavior.from_env("MOCK_JIRA", defaults)), host=args.host, port=args.jira_port).start()
+    gemini = ServerThread(create_gemini_app(Behavior.from_env("MOCK_GEMINI", defaults)), host=args.host, port=args.gemini_port).start()
+    print(f"export GITHUB_API_URL={github.url} GITHUB_MOCK=false")
+    print(f"export JIRA_BASE_URL={jira.url} JIRA_MOCK=false")
+    print(f"export GEMINI_API_ENDPOINT={gemini.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for server in (github, jira, gemini):
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class Behavior:
+    """How a stand-in server misbehaves: latency, jitter, injected failures and rate limiting."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    failure_status: int = 503
+    rate_limit: int = 0  # requests per window, 0 disables limiting
+    rate_limit_window_s: float = 60.0
+    seed: Optional[int] = None
+    _rng: random.Random = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    @classmethod
+    def from_env(cls, prefix: str, defaults: Optional["Behavior"] = None) -> "Behavior":
+        """Reads e.g. MOCK_GITHUB_LATENCY_MS, MOCK_GITHUB_JITTER_MS, MOCK_GITHUB_FAILURE_RATE ... for prefix "MOCK_GITHUB".
+
+        Unset variables fall back to the matching field of `defaults`.
+        """
+        defaults = defaults or cls()
+
+        def _get(name, cast):
+            value = os.environ.get(f"{prefix}_{name.upper()}")
+            return cast(value) if value not in (None, "") else getattr(defaults, name)
+
+        return cls(
+            latency_ms=_get("latency_ms", float),
+            jitter_ms=_get("jitter_ms", float),
+            failure_rate=_get("failure_rate", float),
+            failure_status=_get("failure_status", int),
+            rate_limit=_get("rate_limit", int),
+            rate_limit_window_s=_get("rate_limit_window_s", float),
+            seed=_get("seed", int),
+        )
+
+    def delay(self) -> float:
+        """Seconds to wait before answering: latency plus uniform jitter, never negative."""
+        jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000
+
+    def should_fail(self) -> bool:
+        return self.failure_rate > 0 and self._rng.random() < self.failure_rate
+
+
+class RateLimiter:
+    """Fixed-window request counter matching how GitHub and Jira report quota."""
+
+    def __init__(self, limit: int, window_s: float):
+        self.limit = limit
+        self.window_s = window_s
+        self.window_start = time.time()
+        self.used = 0
+
+    def _roll(self) -> None:
+        now = time.time()
+        if now - self.window_start >= self.window_s:
+            self.window_start = now
+            self.used = 0
+
+    @property
+    def reset_at(self) -> float:
+        return self.window_start + self.window_s
+
+    def acquire(self) -> bool:
+        self._roll()
+        if self.used >= self.limit:
+            return False
+        self.used += 1
+        return True
+
+    def refund(self) -> None:
+        # GitHub does not charge conditional requests answered with 304
+        self.used = max(self.used - 1, 0)
+
+
+def _github_rate_headers(limiter: RateLimiter) -> Dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(limiter.limit),
+        "X-RateLimit-Remaining": str(max(limiter.limit - limiter.used, 0)),
+        "X-RateLimit-Used": str(limiter.used),
+        "X-RateLimit-Reset": str(int(limiter.reset_at)),
+        "X-RateLimit-Resource": "core",
+    }
+
+
+def _jira_rate_headers(limiter: RateLimiter) -> Dict[str, str]:
+    remaining = max(limiter.limit - limiter.used, 0)
+    return {
+        "X-RateLimit-Limit": str(limiter.limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": datetime.fromtimestamp(limiter.reset_at, tz=timezone.utc).isoformat(),
+        "X-RateLimit-NearLimit": "true" if remaining < limiter.limit * 0.2 else "false",
+    }
+
+
+_RATE_HEADER_STYLES = {"github": _github_rate_headers, "jira": _jira_rate_headers}
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def install_behavior(app: FastAPI, behavior: Behavior, style: str) -> None:
+    """Adds latency/jitter, failure injection, rate limiting and ETag/304 handling to every route.
+
+    `style` selects the rate-limit header dialect ("github" or "jira").
+    """
+    limiter = RateLimiter(behavior.rate_limit, behavior.rate_limit_window_s) if behavior.rate_limit else None
+    rate_headers = _RATE_HEADER_STYLES[style]
+    app.state.behavior = behavior
+    app.state.rate_limiter = limiter
+
+    @app.middleware("http")
+    async def _misbehave(request: Request, call_next):
+        delay = behavior.delay()
+        if delay:
+            await asyncio.sleep(delay)
+
+        if limiter is not None and not limiter.acquire():
+            retry_after = max(int(limiter.reset_at - time.time()), 1)
+            headers = {**rate_headers(limiter), "Retry-After": str(retry_after)}
+            return JSONResponse({"message": "API rate limit exceeded"}, status_code=429, headers=headers)
+
+        if behavior.should_fail():
+            response = JSONResponse({"message": "Injected failure"}, status_code=behavior.failure_status)
+        else:
+            response = await call_next(request)
+
+        if request.method == "GET" and response.status_code == 200:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = etag_for(body)
+            headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+            headers["ETag"] = etag
+            if request.headers.get("if-none-match") == etag:
+                if limiter is not None:
+                    limiter.refund()
+                headers.pop("content-type", None)
+                response = Response(status_code=304, headers=headers)
+            else:
+                response = Response(content=body, status_code=200, headers=headers)
+
+        if limiter is not None:
+            response.headers.update(rate_headers(limiter))
+        return response
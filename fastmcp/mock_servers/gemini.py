@@ -0,0 +1,141 @@
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Body, FastAPI, HTTPException
+
+from .behavior import Behavior, install_behavior
+
+Plan = Tuple[str, Dict[str, Any]]
+
+# Keyword rules used when a prompt has no exact plan: (pattern, tool, args builder)
+DEFAULT_RULES: List[Tuple[str, str, Any]] = [
+    (r"\b([A-Z][A-Z0-9]+-\d+)\b.*\bcomments?\b|\bcomments?\b.*\b([A-Z][A-Z0-9]+-\d+)\b", "jira_get_issue_comments",
+     lambda m: {"issue_key": m.group(1) or m.group(2)}),
+    (r"\b([A-Z][A-Z0-9]+-\d+)\b", "jira_fetch_issue", lambda m: {"ticket_id": m.group(1)}),
+    (r"\bsprints?\b.*\b([A-Z][A-Z0-9]+)\b", "jira_get_sprints", lambda m: {"project_key": m.group(1)}),
+    (r"\bissues\b.*\bin ([A-Z][A-Z0-9]+)\b", "jira_get_issues_for_project", lambda m: {"project_key": m.group(1)}),
+    (r"\bjira projects\b", "jira_get_projects", lambda m: {}),
+    (r"\brepos\b|\brepositories\b", "github_get_repos", lambda m: {}),
+]
+
+
+class GeminiScript:
+    """Decides what the Gemini stand-in answers: a function call for a recognised request, text otherwise.
+
+    `plans` maps an exact user request to (tool name, args) and wins over the keyword `rules`.
+    """
+
+    def __init__(self, plans: Optional[Dict[str, Plan]] = None, rules: Optional[List[Tuple[str, str, Any]]] = None):
+        self.plans = dict(plans or {})
+        self.rules = [(re.compile(p), name, build) for p, name, build in (DEFAULT_RULES if rules is None else rules)]
+
+    def plan(self, request: str) -> Optional[Plan]:
+        request = request.strip()
+        if request in self.plans:
+            return self.plans[request]
+        for pattern, name, build in self.rules:
+            match = pattern.search(request)
+            if match:
+                return name, build(match)
+        return None
+
+
+def _texts(contents: List[Dict[str, Any]]) -> List[str]:
+    return [part["text"] for content in contents for part in content.get("parts", []) if "text" in part]
+
+
+def _has_function_response(contents: List[Dict[str, Any]]) -> bool:
+    return any("functionResponse" in part for content in contents for part in content.get("parts", []))
+
+
+def _tokens(payload: Any) -> int:
+    return len(json.dumps(payload)) // 4 + 1
+
+
+def _expire_time(ttl: str) -> str:
+    seconds = float(ttl.rstrip("s") or 0)
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def create_gemini_app(behavior: Optional[Behavior] = None, script: Optional[GeminiScript] = None) -> FastAPI:
+    """Builds a stand-in for the Generative Language REST API (generateContent, countTokens, cachedContents).
+
+    `app.state.caches` holds the context caches created through the API, by name.
+    """
+    app = FastAPI(title="Gemini stand-in")
+    script = script or GeminiScript()
+    app.state.script = script
+    app.state.caches = {}
+    install_behavior(app, behavior or Behavior(), style="github")
+
+    @app.post("/v1beta/cachedContents")
+    async def create_cached_content(payload: Dict[str, Any] = Body(...)):
+        name = f"cachedContents/standin-{len(app.state.caches) + 1}"
+        tokens = _tokens(payload.get("systemInstruction", {})) + _tokens(payload.get("tools", [])) + _tokens(payload.get("contents", []))
+        cache = {
+            "name": name,
+            "model": payload.get("model", ""),
+            "displayName": payload.get("displayName", ""),
+            "expireTime": _expire_time(payload.get("ttl", "3600s")),
+            "usageMetadata": {"totalTokenCount": tokens},
+        }
+        app.state.caches[name] = cache
+        return cache
+
+    @app.patch("/v1beta/cachedContents/{cache_id}")
+    async def update_cached_content(cache_id: str, payload: Dict[str, Any] = Body(...)):
+        cache = app.state.caches.get(f"cachedContents/{cache_id}")
+        if cache is None:
+            raise HTTPException(status_code=404, detail="CachedContent not found")
+        cache["expireTime"] = _expire_time(payload.get("ttl", "3600s"))
+        return cache
+
+    @app.delete("/v1beta/cachedContents/{cache_id}")
+    async def delete_cached_content(cache_id: str):
+        app.state.caches.pop(f"cachedContents/{cache_id}", None)
+        return {}
+
+    @app.post("/v1beta/models/{model_action}")
+    async def model_action(model_action: str, payload: Dict[str, Any] = Body(...)):
+        model, _, action = model_action.partition(":")
+        # countTokens may wrap the request it counts: {"generateContentRequest": {...}}
+        request = payload.get("generateContentRequest") or payload
+        contents = request.get("contents", [])
+        prompt_tokens = _tokens(contents) + _tokens(request.get("systemInstruction", {})) + _tokens(request.get("tools", []))
+        if action == "countTokens":
+            return {"totalTokens": prompt_tokens}
+        if action != "generateContent":
+            raise HTTPException(status_code=404, detail=f"Unknown action {action!r}")
+        cached_tokens = 0
+        if payload.get("cachedContent"):
+            cache = app.state.caches.get(payload["cachedContent"])
+            if cache is None:
+                raise HTTPException(status_code=404, detail="CachedContent not found")
+            cached_tokens = cache["usageMetadata"]["totalTokenCount"]
+            prompt_tokens += cached_tokens
+
+        plan = None
+        if not _has_function_response(contents):
+            texts = _texts(contents)
+            request = texts[-1].rsplit("User request: ", 1)[-1] if texts else ""
+            plan = script.plan(request)
+        if plan:
+            name, args = plan
+            part = {"functionCall": {"name": name, "args": args}}
+        else:
+            part = {"text": "Done."}
+        output_tokens = _tokens(part)
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [part]}, "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "cachedContentTokenCount": cached_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens,
+            },
+            "modelVersion": model,
+        }
+
+    return app
@@ -0,0 +1,275 @@
+import math
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import Body, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from .behavior import Behavior, install_behavior
+
+MAX_PER_PAGE = 100
+_LOGINS = ["alice", "bob", "carol"]
+_LABELS = ["bug", "enhancement", "docs"]
+
+
+def _paginated(request: Request, items: List[Any], page: int, per_page: int) -> JSONResponse:
+    """Returns one page of items with a GitHub-style Link header (first/prev/next/last)."""
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+    page = max(page, 1)
+    last = max(math.ceil(len(items) / per_page), 1)
+    start = (page - 1) * per_page
+
+    def _link(target: int, rel: str) -> str:
+        url = request.url.include_query_params(page=target, per_page=per_page)
+        return f'<{url}>; rel="{rel}"'
+
+    links = []
+    if page > 1:
+        links += [_link(page - 1, "prev"), _link(1, "first")]
+    if page < last:
+        links += [_link(page + 1, "next"), _link(last, "last")]
+    headers = {"Link": ", ".join(links)} if links else {}
+    return JSONResponse(items[start:start + per_page], headers=headers)
+
+
+def _created_at(number: int) -> str:
+    # Numbers are assigned in creation order
+    return (datetime(2025, 1, 1) + timedelta(minutes=number)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class GithubData:
+    """Deterministic in-memory dataset served by the GitHub stand-in."""
+
+    def __init__(self, owner: str = "bench", repos: int = 30, branches: int = 5, issues: int = 20, pulls: int = 10, files: int = 5):
+        self.owner = owner
+        self.repos = [
+            {
+                "name": f"repo-{i}",
+                "full_name": f"{owner}/repo-{i}",
+                "private": i % 3 == 0,
+                "html_url": f"https://github.example/{owner}/repo-{i}",
+                "description": f"Benchmark repository {i}",
+            }
+            for i in range(repos)
+        ]
+        self.branch_count = branches
+        self.issue_count = issues
+        self.pull_count = pulls
+        self.file_count = files
+        self._next_id = 10_000
+
+    def next_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def branches(self, repo: str) -> List[Dict[str, Any]]:
+        names = ["main"] + [f"feature-{i}" for i in range(1, self.branch_count)]
+        return [{"name": n, "commit": {"sha": f"{repo}-{n}-sha"}} for n in names]
+
+    def issue(self, owner: str, repo: str, number: int) -> Dict[str, Any]:
+        issue = {
+            "id": number,
+            "number": number,
+            "title": f"Issue {number} in {repo}",
+            "state": "open" if number % 4 else "closed",
+            "html_url": f"https://github.example/{owner}/{repo}/issues/{number}",
+            "body": f"Body of issue {number}",
+            "labels": [{"name": _LABELS[number % len(_LABELS)]}],
+            "assignee": {"login": _LOGINS[number % len(_LOGINS)]} if number % 2 else None,
+            "created_at": _created_at(number),
+            "updated_at": f"2025-09-{(number % 28) + 1:02d}T12:00:00Z",
+            "comments": number % 7,
+        }
+        # Every fifth entry is a PR, as the real issues endpoint mixes them in
+        if number % 5 == 0:
+            issue["pull_request"] = {"url": f"https://github.example/{owner}/{repo}/pull/{number}"}
+        return issue
+
+    def pull(self, owner: str, repo: str, number: int, state: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "id": 100_000 + number,
+            "number": number,
+            "title": f"PR {number} in {repo}",
+            "state": state or ("closed" if number % 3 == 0 else "open"),
+            "created_at": _created_at(number),
+            "updated_at": f"2025-09-{(number % 28) + 1:02d}T12:00:00Z",
+            "html_url": f"https://github.example/{owner}/{repo}/pull/{number}",
+            "body": f"Description of PR {number}",
+            "head": {"ref": f"feature-{number}", "sha": f"{repo}-pr{number}-head"},
+            "base": {"ref": "main"},
+        }
+
+    def pull_files(self, number: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "filename": f"src/module_{i}.py",
+                "status": "modified",
+                "additions": 10 + i,
+                "deletions": i,
+                "changes": 10 + 2 * i,
+                "patch": "@@ -1,3 +1,4 @@\n" + "".join(f"+line {j} of PR {number}\n" for j in range(10 + i)),
+            }
+            for i in range(self.file_count)
+        ]
+
+
+def _filter_issues(issues: List[Dict[str, Any]], state: str, labels: Optional[str], assignee: Optional[str], since: Optional[str]) -> List[Dict[str, Any]]:
+    if state != "all":
+        issues = [i for i in issues if i["state"] == state]
+    for label in (labels or "").split(","):
+        if label.strip():
+            issues = [i for i in issues if label.strip() in {l["name"] for l in i["labels"]}]
+    if assignee == "none":
+        issues = [i for i in issues if i["assignee"] is None]
+    elif assignee == "*":
+        issues = [i for i in issues if i["assignee"] is not None]
+    elif assignee:
+        issues = [i for i in issues if (i["assignee"] or {}).get("login") == assignee]
+    if since:
+        issues = [i for i in issues if i["updated_at"] >= since]
+    return issues
+
+
+def _sorted(items: List[Dict[str, Any]], sort: str, direction: Optional[str]) -> List[Dict[str, Any]]:
+    field = {"created": "created_at", "updated": "updated_at", "comments": "comments"}.get(sort, "created_at")
+    # GitHub lists newest first unless asked otherwise
+    return sorted(items, key=lambda i: (i.get(field) or 0, i["number"]), reverse=(direction or "desc") == "desc")
+
+
+# One aliased repository connection as github_service writes them
+_GRAPHQL_SELECTION = re.compile(r"(\w+): repository\(owner: \$(\w+), name: \$(\w+)\) \{ (\w+)\(([^)]*)\)")
+
+
+def _graphql_connection(data: "GithubData", owner: str, name: str, connection: str, arguments: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """Serves one page of a repository connection, with offsets as cursors."""
+    if connection == "refs":
+        nodes = [{"name": b["name"], "target": {"oid": b["commit"]["sha"]}} for b in sorted(data.branches(name), key=lambda b: b["name"])]
+    elif connection == "pullRequests":
+        pulls = [data.pull(owner, name, n) for n in range(data.pull_count, 0, -1)]
+        nodes = [{"databaseId": p["id"], "number": p["number"], "title": p["title"], "state": p["state"].upper(), "url": p["html_url"]} for p in pulls]
+    else:
+        issues = [data.issue(owner, name, n) for n in range(data.issue_count, 0, -1)]
+        nodes = [
+            {"databaseId": i["id"], "number": i["number"], "title": i["title"], "state": i["state"].upper(), "url": i["html_url"], "body": i["body"]}
+            for i in issues if "pull_request" not in i
+        ]
+    states = re.search(r"states: \[([A-Z, ]+)\]", arguments)
+    if states:
+        wanted = {state.strip() for state in states.group(1).split(",")}
+        nodes = [n for n in nodes if n["state"] in wanted]
+    first = int(re.search(r"first: (\d+)", arguments).group(1))
+    after = re.search(r"after: \$(\w+)", arguments)
+    start = int(variables.get(after.group(1)) or 0) if after else 0
+    end = start + min(first, MAX_PER_PAGE)
+    return {
+        "nodes": nodes[start:end],
+        "pageInfo": {"hasNextPage": end < len(nodes), "endCursor": str(end)},
+    }
+
+
+def create_github_app(behavior: Optional[Behavior] = None, data: Optional[GithubData] = None) -> FastAPI:
+    """Builds the GitHub REST stand-in (the subset of endpoints used by github_service)."""
+    app = FastAPI(title="GitHub stand-in")
+    data = data or GithubData()
+    app.state.data = data
+    install_behavior(app, behavior or Behavior(), style="github")
+
+    @app.get("/user/repos")
+    async def list_repos(request: Request, page: int = 1, per_page: int = 30):
+        return _paginated(request, data.repos, page, per_page)
+
+    @app.get("/repos/{owner}/{repo}/branches")
+    async def list_branches(request: Request, owner: str, repo: str, page: int = 1, per_page: int = 30):
+        return _paginated(request, data.branches(repo), page, per_page)
+
+    @app.get("/repos/{owner}/{repo}/git/refs/heads/{branch:path}")
+    async def get_ref(owner: str, repo: str, branch: str):
+        return {"ref": f"refs/heads/{branch}", "object": {"sha": f"{repo}-{branch}-sha"}}
+
+    @app.post("/repos/{owner}/{repo}/git/refs", status_code=201)
+    async def create_ref(owner: str, repo: str, payload: Dict[str, Any] = Body(...)):
+        return {"ref": payload.get("ref"), "object": {"sha": payload.get("sha")}}
+
+    @app.get("/repos/{owner}/{repo}/issues")
+    async def list_issues(
+        request: Request, owner: str, repo: str, state: str = "open", labels: Optional[str] = None,
+        assignee: Optional[str] = None, since: Optional[str] = None, sort: str = "created",
+        direction: Optional[str] = None, page: int = 1, per_page: int = 30,
+    ):
+        issues = [data.issue(owner, repo, n) for n in range(1, data.issue_count + 1)]
+        issues = _sorted(_filter_issues(issues, state, labels, assignee, since), sort, direction)
+        return _paginated(request, issues, page, per_page)
+
+    @app.post("/repos/{owner}/{repo}/issues", status_code=201)
+    async def create_issue(owner: str, repo: str, payload: Dict[str, Any] = Body(...)):
+        number = data.next_id()
+        issue = data.issue(owner, repo, number)
+        issue.pop("pull_request", None)
+        issue.update(title=payload.get("title", ""), body=payload.get("body"), state="open")
+        return issue
+
+    @app.post("/repos/{owner}/{repo}/issues/{number}/comments", status_code=201)
+    async def comment_issue(owner: str, repo: str, number: int, payload: Dict[str, Any] = Body(...)):
+        return {"id": data.next_id(), "body": payload.get("body", "")}
+
+    @app.get("/repos/{owner}/{repo}/pulls")
+    async def list_pulls(
+        request: Request, owner: str, repo: str, state: str = "open", base: Optional[str] = None,
+        head: Optional[str] = None, sort: str = "created", direction: Optional[str] = None,
+        page: int = 1, per_page: int = 30,
+    ):
+        pulls = [data.pull(owner, repo, n) for n in range(1, data.pull_count + 1)]
+        pulls = [
+            p for p in pulls
+            if state in ("all", p["state"])
+            and base in (None, p["base"]["ref"])
+            # head is "user:branch" on GitHub
+            and head in (None, p["head"]["ref"], f"{owner}:{p['head']['ref']}")
+        ]
+        return _paginated(request, _sorted(pulls, sort, direction), page, per_page)
+
+    @app.post("/repos/{owner}/{repo}/pulls", status_code=201)
+    async def create_pull(owner: str, repo: str, payload: Dict[str, Any] = Body(...)):
+        pull = data.pull(owner, repo, data.next_id(), state="open")
+        pull["title"] = payload.get("title", "")
+        return pull
+
+    @app.get("/repos/{owner}/{repo}/pulls/{number}")
+    async def get_pull(owner: str, repo: str, number: int):
+        if number > data.pull_count:
+            raise HTTPException(status_code=404, detail="Not Found")
+        return data.pull(owner, repo, number)
+
+    @app.patch("/repos/{owner}/{repo}/pulls/{number}")
+    async def update_pull(owner: str, repo: str, number: int, payload: Dict[str, Any] = Body(...)):
+        return data.pull(owner, repo, number, state=payload.get("state", "open"))
+
+    @app.put("/repos/{owner}/{repo}/pulls/{number}/merge")
+    async def merge_pull(owner: str, repo: str, number: int, payload: Dict[str, Any] = Body(...)):
+        return {"sha": f"{repo}-merge-{number}", "merged": True, "message": "Pull Request successfully merged"}
+
+    @app.get("/repos/{owner}/{repo}/pulls/{number}/files")
+    async def list_pull_files(request: Request, owner: str, repo: str, number: int, page: int = 1, per_page: int = 30):
+        return _paginated(request, data.pull_files(number), page, per_page)
+
+    @app.post("/graphql")
+    async def graphql(payload: Dict[str, Any] = Body(...)):
+        query, variables = payload.get("query", ""), payload.get("variables") or {}
+        selections = _GRAPHQL_SELECTION.findall(query)
+        if not selections:
+            return {"data": None, "errors": [{"message": "Unsupported query"}]}
+        result: Dict[str, Any] = {"rateLimit": {"cost": 1, "remaining": 4999}}
+        errors = []
+        repos = {r["name"] for r in data.repos}
+        for alias, owner_var, name_var, connection, arguments in selections:
+            owner, name = variables.get(owner_var), variables.get(name_var)
+            if owner != data.owner or name not in repos:
+                result[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias],
+                               "message": f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                continue
+            result[alias] = {connection: _graphql_connection(data, owner, name, connection, arguments, variables)}
+        return {"data": result, **({"errors": errors} if errors else {})}
+
+    return app
@@ -0,0 +1,213 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import Body, FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+
+from .behavior import Behavior, install_behavior
+
+_STATUSES = ["To Do", "In Progress", "In Review", "Done"]
+_TRANSITIONS = [{"id": str(11 + 10 * i), "name": name, "to": {"name": name}} for i, name in enumerate(_STATUSES)]
+_USERS = ["Alice Smith", "Bob Jones", "Carol White", "Dan Brown"]
+
+
+class JiraData:
+    """Deterministic in-memory dataset served by the Jira stand-in."""
+
+    def __init__(self, projects: int = 3, issues_per_project: int = 120, sprints: int = 4):
+        self.projects = [
+            {"id": str(10_000 + i), "key": f"BENCH{i}" if i else "BENCH", "name": f"Benchmark Project {i}", "projectTypeKey": "software"}
+            for i in range(projects)
+        ]
+        self.issues_per_project = issues_per_project
+        self.sprint_count = sprints
+        self._next_id = 20_000
+        # Per-issue field overrides from touch(), applied on top of the generated data
+        self._edits: Dict[str, Dict[str, Any]] = {}
+
+    def next_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def project(self, key: str) -> Optional[Dict[str, Any]]:
+        return next((p for p in self.projects if p["key"] == key), None)
+
+    def issue(self, key: str) -> Optional[Dict[str, Any]]:
+        project_key, _, number = key.upper().rpartition("-")
+        if not self.project(project_key) or not number.isdigit():
+            return None
+        n = int(number)
+        if not 1 <= n <= self.issues_per_project:
+            return None
+        user = _USERS[n % len(_USERS)]
+        return {
+            "id": str(n),
+            "key": f"{project_key}-{n}",
+            "fields": {
+                "summary": f"Issue {n} of {project_key}",
+                "status": {"name": _STATUSES[n % len(_STATUSES)]},
+                "assignee": {"displayName": user} if n % 7 else None,
+                "priority": {"name": ["Low", "Medium", "High"][n % 3]},
+                "duedate": f"2025-10-{(n % 28) + 1:02d}",
+                "reporter": {"displayName": "Admin User"},
+                "created": f"2025-09-{(n % 28) + 1:02d}T09:00:00.000+0000",
+                "updated": f"2025-09-{(n % 28) + 1:02d}T12:30:00.000+0000",
+                "description": {
+                    "type": "doc", "version": 1,
+                    "content": [{"type": "paragraph", "content": [{"type": "text", "text": f"Description of {project_key}-{n}"}]}],
+                },
+                **self._edits.get(f"{project_key}-{n}", {}),
+            },
+        }
+
+    def touch(self, key: str, **fields: Any) -> None:
+        """Edits an issue (e.g. status={"name": "Done"}) and bumps its `updated` to now."""
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+        self._edits.setdefault(key.upper(), {}).update(fields, updated=now)
+
+    def project_issues(self, project_key: str) -> List[Dict[str, Any]]:
+        return [self.issue(f"{project_key}-{n}") for n in range(1, self.issues_per_project + 1)]
+
+    def board_id(self, project_key: str) -> int:
+        return self.projects.index(self.project(project_key)) + 1
+
+    def sprints(self, board_id: int) -> List[Dict[str, Any]]:
+        states = ["closed"] * (self.sprint_count - 2) + ["active", "future"]
+        return [
+            {"id": board_id * 100 + i, "name": f"Sprint {i + 1}", "state": states[i], "boardId": board_id}
+            for i in range(self.sprint_count)
+        ]
+
+
+def _filter_by_jql(issues: List[Dict[str, Any]], jql: str) -> List[Dict[str, Any]]:
+    status = re.search(r"status\s*=\s*['\"]([^'\"]+)['\"]", jql, re.IGNORECASE)
+    if status:
+        issues = [i for i in issues if i["fields"]["status"]["name"].lower() == status.group(1).lower()]
+    updated = re.search(r"updated\s*>=\s*['\"]?-(\d+)([mhd])['\"]?", jql, re.IGNORECASE)
+    if updated:
+        unit = {"m": "minutes", "h": "hours", "d": "days"}[updated.group(2).lower()]
+        since = datetime.now(timezone.utc) - timedelta(**{unit: int(updated.group(1))})
+        issues = [i for i in issues if datetime.strptime(i["fields"]["updated"], "%Y-%m-%dT%H:%M:%S.%f%z") >= since]
+    if re.search(r"order\s+by\s+updated", jql, re.IGNORECASE):
+        issues = sorted(issues, key=lambda i: i["fields"]["updated"])
+    return issues
+
+
+def create_jira_app(behavior: Optional[Behavior] = None, data: Optional[JiraData] = None) -> FastAPI:
+    """Builds the Jira Cloud REST/Agile stand-in (the subset of endpoints used by jira_service)."""
+    app = FastAPI(title="Jira stand-in")
+    data = data or JiraData()
+    app.state.data = data
+    install_behavior(app, behavior or Behavior(), style="jira")
+
+    def _issue_or_404(key: str) -> Dict[str, Any]:
+        issue = data.issue(key)
+        if issue is None:
+            raise HTTPException(status_code=404, detail="Issue does not exist")
+        return issue
+
+    @app.get("/rest/api/3/project")
+    async def list_projects():
+        return data.projects
+
+    @app.get("/rest/api/3/issue/{key}")
+    async def get_issue(key: str):
+        return _issue_or_404(key)
+
+    @app.post("/rest/api/3/issue", status_code=201)
+    async def create_issue(payload: Dict[str, Any] = Body(...)):
+        project_key = payload.get("fields", {}).get("project", {}).get("key", "BENCH")
+        issue_id = data.next_id()
+        return {"id": str(issue_id), "key": f"{project_key}-{issue_id}", "self": f"/rest/api/3/issue/{issue_id}"}
+
+    @app.get("/rest/api/3/search")
+    async def search(jql: str = "", startAt: int = 0, maxResults: int = 50, fields: str = "", validateQuery: str = "strict"):
+        keys = re.search(r"key\s+in\s*\(([^)]*)\)", jql, re.IGNORECASE)
+        match = re.search(r"project\s*=\s*['\"]?(\w+)", jql, re.IGNORECASE)
+        if keys:
+            requested = [k.strip().strip("'\"") for k in keys.group(1).split(",") if k.strip()]
+            issues = [issue for issue in map(data.issue, requested) if issue is not None]
+            missing = [k for k in requested if data.issue(k) is None]
+            if missing and validateQuery != "warn":
+                # Strict validation rejects the whole query, as Jira Cloud does
+                return JSONResponse(
+                    {"errorMessages": [f"An issue with key '{k}' does not exist for field 'key'." for k in missing]},
+                    status_code=400,
+                )
+        else:
+            issues = data.project_issues(match.group(1).upper()) if match and data.project(match.group(1).upper()) else []
+        issues = _filter_by_jql(issues, jql)
+        return {
+            "startAt": startAt,
+            "maxResults": maxResults,
+            "total": len(issues),
+            "issues": issues[startAt:startAt + maxResults],
+        }
+
+    @app.get("/rest/api/3/user/search")
+    async def search_users(query: str = ""):
+        return [
+            {"accountId": f"acc-{i}", "displayName": name}
+            for i, name in enumerate(_USERS)
+            if query.lower() in name.lower()
+        ]
+
+    @app.get("/rest/api/3/user/assignable/search")
+    async def assignable_users(project: str = "", startAt: int = 0, maxResults: int = 50):
+        users = [
+            {"accountId": f"acc-{i}", "displayName": name, "emailAddress": f"{name.split()[0].lower()}@example.com"}
+            for i, name in enumerate(_USERS)
+        ] if data.project(project.upper()) else []
+        return users[startAt:startAt + maxResults]
+
+    @app.put("/rest/api/3/issue/{key}/assignee", status_code=204)
+    async def assign(key: str, payload: Dict[str, Any] = Body(...)):
+        _issue_or_404(key)
+
+    @app.get("/rest/api/3/issue/{key}/transitions")
+    async def get_transitions(key: str):
+        _issue_or_404(key)
+        return {"transitions": _TRANSITIONS}
+
+    @app.post("/rest/api/3/issue/{key}/transitions", status_code=204)
+    async def do_transition(key: str, payload: Dict[str, Any] = Body(...)):
+        _issue_or_404(key)
+
+    @app.get("/rest/api/3/issue/{key}/comment")
+    async def get_comments(key: str):
+        _issue_or_404(key)
+        return {"comments": [
+            {"id": str(i), "body": f"Comment {i} on {key}", "author": {"displayName": _USERS[i % len(_USERS)]}, "created": "2025-09-01T00:00:00.000+0000"}
+            for i in range(3)
+        ]}
+
+    @app.post("/rest/api/3/issue/{key}/comment", status_code=201)
+    async def add_comment(key: str, payload: Dict[str, Any] = Body(...)):
+        _issue_or_404(key)
+        return {"id": str(data.next_id()), "body": payload.get("body")}
+
+    @app.get("/rest/agile/1.0/board")
+    async def list_boards(projectKeyOrId: str = ""):
+        if not data.project(projectKeyOrId.upper()):
+            return {"values": []}
+        board_id = data.board_id(projectKeyOrId.upper())
+        return {"values": [{"id": board_id, "name": f"{projectKeyOrId} board", "type": "scrum"}]}
+
+    @app.get("/rest/agile/1.0/board/{board_id}/sprint")
+    async def list_sprints(board_id: int, startAt: int = 0, maxResults: int = 50):
+        sprints = data.sprints(board_id)
+        page = sprints[startAt:startAt + maxResults]
+        return {"startAt": startAt, "maxResults": maxResults, "isLast": startAt + maxResults >= len(sprints), "values": page}
+
+    @app.post("/rest/agile/1.0/sprint/{sprint_id}/issue", status_code=204)
+    async def move_to_sprint(sprint_id: str, payload: Dict[str, Any] = Body(...)):
+        issues = payload.get("issues") or []
+        missing = [k for k in issues if data.issue(k) is None]
+        if len(issues) > 50 or missing:
+            # The Agile API rejects the whole batch
+            detail = f"Issues do not exist: {', '.join(missing)}" if missing else "At most 50 issues per request"
+            return JSONResponse({"errorMessages": [detail]}, status_code=400)
+        return None
+
+    return app
@@ -127,3 +127,47 @@ def sample_context_data():
             {"role": "assistant", "content": "Issue created successfully"}
         ]
     }
+
+
+def _standin_client_factory(app, requests):
+    """Builds an upstream_client replacement that talks to a stand-in app in-process."""
+    import httpx
+
+    async def _record(request):
+        requests.append(request)
+
+    def _client(upstream, hedge=None):
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), event_hooks={"request": [_record]})
+    return _client
+
+
+@pytest.fixture
+def jira_standin(monkeypatch):
+    """Points jira_service at the in-process Jira stand-in; `app.state.requests` records every call."""
+    from mock_servers import create_jira_app
+    from app.config.settings import settings
+    from app.services import jira_service
+
+    app = create_jira_app()
+    app.state.requests = []
+    jira_service.clear_caches()
+    monkeypatch.setattr(jira_service, "upstream_client", _standin_client_factory(app, app.state.requests))
+    monkeypatch.setattr(settings, "jira_mock", False)
+    monkeypatch.setattr(settings, "jira_base_url", "http://jira.test")
+    yield app
+    jira_service.clear_caches()
+
+
+@pytest.fixture
+def github_standin(monkeypatch):
+    """Points github_service at the in-process GitHub stand-in; `app.state.requests` records every call."""
+    from mock_servers import create_github_app
+    from app.config.settings import settings
+    from app.services import github_service
+
+    app = create_github_app()
+    app.state.requests = []
+    monkeypatch.setattr(github_service, "upstream_client", _standin_client_factory(app, app.state.requests))
+    monkeypatch.setattr(settings, "github_mock", False)
+    monkeypatch.setattr(settings, "github_api_url", "http://github.test")
+    return app
@@ -439,3 +439,21 @@ class TestMainEndpoints:
             for response in responses:
                 assert response.status_code == 200
                 assert response.json() == mock_agent_response
+
+    def test_metrics_endpoint(self):
+        """Test Prometheus metrics endpoint exposes request metrics."""
+        self.client.get("/")
+
+        response = self.client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'fastmcp_http_requests_total{method="GET",route="/",status="200"}' in response.text
+
+    def test_request_id_header(self):
+        """Test request id is echoed back or generated for correlation."""
+        response = self.client.get("/", headers={"X-Request-ID": "req-abc"})
+        assert response.headers["X-Request-ID"] == "req-abc"
+
+        generated = self.client.get("/")
+        assert len(generated.headers["X-Request-ID"]) == 32
@@ -0,0 +1,84 @@
+"""
+Unit tests for the in-process TTL cache.
+"""
+import asyncio
+
+import pytest
+from app.services import cache as cache_module
+from app.services.cache import TTLCache
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_entries_expire(self, monkeypatch):
+        """Values are served until their TTL elapses; negative entries use their own TTL."""
+        clock = [0.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+        cache = TTLCache("test", ttl=10, negative_ttl=2)
+        cache.set("a", 1)
+        cache.set("missing", None)
+
+        clock[0] = 1
+        assert cache.get("a") == (True, 1)
+        assert cache.get("missing") == (True, None)
+
+        clock[0] = 5
+        assert cache.get("missing") == (False, None)
+        assert cache.get("a") == (True, 1)
+
+        clock[0] = 10
+        assert cache.get("a") == (False, None)
+        assert len(cache) == 0
+
+    def test_lru_eviction_and_invalidate(self):
+        """The least recently used entry is evicted first; invalidate drops one or all entries."""
+        cache = TTLCache("test", ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+
+        cache.invalidate("a")
+        assert cache.get("a") == (False, None)
+        cache.invalidate()
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_is_single_flight(self):
+        """Concurrent misses for one key share a single load."""
+        cache = TTLCache("test", ttl=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+        assert await cache.get_or_load("k", loader) == "value"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self):
+        """A loader error reaches every waiter and the next call loads again."""
+        cache = TTLCache("test", ttl=60)
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(cache.get_or_load("k", failing) for _ in range(2)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+        async def ok():
+            return 1
+
+        assert await cache.get_or_load("k", ok) == 1
@@ -246,3 +246,201 @@ class TestGitHubService:
             
             assert len(result) == 1
             assert result[0].name == "repo1"
+
+
+@pytest.mark.unit
+class TestGithubListPagination:
+    """Test cases for paginated, server-filtered issue and pull request listings."""
+
+    @pytest.mark.asyncio
+    async def test_get_issues_fetches_every_page(self, github_standin):
+        """All pages are read in order and PRs mixed into the issues API are dropped."""
+        from app.services.github_service import get_issues
+
+        github_standin.state.data.issue_count = 450
+        issues = await get_issues("bench", "repo-1", state="all")
+
+        numbers = [i.number for i in issues]
+        assert len(numbers) == 360 and not any(n % 5 == 0 for n in numbers)
+        assert numbers == sorted(numbers, reverse=True)
+        assert sorted(int(r.url.params["page"]) for r in github_standin.state.requests) == [1, 2, 3, 4, 5]
+        assert {r.url.params["per_page"] for r in github_standin.state.requests} == {"100"}
+
+    @pytest.mark.asyncio
+    async def test_filters_are_sent_to_github(self, github_standin):
+        """state, labels, assignee and since are query parameters, not client-side filters."""
+        from app.services.github_service import get_issues
+
+        github_standin.state.data.issue_count = 300
+        issues = await get_issues("bench", "repo-1", state="open", labels="bug", assignee="alice",
+                                  since="2025-09-10T00:00:00Z", sort="updated", direction="asc")
+
+        params = github_standin.state.requests[0].url.params
+        assert (params["state"], params["labels"], params["assignee"], params["since"]) == ("open", "bug", "alice", "2025-09-10T00:00:00Z")
+        assert (params["sort"], params["direction"]) == ("updated", "asc")
+        assert issues and len(github_standin.state.requests) == 1
+        assert all(i.state == "open" and i.number % 3 == 0 and i.number % 2 for i in issues)
+
+    @pytest.mark.asyncio
+    async def test_max_items_limits_pages(self, github_standin, monkeypatch):
+        """Without a row filter only the pages needed for max_items are requested."""
+        from app.config.settings import settings
+        from app.services.github_service import get_pull_requests
+
+        monkeypatch.setattr(settings, "github_page_concurrency", 8)
+        github_standin.state.data.pull_count = 900
+        pulls = await get_pull_requests("bench", "repo-1", state="all", max_items=250)
+
+        assert len(pulls) == 250
+        assert [p.number for p in pulls] == list(range(900, 650, -1))
+        assert sorted(int(r.url.params["page"]) for r in github_standin.state.requests) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_pages_without_last_link(self, github_standin, monkeypatch):
+        """When GitHub sends only rel="next", pages are followed one by one."""
+        from app.services import github_service
+
+        github_standin.state.data.pull_count = 250
+        monkeypatch.setattr(github_service, "_last_page", lambda response: None)
+        pulls = await github_service.get_pull_requests("bench", "repo-1", state="all")
+
+        assert len(pulls) == 250
+        assert [r.url.params["page"] for r in github_standin.state.requests] == ["1", "2", "3"]
+
+
+@pytest.mark.unit
+class TestGithubRepoOverview:
+    """Test cases for multi-repository reads through GraphQL and the REST fallback."""
+
+    REPOS = [f"bench/repo-{i}" for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_one_query_for_many_repos(self, github_standin):
+        """Branches and open PRs of 20 repositories take a single GraphQL request."""
+        from app.services.github_service import get_repos_overview
+
+        result = await get_repos_overview(self.REPOS, ["branches", "pull_requests"])
+
+        assert [r.method + " " + r.url.path for r in github_standin.state.requests] == ["POST /graphql"]
+        assert [r.full_name for r in result.repositories] == self.REPOS
+        first = result.repositories[0]
+        assert [b.name for b in first.branches] == ["feature-1", "feature-2", "feature-3", "feature-4", "main"]
+        assert [p.number for p in first.pull_requests] == [10, 8, 7, 5, 4, 2, 1]
+        assert first.issues is None
+
+    @pytest.mark.asyncio
+    async def test_matches_rest_fallback(self, github_standin, monkeypatch):
+        """The REST path returns the same rows with an order of magnitude more requests."""
+        from app.config.settings import settings
+        from app.services.github_service import get_repos_overview
+
+        graphql = await get_repos_overview(self.REPOS, ["pull_requests", "issues"], state="all")
+        monkeypatch.setattr(settings, "github_graphql_enabled", False)
+        github_standin.state.requests.clear()
+        rest = await get_repos_overview(self.REPOS, ["pull_requests", "issues"], state="all")
+
+        assert len(github_standin.state.requests) == 40
+        for g, r in zip(graphql.repositories, rest.repositories):
+            assert sorted(p.number for p in g.pull_requests) == sorted(p.number for p in r.pull_requests)
+            assert sorted(i.number for i in g.issues) == sorted(i.number for i in r.issues)
+
+    @pytest.mark.asyncio
+    async def test_connections_are_paged_with_cursors(self, github_standin):
+        """Listings longer than a page continue from their endCursor until max_items."""
+        from app.services.github_service import get_repos_overview
+
+        github_standin.state.data.pull_count = 300
+        result = await get_repos_overview(self.REPOS[:3], ["pull_requests"], state="all", max_items=220)
+
+        assert all(len(r.pull_requests) == 220 for r in result.repositories)
+        assert [p.number for p in result.repositories[0].pull_requests] == list(range(300, 80, -1))
+        queries = [r.read().decode() for r in github_standin.state.requests]
+        assert len(queries) == 3
+        assert "first: 100," in queries[1] and '"a0":"100"' in queries[1]
+        assert "first: 20," in queries[2] and '"a0":"200"' in queries[2]
+
+    @pytest.mark.asyncio
+    async def test_queries_are_chunked_by_node_budget(self, github_standin, monkeypatch):
+        """No query requests more nodes than GITHUB_GRAPHQL_MAX_NODES."""
+        from app.config.settings import settings
+        from app.services.github_service import get_repos_overview
+
+        monkeypatch.setattr(settings, "github_graphql_max_nodes", 250)
+        result = await get_repos_overview(self.REPOS[:6], ["branches"])
+
+        assert len(github_standin.state.requests) == 3
+        assert all(len(r.branches) == 5 for r in result.repositories)
+
+    @pytest.mark.asyncio
+    async def test_missing_repository_reported_per_repo(self, github_standin):
+        """A repository GitHub can't resolve gets an error; the others are still returned."""
+        from fastapi import HTTPException
+        from app.services.github_service import get_repos_overview
+
+        result = await get_repos_overview("bench/repo-1, bench/nope", ["issues"])
+
+        assert result.repositories[0].error is None and result.repositories[0].issues
+        assert "Could not resolve" in result.repositories[1].error
+        with pytest.raises(HTTPException) as exc_info:
+            await get_repos_overview(["repo-1"])
+        assert exc_info.value.status_code == 400
+
+
+@pytest.mark.unit
+class TestGithubPullRequestFiles:
+    """Test cases for streamed, size-bounded pull request files and lazy patches."""
+
+    @pytest.mark.asyncio
+    async def test_every_page_is_listed(self, github_standin):
+        """Files beyond the first page are included, with only the listing fields."""
+        from app.services.github_service import get_pull_request_files
+
+        github_standin.state.data.file_count = 250
+        files = await get_pull_request_files("bench", "repo-1", 4)
+
+        assert len(files) == 250 and files[-1]["filename"] == "src/module_249.py"
+        assert [r.url.params["page"] for r in github_standin.state.requests] == ["1", "2", "3"]
+        assert set(files[0]) == {"filename", "status", "additions", "deletions", "changes", "patch"}
+
+    @pytest.mark.asyncio
+    async def test_patches_are_capped(self, github_standin, monkeypatch):
+        """Each patch and all patches together stay within their byte caps, cut at line ends."""
+        from app.config.settings import settings
+        from app.services.github_service import get_pull_request_files
+
+        monkeypatch.setattr(settings, "github_pr_patch_max_bytes", 100)
+        monkeypatch.setattr(settings, "github_pr_patch_total_bytes", 1000)
+        github_standin.state.data.file_count = 30
+        files = await get_pull_request_files("bench", "repo-1", 4)
+
+        patches = [f["patch"] for f in files if "patch" in f]
+        assert all(len(p.encode()) <= 100 and p.endswith("\n") for p in patches)
+        assert sum(len(p.encode()) for p in patches) <= 1000
+        assert all(f.get("patch_truncated") for f in files)
+        assert "patch" not in files[-1] and len(files) == 30
+
+    @pytest.mark.asyncio
+    async def test_metadata_only_stops_at_max_files(self, github_standin):
+        """Metadata listings carry no patches and don't fetch pages past max_files."""
+        from app.services.github_service import get_pull_request_files
+
+        github_standin.state.data.file_count = 250
+        files = await get_pull_request_files("bench", "repo-1", 4, include_patch=False, max_files=60)
+
+        assert len(files) == 60 and not any("patch" in f for f in files)
+        assert len(github_standin.state.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_single_patch_on_demand(self, github_standin):
+        """One file's full patch is fetched by streaming only up to its page."""
+        from fastapi import HTTPException
+        from app.services.github_service import get_pull_request_file_patch
+
+        github_standin.state.data.file_count = 250
+        file = await get_pull_request_file_patch("bench", "repo-1", 4, "src/module_120.py")
+
+        assert file["patch"].count("+line") == 130 and "patch_truncated" not in file
+        assert [r.url.params["page"] for r in github_standin.state.requests] == ["1", "2"]
+        with pytest.raises(HTTPException) as exc_info:
+            await get_pull_request_file_patch("bench", "repo-1", 4, "nope.py")
+        assert exc_info.value.status_code == 404
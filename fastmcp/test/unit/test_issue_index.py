@@ -0,0 +1,140 @@
+"""
+Unit tests for the local SQLite issue index.
+"""
+import sqlite3
+
+import pytest
+from app.models.github_models import GithubIssue
+from app.models.jira_models import JiraIssueBasic
+from app.services import issue_index as issue_index_module
+from app.services.issue_index import IssueIndex
+
+
+def _jira(key, summary, status="To Do", assignee="Unassigned", priority="Medium", due=None, updated="2025-09-01"):
+    return JiraIssueBasic(key=key, summary=summary, status=status, assignee=assignee,
+                          priority=priority, due_date=due, updated=updated)
+
+
+@pytest.fixture
+def index():
+    idx = IssueIndex()
+    idx.index_jira("TP", [
+        _jira("TP-1", "Login page crashes on submit", "In Progress", "Alice Smith", "High", "2025-10-01", "2025-09-05"),
+        _jira("TP-2", "Add dark mode", "To Do", "Bob Jones", "Low", "2025-12-01", "2025-09-02"),
+        _jira("TP-3", "Logging is too verbose", "Done", "Alice Smith", "Medium", None, "2025-09-09"),
+    ])
+    idx.index_github("octo", "app", [
+        GithubIssue(id=1, number=7, title="Crash when login token expires", state="open",
+                    html_url="https://github.com/octo/app/issues/7", body="Stack trace attached"),
+    ])
+    return idx
+
+
+@pytest.mark.unit
+class TestIssueIndex:
+    """Test cases for IssueIndex filtering and search."""
+
+    def test_filters_are_case_insensitive(self, index):
+        """Status, priority and assignee match regardless of case; assignee matches any name part."""
+        result = index.search(source="jira", status="in progress")
+        assert [i.key for i in result.issues] == ["TP-1"]
+
+        result = index.search(assignee="smith", priority="HIGH")
+        assert [i.key for i in result.issues] == ["TP-1"]
+
+        assert index.search(assignee="alice").total == 2
+
+    def test_date_filters_and_default_order(self, index):
+        """Due and updated filters compare ISO dates; results are most recently updated first."""
+        assert [i.key for i in index.search(due_before="2025-11-01").issues] == ["TP-1"]
+        assert [i.key for i in index.search(source="jira", updated_since="2025-09-03").issues] == ["TP-3", "TP-1"]
+
+    def test_full_text_search(self, index):
+        """Words match titles and bodies as prefixes, across sources."""
+        result = index.search(text="login crash")
+        assert {i.key for i in result.issues} == {"TP-1", "octo/app#7"}
+
+        assert [i.key for i in index.search(text="stack").issues] == ["octo/app#7"]
+        assert index.search(text='"log* (').total == 3  # FTS syntax in the input is ignored
+
+    def test_updates_and_replace(self, index):
+        """Re-indexing updates rows and the search text; a complete listing drops missing rows."""
+        index.index_jira("TP", [_jira("TP-2", "Add light mode", "Done")])
+        assert index.search(text="dark").total == 0
+        assert index.search(text="light").issues[0].status == "Done"
+
+        index.index_jira("TP", [_jira("TP-2", "Add light mode")], replace=True)
+        assert index.count("jira", "TP") == 1
+        assert index.count("github") == 1
+
+    def test_replace_with_more_keys_than_sqlite_variables(self, index):
+        """A complete listing of a very large project replaces rows without one bound variable per key."""
+        if not hasattr(index._conn, "setlimit"):
+            pytest.skip("sqlite3 limits can be set from Python 3.11")
+        # 999 is SQLite's default limit before 3.32
+        index._conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        issues = [_jira(f"TP-{n}", "Bulk issue") for n in range(1, 2001)]
+        index.index_jira("TP", issues[2:], replace=True)
+
+        assert index.count("jira", "TP") == 1998
+        assert index.search(text="dark").total == 0
+
+    def test_limit_and_total(self, index):
+        """`total` counts every match even when fewer rows are returned."""
+        result = index.search(source="jira", limit=1)
+        assert len(result.issues) == 1
+        assert result.total == 3
+
+
+@pytest.mark.unit
+class TestIssuesSearchTool:
+    """Test cases for the issues_search tool against the Jira stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_first_search_lists_project_then_answers_locally(self, jira_standin, monkeypatch):
+        """An unindexed project is listed once; later filters make no requests."""
+        monkeypatch.setattr(issue_index_module, "issue_index", IssueIndex())
+        from app.services import jira_service
+        monkeypatch.setattr(jira_service, "issue_index", issue_index_module.issue_index)
+
+        first = await issue_index_module.search_issues(project="bench", status="done")
+        requests = len(jira_standin.state.requests)
+        second = await issue_index_module.search_issues(project="BENCH", assignee="bob", query="issue")
+
+        assert first.total == 30
+        assert all(i.status == "Done" for i in first.issues)
+        assert second.total > 0 and all(i.assignee == "Bob Jones" for i in second.issues)
+        assert len(jira_standin.state.requests) == requests
+
+    @pytest.mark.asyncio
+    async def test_mock_mode_is_indexed(self, monkeypatch):
+        """In JIRA_MOCK mode the sample listing is indexed too, so searches do not list the project each time."""
+        from app.config.settings import settings
+        from app.services import jira_service
+
+        monkeypatch.setattr(settings, "jira_mock", True)
+        monkeypatch.setattr(issue_index_module, "issue_index", IssueIndex())
+        monkeypatch.setattr(jira_service, "issue_index", issue_index_module.issue_index)
+        listed = []
+        listing = jira_service.get_issues_for_project
+
+        async def get_issues_for_project(project_key, status=None):
+            listed.append(project_key)
+            return await listing(project_key, status)
+
+        monkeypatch.setattr(jira_service, "get_issues_for_project", get_issues_for_project)
+
+        first = await issue_index_module.search_issues(project="tp", status="in progress")
+        await issue_index_module.search_issues(project="TP")
+
+        assert [i.key for i in first.issues] == ["TP-2"] and listed == ["TP"]
+
+    @pytest.mark.asyncio
+    async def test_jql_values_are_quoted(self, jira_standin):
+        """Status values are sent as escaped JQL strings instead of being pasted in."""
+        from app.services.jira_service import get_issues_for_project
+
+        await get_issues_for_project("BENCH", status="Done' OR project = 'OTHER")
+
+        jql = jira_standin.state.requests[0].url.params["jql"]
+        assert jql == 'project = "BENCH" AND status = "Done\' OR project = \'OTHER"'
@@ -4,6 +4,7 @@ Comprehensive unit tests for Jira service.
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 import httpx
+import json
 from app.services.jira_service import (
     get_jira_projects, get_issues_for_project, create_issue,
     fetch_jira_issue, get_issue_comments, comment_issue,
@@ -286,3 +287,251 @@ class TestJiraService:
             assert result[0].summary == "Complex Issue"
             assert result[0].assignee == "Jane Doe"
             assert result[0].due_date == "2023-01-15"
+
+
+@pytest.mark.unit
+class TestJiraBatchFetch:
+    """Test cases for fetch_jira_issues against the Jira stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_single_search_in_requested_order(self, jira_standin):
+        """Several keys are fetched with one search and returned in request order."""
+        from app.services.jira_service import fetch_jira_issues
+
+        result = await fetch_jira_issues(["BENCH-9", "bench-2", "BENCH1-5"])
+
+        assert [issue.ticket for issue in result.issues] == ["BENCH-9", "BENCH-2", "BENCH1-5"]
+        assert result.not_found == []
+        assert len(jira_standin.state.requests) == 1
+        assert "key in (BENCH-9, BENCH-2, BENCH1-5)" in jira_standin.state.requests[0].url.params["jql"]
+
+    @pytest.mark.asyncio
+    async def test_not_found_and_invalid_keys_reported(self, jira_standin):
+        """Unknown and malformed keys are listed instead of failing the batch."""
+        from app.services.jira_service import fetch_jira_issues
+
+        result = await fetch_jira_issues(["BENCH-1", "BENCH-999", "not a key", "BENCH-1"])
+
+        assert [issue.ticket for issue in result.issues] == ["BENCH-1"]
+        assert result.not_found == ["BENCH-999", "NOT A KEY"]
+
+    @pytest.mark.asyncio
+    async def test_keys_are_chunked(self, jira_standin, monkeypatch):
+        """Large batches are split into several searches."""
+        from app.services import jira_service
+
+        monkeypatch.setattr(jira_service, "JQL_KEYS_PER_REQUEST", 10)
+        keys = [f"BENCH-{n}" for n in range(1, 26)]
+
+        result = await jira_service.fetch_jira_issues(keys)
+
+        assert [issue.ticket for issue in result.issues] == keys
+        assert len(jira_standin.state.requests) == 3
+
+
+@pytest.mark.unit
+class TestJiraAssigneeCache:
+    """Test cases for the accountId cache behind assign_issue."""
+
+    @staticmethod
+    def _paths(app):
+        return [(r.method, r.url.path) for r in app.state.requests]
+
+    @pytest.mark.asyncio
+    async def test_repeated_assignments_search_once(self, jira_standin):
+        """The user search runs once; later assignments only PUT the assignee."""
+        await assign_issue("BENCH-1", "Bob Jones")
+        await assign_issue("BENCH-2", "bob jones ")
+
+        assert self._paths(jira_standin) == [
+            ("GET", "/rest/api/3/user/search"),
+            ("PUT", "/rest/api/3/issue/BENCH-1/assignee"),
+            ("PUT", "/rest/api/3/issue/BENCH-2/assignee"),
+        ]
+        assert jira_standin.state.requests[1].content == b'{"accountId":"acc-1"}'
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_negatively_cached(self, jira_standin):
+        """A name Jira does not know fails with 404 without searching again."""
+        from fastapi import HTTPException
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await assign_issue("BENCH-1", "Nobody Here")
+            assert exc_info.value.status_code == 404
+
+        assert self._paths(jira_standin) == [("GET", "/rest/api/3/user/search")]
+
+    @pytest.mark.asyncio
+    async def test_name_is_url_encoded(self, jira_standin):
+        """Names are sent as a query parameter rather than pasted into the URL."""
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException):
+            await assign_issue("BENCH-1", "a&b=c #1")
+
+        request = jira_standin.state.requests[0]
+        assert request.url.params["query"] == "a&b=c #1"
+        assert "b" not in request.url.params
+
+    @pytest.mark.asyncio
+    async def test_prefetch_assignable_users(self, jira_standin, monkeypatch):
+        """With prefetch on, one listing per project resolves every assignable user."""
+        from app.config.settings import settings
+
+        monkeypatch.setattr(settings, "jira_prefetch_assignable_users", True)
+        await assign_issue("BENCH-1", "Alice Smith")
+        await assign_issue("BENCH-2", "carol@example.com")
+        await assign_issue("BENCH-3", "Dan Brown")
+
+        assert [p for m, p in self._paths(jira_standin) if m == "GET"] == ["/rest/api/3/user/assignable/search"] * 2
+        assert jira_standin.state.requests[3].content == b'{"accountId":"acc-2"}'
+
+    @pytest.mark.asyncio
+    async def test_prefetch_reads_past_short_pages(self):
+        """A page with fewer users than asked for is not the last; paging stops at an empty one."""
+        from app.services import jira_service
+
+        users = [{"accountId": f"acc-{n}", "displayName": f"User {n}"} for n in range(5)]
+
+        def handler(request):
+            start = int(request.url.params["startAt"])
+            return httpx.Response(200, json=users[start:start + 2])
+
+        jira_service.clear_caches()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            assert await jira_service.prefetch_assignable_users("BENCH", client) == 5
+        assert jira_service._account_ids.get("user 4") == (True, "acc-4")
+        jira_service.clear_caches()
+
+
+@pytest.mark.unit
+class TestJiraBoardCache:
+    """Test cases for the board id and sprint caches."""
+
+    @staticmethod
+    def _paths(app):
+        return [r.url.path for r in app.state.requests]
+
+    @pytest.mark.asyncio
+    async def test_board_and_sprints_cached(self, jira_standin):
+        """Repeated sprint lookups reuse the board id and the sprint list."""
+        first = await get_sprints("BENCH1")
+        second = await get_sprints("bench1")
+
+        assert [s.id for s in first] == [s.id for s in second]
+        assert self._paths(jira_standin) == ["/rest/agile/1.0/board", "/rest/agile/1.0/board/2/sprint"]
+
+    @pytest.mark.asyncio
+    async def test_move_invalidates_sprints_only(self, jira_standin):
+        """Moving an issue refetches sprints but keeps the board id."""
+        sprints = await get_sprints("BENCH")
+        await move_issue_to_sprint(sprints[-1].id, "BENCH-1")
+        await get_sprints("BENCH")
+
+        assert self._paths(jira_standin) == [
+            "/rest/agile/1.0/board", "/rest/agile/1.0/board/1/sprint",
+            "/rest/agile/1.0/sprint/103/issue", "/rest/agile/1.0/board/1/sprint",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_warm_caches_persists_board_ids(self, jira_standin, monkeypatch, tmp_path):
+        """Startup warming resolves configured projects and the map survives a restart."""
+        from app.config.settings import settings
+        from app.services import jira_service
+
+        cache_file = tmp_path / "boards.json"
+        monkeypatch.setattr(settings, "jira_board_cache_file", str(cache_file))
+        monkeypatch.setattr(settings, "jira_warm_projects", "BENCH, BENCH2, NOPE")
+
+        await jira_service.warm_caches()
+        assert len(jira_standin.state.requests) == 3
+        assert set(json.loads(cache_file.read_text())) == {"BENCH", "BENCH2"}
+
+        jira_service.clear_caches()
+        await jira_service.warm_caches()
+        assert await get_board_id_for_project("BENCH2") == 3
+        # Only the project without a board is looked up again
+        assert len(jira_standin.state.requests) == 4
+
+
+@pytest.mark.unit
+class TestJiraBulkOperations:
+    """Test cases for bulk assign, transition and move-to-sprint."""
+
+    def test_parse_issue_keys(self):
+        """Keys are normalized, deduplicated and ranges expanded."""
+        from app.services.jira_service import parse_issue_keys
+
+        assert parse_issue_keys("tp-1..tp-3, TP-2,OPS-7..9") == ["TP-1", "TP-2", "TP-3", "OPS-7", "OPS-8", "OPS-9"]
+        assert parse_issue_keys(["TP-4", " tp-4 ", ""]) == ["TP-4"]
+
+    def test_parse_issue_keys_limit(self):
+        """Oversized batches are rejected before any request is made."""
+        from fastapi import HTTPException
+        from app.services.jira_service import parse_issue_keys
+
+        with pytest.raises(HTTPException) as exc_info:
+            parse_issue_keys("TP-1..TP-10000")
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_bulk_move_batches_and_reports_failures(self, jira_standin):
+        """Issues are moved 50 per request; a rejected batch is retried one issue at a time to fail only the bad key."""
+        from app.services.jira_service import bulk_move_issues_to_sprint
+
+        keys = [f"BENCH-{n}" for n in range(1, 61)] + ["BENCH-999"]
+        result = await bulk_move_issues_to_sprint(103, keys)
+
+        assert len(jira_standin.state.requests) == 2 + 11
+        assert result.succeeded == 60 and result.failed == 1
+        failed = [r for r in result.results if r.status == "error"]
+        assert failed[0].issue_key == "BENCH-999"
+        assert "BENCH-999" in failed[0].detail
+
+    @pytest.mark.asyncio
+    async def test_bulk_transition_by_status_name(self, jira_standin):
+        """A status name is resolved per issue, and one bad issue doesn't stop the rest."""
+        from app.services.jira_service import bulk_transition_issues
+
+        result = await bulk_transition_issues("BENCH-1..BENCH-3, BENCH-999", "done")
+
+        assert result.succeeded == 3
+        assert [r.issue_key for r in result.results if r.status == "error"] == ["BENCH-999"]
+        posts = [r for r in jira_standin.state.requests if r.method == "POST"]
+        assert {p.content for p in posts} == {b'{"transition":{"id":"41"}}'}
+
+    @pytest.mark.asyncio
+    async def test_bulk_transition_by_id_skips_lookup(self, jira_standin):
+        """A numeric transition ID is posted directly."""
+        from app.services.jira_service import bulk_transition_issues
+
+        result = await bulk_transition_issues(["BENCH-1", "BENCH-2"], "21")
+
+        assert result.failed == 0
+        assert {r.method for r in jira_standin.state.requests} == {"POST"}
+
+    @pytest.mark.asyncio
+    async def test_bulk_assign_resolves_user_once(self, jira_standin):
+        """The assignee is looked up once and every issue gets a PUT."""
+        from app.services.jira_service import bulk_assign_issues
+
+        result = await bulk_assign_issues(["BENCH-1", "BENCH-2", "BENCH-3"], "Carol White")
+
+        assert result.succeeded == 3
+        methods = [r.method for r in jira_standin.state.requests]
+        assert methods.count("GET") == 1 and methods.count("PUT") == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_assign_reports_lookup_failures_per_issue(self, jira_standin, monkeypatch):
+        """A failed or empty user lookup marks every issue failed instead of failing the call."""
+        from app.services import jira_service
+
+        monkeypatch.setattr(jira_service.settings, "jira_prefetch_assignable_users", False)
+        missing = await jira_service.bulk_assign_issues(["BENCH-1", "BENCH-2"], "Nobody Here")
+        assert missing.failed == 2 and "not found" in missing.results[0].detail
+
+        jira_standin.state.behavior.failure_rate, jira_standin.state.behavior.failure_status = 1.0, 500
+        jira_service.clear_caches()
+        failed = await jira_service.bulk_assign_issues(["BENCH-1", "BENCH-2"], "Carol White")
+        assert failed.failed == 2 and failed.results[0].detail.startswith("HTTP 500")
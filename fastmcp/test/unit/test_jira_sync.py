@@ -0,0 +1,97 @@
+"""
+Unit tests for the incremental Jira issue sync.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.config.settings import settings
+from app.models.jira_models import JiraIssueBasic
+from app.services import jira_service
+from app.services.jira_sync import IssueStore
+
+
+def _issue(key, status="To Do"):
+    return JiraIssueBasic(key=key, summary=f"Summary of {key}", status=status)
+
+
+@pytest.mark.unit
+class TestIssueStore:
+    """Test cases for the local IssueStore."""
+
+    def test_apply_tracks_high_water_mark(self):
+        """The newest `updated` seen becomes the mark; deltas merge into the snapshot."""
+        store = IssueStore()
+        store.apply("TP", [("2025-09-01T10:00:00.000+0000", _issue("TP-1")),
+                           ("2025-09-03T10:00:00.000+0000", _issue("TP-2"))], full=True)
+        store.apply("TP", [("2025-09-02T10:00:00.000+0000", _issue("TP-1", "Done")),
+                           ("2025-09-04T08:00:00.000+0000", _issue("TP-10"))], full=False)
+
+        assert store.projects["TP"].high_water == "2025-09-04T08:00:00.000+0000"
+        assert [i.key for i in store.issues("TP")] == ["TP-10", "TP-2", "TP-1"]
+        assert store.issues("TP")[-1].status == "Done"
+
+    def test_full_crawl_replaces_snapshot(self):
+        """A full crawl drops issues that no longer exist."""
+        store = IssueStore()
+        store.apply("TP", [("2025-09-01T10:00:00.000+0000", _issue("TP-1")),
+                           ("2025-09-01T10:00:00.000+0000", _issue("TP-2"))], full=True)
+        store.apply("TP", [("2025-09-01T10:00:00.000+0000", _issue("TP-2"))], full=True)
+
+        assert [i.key for i in store.issues("TP")] == ["TP-2"]
+
+    def test_delta_window(self, monkeypatch):
+        """A delta covers the time since the mark plus the overlap; stale snapshots need a full crawl."""
+        monkeypatch.setattr(settings, "jira_sync_overlap_minutes", 2)
+        monkeypatch.setattr(settings, "jira_sync_full_interval", 3600.0)
+        store = IssueStore()
+        assert store.delta_minutes("TP") is None
+
+        mark = (datetime.now(timezone.utc) - timedelta(minutes=30)).strftime("%Y-%m-%dT%H:%M:%S.000%z")
+        store.apply("TP", [(mark, _issue("TP-1"))], full=True)
+        assert 32 <= store.delta_minutes("TP") <= 33
+
+        store.projects["TP"].full_synced_at -= 3600
+        assert store.delta_minutes("TP") is None
+
+    def test_persists_to_file(self, tmp_path):
+        """Snapshots survive a restart when a file is configured."""
+        path = tmp_path / "issues.json"
+        IssueStore(str(path)).apply("TP", [("2025-09-01T10:00:00.000+0000", _issue("TP-1"))], full=True)
+
+        restored = IssueStore(str(path))
+        assert restored.projects["TP"].high_water == "2025-09-01T10:00:00.000+0000"
+        assert restored.issues("TP")[0].summary == "Summary of TP-1"
+
+
+@pytest.mark.unit
+class TestIncrementalSync:
+    """Test cases for get_issues_for_project in incremental sync mode."""
+
+    @pytest.fixture(autouse=True)
+    def _sync_mode(self, monkeypatch, jira_standin):
+        monkeypatch.setattr(settings, "jira_incremental_sync", True)
+
+    @pytest.mark.asyncio
+    async def test_steady_state_is_one_small_request(self, jira_standin):
+        """After the first crawl a refresh is a single delta search."""
+        first = await jira_service.get_issues_for_project("BENCH")
+        crawl_requests = len(jira_standin.state.requests)
+        second = await jira_service.get_issues_for_project("BENCH")
+
+        assert len(first) == len(second) == 120
+        assert crawl_requests == 3
+        assert len(jira_standin.state.requests) == crawl_requests + 1
+        assert 'updated >= "-' in jira_standin.state.requests[-1].url.params["jql"]
+
+    @pytest.mark.asyncio
+    async def test_delta_picks_up_changes(self, jira_standin):
+        """Issues edited since the last refresh are updated locally, and status filters apply."""
+        await jira_service.get_issues_for_project("BENCH")
+        jira_standin.state.data.touch("BENCH-5", status={"name": "Done"}, summary="Renamed")
+
+        done = await jira_service.get_issues_for_project("BENCH", status="done")
+
+        assert "BENCH-5" in [i.key for i in done]
+        assert all(i.status == "Done" for i in done)
+        issue = next(i for i in await jira_service.get_issues_for_project("BENCH") if i.key == "BENCH-5")
+        assert issue.summary == "Renamed"
@@ -0,0 +1,75 @@
+"""
+Unit tests for the structured logging configuration.
+"""
+import json
+import logging
+import logging.handlers
+import pytest
+from app.config.logging_config import (
+    JsonFormatter, RequestIdFilter, request_id_var, setup_logging, shutdown_logging
+)
+
+
+@pytest.mark.unit
+class TestLoggingConfig:
+    """Test cases for logging setup, formatting and request-id correlation."""
+
+    def teardown_method(self):
+        shutdown_logging()
+
+    def test_request_id_filter_uses_context_var(self):
+        """The filter copies the current request id onto the record."""
+        record = logging.makeLogRecord({"msg": "hello"})
+        token = request_id_var.set("req-123")
+        try:
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        assert record.request_id == "req-123"
+
+    def test_request_id_defaults_outside_request(self):
+        """Records logged outside a request get a placeholder id."""
+        record = logging.makeLogRecord({"msg": "hello"})
+        RequestIdFilter().filter(record)
+        assert record.request_id == "-"
+
+    def test_json_formatter_includes_extras(self):
+        """JSON output contains level, message, request id and extra fields."""
+        record = logging.makeLogRecord({
+            "name": "app.test", "levelname": "INFO", "msg": "tool %s done",
+            "args": ("jira_fetch_issue",), "request_id": "abc", "tool": "jira_fetch_issue",
+        })
+
+        payload = json.loads(JsonFormatter().format(record))
+
+        assert payload["message"] == "tool jira_fetch_issue done"
+        assert payload["request_id"] == "abc"
+        assert payload["logger"] == "app.test"
+        assert payload["tool"] == "jira_fetch_issue"
+
+    def test_setup_logging_installs_queue_handler(self):
+        """The app logger only enqueues records; the listener does the I/O."""
+        logger = setup_logging("WARNING", json_output=True)
+
+        assert logger.name == "app"
+        assert logger.level == logging.WARNING
+        assert len(logger.handlers) == 1
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+        assert not logging.getLogger("app.services.context_service").isEnabledFor(logging.DEBUG)
+
+    def test_setup_logging_writes_json(self, capsys):
+        """Records are written as JSON lines once the listener drains the queue."""
+        setup_logging("DEBUG", json_output=True)
+        token = request_id_var.set("req-json")
+        try:
+            logging.getLogger("app.unit").info("hello %s", "world")
+        finally:
+            request_id_var.reset(token)
+        shutdown_logging()
+
+        line = capsys.readouterr().out.strip().splitlines()[-1]
+        payload = json.loads(line)
+        assert payload["message"] == "hello world"
+        assert payload["request_id"] == "req-json"
+        assert payload["level"] == "INFO"
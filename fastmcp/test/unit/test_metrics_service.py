@@ -0,0 +1,119 @@
+"""
+Unit tests for the metrics service.
+"""
+import pytest
+import httpx
+from types import SimpleNamespace
+from app.services import metrics_service
+
+
+def _sample(name, labels):
+    return metrics_service.registry.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.unit
+class TestMetricsService:
+    """Test cases for metrics recording helpers."""
+
+    def test_observe_tool_call_counts_outcome(self):
+        """Tool calls are counted per tool name and outcome."""
+        before_ok = _sample("fastmcp_tool_calls_total", {"tool": "jira_fetch_issue", "outcome": "success"})
+        before_err = _sample("fastmcp_tool_calls_total", {"tool": "jira_fetch_issue", "outcome": "error"})
+
+        metrics_service.observe_tool_call("jira_fetch_issue", 0.01, ok=True)
+        metrics_service.observe_tool_call("jira_fetch_issue", 0.02, ok=False)
+
+        assert _sample("fastmcp_tool_calls_total", {"tool": "jira_fetch_issue", "outcome": "success"}) == before_ok + 1
+        assert _sample("fastmcp_tool_calls_total", {"tool": "jira_fetch_issue", "outcome": "error"}) == before_err + 1
+
+    def test_is_error_result(self):
+        """Runner results shaped as error dicts are detected."""
+        assert metrics_service.is_error_result({"status": "error", "error": "boom"})
+        assert metrics_service.is_error_result({"error": "email_required"})
+        assert not metrics_service.is_error_result({"status": "preview"})
+        assert not metrics_service.is_error_result([{"error": "not a dict"}])
+
+    def test_observe_gemini_call_records_tokens(self):
+        """Token usage is read from the response usage metadata."""
+        labels = {"call": "unit_test", "kind": "prompt"}
+        before = _sample("fastmcp_gemini_tokens_total", labels)
+        response = SimpleNamespace(usage_metadata=SimpleNamespace(prompt_token_count=120, candidates_token_count=8))
+
+        metrics_service.observe_gemini_call("unit_test", 0.5, response)
+
+        assert _sample("fastmcp_gemini_tokens_total", labels) == before + 120
+        assert _sample("fastmcp_gemini_call_duration_seconds_count", {"call": "unit_test"}) >= 1
+
+    def test_observe_gemini_call_without_usage(self):
+        """Responses without usage metadata only record latency."""
+        metrics_service.observe_gemini_call("no_usage", 0.1, object())
+        assert _sample("fastmcp_gemini_tokens_total", {"call": "no_usage", "kind": "prompt"}) == 0
+
+    @pytest.mark.asyncio
+    async def test_track_gemini_usage(self):
+        """Calls inside the block, including from tasks it starts, add up; calls outside don't."""
+        import asyncio
+
+        def _response(prompt, cached):
+            usage = SimpleNamespace(prompt_token_count=prompt, cached_content_token_count=cached, candidates_token_count=5)
+            return SimpleNamespace(usage_metadata=usage)
+
+        async def _in_task():
+            metrics_service.observe_gemini_call("unit_usage", 0.1, _response(200, 0))
+
+        with metrics_service.track_gemini_usage() as usage:
+            metrics_service.observe_gemini_call("unit_usage", 0.1, _response(1000, 800))
+            await asyncio.create_task(_in_task())
+        metrics_service.observe_gemini_call("unit_usage", 0.1, _response(50, 0))
+
+        assert usage.as_dict() == {"calls": 2, "prompt": 1200, "candidates": 10, "cached": 800, "total": 0,
+                                   "sections": {}, "trimmed": [], "cached_ratio": 0.667}
+
+    def test_observe_prompt_section(self):
+        """Section sizes are recorded and added to the tracked request; trims are counted once per section."""
+        before = _sample("fastmcp_prompt_trims_total", {"section": "unit_history"})
+
+        with metrics_service.track_gemini_usage() as usage:
+            metrics_service.observe_prompt_section("unit_history", 300, trimmed=True)
+            metrics_service.observe_prompt_section("unit_history", 100, trimmed=True)
+            metrics_service.observe_prompt_section("unit_request", 20, trimmed=False)
+
+        assert usage.sections == {"unit_history": 400, "unit_request": 20} and usage.trimmed == ["unit_history"]
+        assert _sample("fastmcp_prompt_trims_total", {"section": "unit_history"}) == before + 2
+
+    def test_observe_cache_lookup(self):
+        """Cache hits and misses are counted separately."""
+        metrics_service.observe_cache_lookup("unit_cache", hit=True)
+        metrics_service.observe_cache_lookup("unit_cache", hit=False)
+        metrics_service.observe_cache_lookup("unit_cache", hit=False)
+
+        assert _sample("fastmcp_cache_requests_total", {"cache": "unit_cache", "result": "hit"}) == 1
+        assert _sample("fastmcp_cache_requests_total", {"cache": "unit_cache", "result": "miss"}) == 2
+
+    def test_observe_context_file(self, temp_dir):
+        """The context file gauge reflects the file size on disk."""
+        path = f"{temp_dir}/context.json"
+        with open(path, "w") as f:
+            f.write("x" * 42)
+
+        metrics_service.observe_context_file(path)
+
+        assert _sample("fastmcp_context_file_bytes", {}) == 42
+
+    @pytest.mark.asyncio
+    async def test_upstream_response_hook(self):
+        """The httpx hook counts responses per upstream, method and status."""
+        labels = {"upstream": "jira", "method": "GET", "status": "404"}
+        before = _sample("fastmcp_upstream_responses_total", labels)
+        hook = metrics_service.upstream_response_hook("jira")
+        response = httpx.Response(404, request=httpx.Request("GET", "https://jira.example.com/rest/api/3/issue/X-1"))
+
+        await hook(response)
+
+        assert _sample("fastmcp_upstream_responses_total", labels) == before + 1
+
+    def test_render_latest(self):
+        """The exposition output contains the exported metric families."""
+        output = metrics_service.render_latest().decode()
+        assert "fastmcp_tool_calls_total" in output
+        assert "fastmcp_upstream_responses_total" in output
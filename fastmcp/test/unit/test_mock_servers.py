@@ -0,0 +1,118 @@
+"""
+Unit tests for the GitHub, Jira and Gemini stand-in servers.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from mock_servers import Behavior, GeminiScript, create_gemini_app, create_github_app, create_jira_app
+
+
+@pytest.mark.unit
+class TestMockServers:
+    """Test cases for pagination, revalidation, rate limiting and fault injection."""
+
+    def test_github_link_header(self):
+        """List endpoints advertise next/last pages like GitHub does."""
+        client = TestClient(create_github_app())
+        response = client.get("/user/repos", params={"per_page": 10, "page": 2})
+
+        assert response.status_code == 200
+        assert len(response.json()) == 10
+        link = response.headers["link"]
+        assert 'page=3' in link and 'rel="next"' in link
+        assert 'rel="prev"' in link and 'rel="last"' in link
+
+    def test_github_per_page_is_capped(self):
+        """per_page above 100 is clamped and the last page has no next link."""
+        client = TestClient(create_github_app())
+        response = client.get("/user/repos", params={"per_page": 500})
+
+        assert len(response.json()) == 30
+        assert "link" not in response.headers
+
+    def test_etag_revalidation_returns_304(self):
+        """A GET repeated with If-None-Match gets an empty 304."""
+        client = TestClient(create_jira_app())
+        first = client.get("/rest/api/3/issue/BENCH-1")
+        etag = first.headers["etag"]
+
+        second = client.get("/rest/api/3/issue/BENCH-1", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_rate_limit_returns_429(self):
+        """Requests beyond the window quota get 429 with Retry-After and rate headers."""
+        client = TestClient(create_github_app(Behavior(rate_limit=2)))
+        assert client.get("/user/repos").headers["x-ratelimit-remaining"] == "1"
+        client.get("/user/repos")
+
+        limited = client.get("/user/repos")
+
+        assert limited.status_code == 429
+        assert int(limited.headers["retry-after"]) >= 1
+        assert limited.headers["x-ratelimit-remaining"] == "0"
+
+    def test_failure_injection(self):
+        """failure_rate=1 answers every request with the configured status."""
+        client = TestClient(create_jira_app(Behavior(failure_rate=1.0, failure_status=502)))
+        assert client.get("/rest/api/3/project").status_code == 502
+
+    def test_behavior_from_env(self, monkeypatch):
+        """MOCK_<NAME>_* variables override the given defaults."""
+        monkeypatch.setenv("MOCK_JIRA_FAILURE_RATE", "0.25")
+        behavior = Behavior.from_env("MOCK_JIRA", Behavior(latency_ms=40))
+
+        assert behavior.failure_rate == 0.25
+        assert behavior.latency_ms == 40
+
+    def test_gemini_function_call(self):
+        """A recognised request is answered with a functionCall part and usage metadata."""
+        client = TestClient(create_gemini_app())
+        payload = {"contents": [{"role": "user", "parts": [{"text": "ctx\nUser request: get jira issue BENCH-7"}]}]}
+
+        body = client.post("/v1beta/models/gemini-2.5-flash-lite:generateContent", json=payload).json()
+
+        part = body["candidates"][0]["content"]["parts"][0]
+        assert part["functionCall"] == {"name": "jira_fetch_issue", "args": {"ticket_id": "BENCH-7"}}
+        assert body["usageMetadata"]["totalTokenCount"] > 0
+
+    def test_gemini_context_cache(self):
+        """Calls naming a cached content count its tokens as cached; unknown caches are a 404."""
+        app = create_gemini_app()
+        client = TestClient(app)
+        cache = client.post("/v1beta/cachedContents", json={
+            "model": "models/m", "systemInstruction": {"parts": [{"text": "x" * 4000}]}, "ttl": "60s",
+        }).json()
+        payload = {"contents": [{"role": "user", "parts": [{"text": "User request: hi"}]}], "cachedContent": cache["name"]}
+
+        usage = client.post("/v1beta/models/m:generateContent", json=payload).json()["usageMetadata"]
+
+        assert usage["cachedContentTokenCount"] == cache["usageMetadata"]["totalTokenCount"] > 1000
+        assert usage["promptTokenCount"] > usage["cachedContentTokenCount"]
+        client.delete(f"/v1beta/{cache['name']}")
+        assert client.post("/v1beta/models/m:generateContent", json=payload).status_code == 404
+
+    def test_gemini_count_tokens(self):
+        """countTokens counts plain and wrapped (generateContentRequest) requests alike."""
+        client = TestClient(create_gemini_app())
+        contents = [{"role": "user", "parts": [{"text": "hello world " * 50}]}]
+
+        plain = client.post("/v1beta/models/m:countTokens", json={"contents": contents}).json()
+        wrapped = client.post("/v1beta/models/m:countTokens", json={"generateContentRequest": {"model": "models/m", "contents": contents}}).json()
+
+        assert plain["totalTokens"] == wrapped["totalTokens"] > 100
+
+    def test_gemini_text_after_function_response(self):
+        """Once a tool result is sent back, the stand-in answers with text."""
+        script = GeminiScript({"list my repos": ("github_get_repos", {})})
+        client = TestClient(create_gemini_app(script=script))
+        payload = {"contents": [
+            {"role": "user", "parts": [{"text": "User request: list my repos"}]},
+            {"role": "user", "parts": [{"functionResponse": {"name": "github_get_repos", "response": {}}}]},
+        ]}
+
+        body = client.post("/v1beta/models/m:generateContent", json=payload).json()
+
+        assert body["candidates"][0]["content"]["parts"][0] == {"text": "Done."}
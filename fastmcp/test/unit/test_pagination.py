@@ -0,0 +1,69 @@
+"""
+Unit tests for cursor-paginated list routes.
+"""
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from app.models.pagination import decode_cursor, encode_cursor
+from app.routers import github, jira
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(jira.router, prefix="/jira")
+    app.include_router(github.router, prefix="/github")
+    return TestClient(app)
+
+
+def _walk(client, url, limit):
+    """Follows next_cursor until the last page; returns the pages' items."""
+    pages, params = [], {"limit": limit}
+    while True:
+        body = client.get(url, params=params).json()
+        pages.append(body["items"])
+        if not body["next_cursor"]:
+            return pages
+        params = {"cursor": body["next_cursor"], "limit": limit}
+
+
+@pytest.mark.unit
+class TestPagination:
+    """Test cases for cursors and the paginated routes."""
+
+    def test_cursor_round_trip_and_scope(self):
+        """Cursors decode back to their position and are rejected for other listings or when tampered with."""
+        cursor = encode_cursor({"o": 100}, "jira/issues/TP/")
+        assert decode_cursor(cursor, "jira/issues/TP/") == {"o": 100}
+
+        for bad_scope, bad_cursor in (("jira/issues/OPS/", cursor), ("jira/issues/TP/", "not-a-cursor"),
+                                      ("x", encode_cursor({"o": -1}, "x"))):
+            with pytest.raises(HTTPException) as exc_info:
+                decode_cursor(bad_cursor, bad_scope)
+            assert exc_info.value.status_code == 400
+
+    def test_jira_issues_pages(self, client, jira_standin):
+        """Each page is one Jira search, and walking the cursors yields every issue once."""
+        pages = _walk(client, "/jira/issues/BENCH", 50)
+
+        assert [len(p) for p in pages] == [50, 50, 20]
+        assert len({i["key"] for p in pages for i in p}) == 120
+        assert [r.url.params["startAt"] for r in jira_standin.state.requests] == ["0", "50", "100"]
+
+    def test_jira_issues_without_limit_is_a_list(self, client, jira_standin):
+        """Existing clients that send no limit or cursor still get a plain list."""
+        body = client.get("/jira/issues/BENCH", params={"status": "Done"}).json()
+        assert isinstance(body, list) and len(body) == 30
+
+    def test_cursor_is_bound_to_filters(self, client, jira_standin):
+        """A cursor from one status filter can't be used with another."""
+        cursor = client.get("/jira/issues/BENCH", params={"status": "Done", "limit": 10}).json()["next_cursor"]
+        response = client.get("/jira/issues/BENCH", params={"status": "To Do", "cursor": cursor})
+        assert response.status_code == 400
+
+    def test_github_repos_pages(self, client, github_standin):
+        """Repository pages follow GitHub's Link header."""
+        pages = _walk(client, "/github/repos", 12)
+
+        assert [len(p) for p in pages] == [12, 12, 6]
+        assert [r.url.params["page"] for r in github_standin.state.requests] == ["1", "2", "3"]
@@ -0,0 +1,232 @@
+"""
+Unit tests for reusing tool plans across reworded requests and request templates.
+"""
+from types import SimpleNamespace
+
+import pytest
+from app.config.settings import settings
+from app.orchestration.plan_cache import PlanCache, embed, normalize
+
+_TRANSITIONS = [{"id": "1", "name": "To Do"}, {"id": "2", "name": "In Progress"}, {"id": "3", "name": "Done"}]
+_MOVE = [
+    {"name": "jira_get_possible_transitions", "args": {"issue_key": "TP-1"}},
+    {"name": "jira_transition_issue", "args": {"issue_key": "TP-1", "transition_id": "3"}},
+]
+_IN_PROGRESS = [{"name": "issues_search", "args": {"project_key": "TP", "status": "In Progress"}}]
+_OPEN_ISSUES = [{"name": "github_get_issues", "args": {"owner": "bench", "repo": "repo-1", "state": "open"}}]
+
+
+@pytest.fixture
+def plans(monkeypatch):
+    monkeypatch.setattr(settings, "plan_cache_threshold", 0.8)
+    return PlanCache(maxsize=16, ttl=60)
+
+
+@pytest.mark.unit
+class TestPlanCache:
+    """Test cases for matching, grounding and what may be stored."""
+
+    def test_normalize_keeps_identifiers(self):
+        """Keys and owner/repo names stay whole; punctuation around words goes."""
+        assert normalize("Show TP-12 PRs in bench/repo-1!") == "show tp-12 prs in bench/repo-1"
+        assert embed("list issues") == embed("List   issues?")
+
+    def test_reworded_request_reuses_plan(self, plans):
+        """A rewording with the same values gets the stored calls, as a copy."""
+        assert plans.store("show in progress issues in TP", _IN_PROGRESS)
+
+        calls = plans.lookup("in progress issues in TP")
+        assert calls == _IN_PROGRESS and calls is not _IN_PROGRESS
+        calls[0]["args"]["status"] = "Done"
+        assert plans.lookup("in progress issues in TP") == _IN_PROGRESS
+
+    def test_other_values_miss(self, plans):
+        """Another project, repository or issue key never reuses the plan."""
+        plans.store("show in progress issues in TP", _IN_PROGRESS)
+        plans.store("show open issues in bench/repo-1", _OPEN_ISSUES)
+
+        assert plans.lookup("show in progress issues in TQ") is None
+        assert plans.lookup("show open issues in bench/repo-2") is None
+        assert plans.lookup("show in progress issues in TP-3") is None
+
+    def test_other_tool_words_miss(self, plans):
+        """A request naming another object or action is planned afresh."""
+        plans.store("show open issues in bench/repo-1", _OPEN_ISSUES)
+
+        assert plans.lookup("show open PRs in bench/repo-1") is None
+        assert plans.lookup("create open issues in bench/repo-1") is None
+
+    def test_extra_filters_miss(self, plans):
+        """A request with a word the stored one lacks may narrow it; the stored calls would drop that."""
+        plans.store("list issues in TP", [{"name": "jira_get_issues_for_project", "args": {"project_key": "TP"}}])
+        plans.store("show open pull requests in octo/repo1", [{"name": "github_get_pull_requests", "args": {"owner": "octo", "repo": "repo1", "state": "open"}}])
+
+        assert plans.lookup("list all the issues in TP") is not None
+        for prompt in ("list issues in TP assigned to me", "list unassigned issues in TP", "list blocked issues in TP"):
+            assert plans.lookup(prompt) is None
+        for prompt in ("show open pull requests in octo/repo1 targeting main", "show open pull requests in octo/repo1 by alice",
+                       "show open pull requests not in octo/repo1"):
+            assert plans.lookup(prompt) is None
+
+    def test_unsafe_plans_are_not_stored(self, plans):
+        """Writes, context references and values the request does not spell out are not kept."""
+        assert not plans.store("move TP-1 to Done", [{"name": "jira_transition_issue", "args": {"ticket_id": "TP-1", "transition_id": "31"}}])
+        assert not plans.store("show open issues in this repo", _OPEN_ISSUES)
+        assert not plans.store("show my open issues", _OPEN_ISSUES)
+        assert not plans.store("show files of the pr in octo/repo1", [{"name": "github_get_pr_files", "args": {"owner": "octo", "repo": "repo1", "pr_number": 4}}])
+        assert len(plans) == 0
+
+
+@pytest.mark.unit
+class TestPlanTemplates:
+    """Test cases for request templates with slots."""
+
+    def test_transition_flow_runs_with_new_values(self, plans):
+        """'move X to S' replays both calls, looking the transition id up by name."""
+        assert plans.store("move TP-1 to Done", _MOVE, [_TRANSITIONS, {"status": "success"}])
+
+        replay = plans.match("move TP-7 to In Progress")
+
+        assert replay.call(0, []) == {"name": "jira_get_possible_transitions", "args": {"issue_key": "TP-7"}}
+        assert replay.call(1, [_TRANSITIONS]) == {"name": "jira_transition_issue", "args": {"issue_key": "TP-7", "transition_id": "2"}}
+        assert plans.match("move TP-7 to Review").call(1, [_TRANSITIONS]) is None
+
+    def test_value_from_previous_turn(self, plans):
+        """A value looked up in the previous turn's result brings that call into the plan."""
+        earlier = [(_MOVE[0], _TRANSITIONS)]
+        assert plans.store("set TP-1 status to Done", _MOVE[1:], [{"status": "success"}], earlier=earlier)
+
+        replay = plans.match("set BENCH-4 status to in-progress")
+
+        assert [replay.call(0, [])["name"], replay.call(1, [_TRANSITIONS])["args"]] == [
+            "jira_get_possible_transitions", {"issue_key": "BENCH-4", "transition_id": "2"},
+        ]
+
+    def test_slots_keep_their_shape(self, plans):
+        """Slots take values like the recorded ones: keys for keys, words for words, never references."""
+        plans.store("show open PRs in bench/repo-1", [{"name": "github_get_pull_requests", "args": {"owner": "bench", "repo": "repo-1", "state": "open"}}], [[]])
+
+        assert plans.match("show closed PRs in acme/api-2").call(0, [])["args"] == {"owner": "acme", "repo": "api-2", "state": "closed"}
+        assert plans.match("show open PRs in acme/api") is None
+        assert plans.match("show my PRs in bench/repo-1") is None
+        assert plans.match("show open issues in bench/repo-1") is None
+
+    def test_values_are_taken_as_typed(self, plans):
+        """Slot values keep the user's spelling; only the template's own words ignore case."""
+        issue = {"name": "github_create_issue", "args": {"owner": "octo", "repo": "repo1", "title": "Login Broken"}}
+        plans.store("create issue Login Broken in octo/repo1", [issue], [{}])
+        branch = {"name": "github_create_branch", "args": {"owner": "octo", "repo": "repo1", "branch_name": "hotfix-2", "source_branch": "main"}}
+        plans.store("create branch hotfix-2 from main in octo/repo1", [branch], [{}])
+
+        assert plans.match("Create issue API Timeout in octo/repo1").call(0, [])["args"]["title"] == "API Timeout"
+        assert plans.match("create branch Hotfix-3 from main in octo/repo1").call(0, [])["args"]["branch_name"] == "Hotfix-3"
+
+    def test_recased_values_stay_literal(self, plans):
+        """A value the model re-cased ('tp-1' sent as 'TP-1') is not a slot; only the same request matches."""
+        plans.store("move tp-1 to done", _MOVE, [_TRANSITIONS, {"status": "success"}])
+
+        assert plans.match("move tp-7 to done") is None
+        assert plans.match("Move TP-1 to Done").call(1, [_TRANSITIONS])["args"] == {"issue_key": "TP-1", "transition_id": "3"}
+
+    def test_values_without_source_are_not_templated(self, plans):
+        """A write with an argument the request does not give (a default or the session's repo) is left to the model."""
+        branch = {"name": "github_create_branch", "args": {"owner": "bench", "repo": "repo-1", "branch_name": "fix-1", "source_branch": "main"}}
+        assert not plans.store("create branch fix-1 in bench/repo-1", [branch], [{}])
+        assert not plans.store("email the summary of TP-1", [{"name": "email_send", "args": {"to": "a@b.c"}}], [{}])
+
+    def test_numbers_without_source_are_not_templated(self, plans):
+        """A PR number or sprint id the model took from the session is not replayed for other requests."""
+        merge = {"name": "github_merge_pull_request", "args": {"owner": "octo", "repo": "repo1", "pr_number": 4, "merge_method": "merge"}}
+        move = {"name": "jira_move_issue_to_sprint", "args": {"issue_key": "TP-8", "sprint_id": 42}}
+
+        assert not plans.store("merge the pr in octo/repo1", [merge], [{"merged": True}])
+        assert not plans.store("move TP-8 to the active sprint", [move], [{"status": "success"}])
+        assert plans.match("merge the pr in acme/api2") is None
+        assert plans.match("move TP-9 to the active sprint") is None
+        assert plans.store("merge pr 4 in octo/repo1", [merge], [{"merged": True}])
+        assert plans.match("merge pr 7 in acme/api2").call(0, [])["args"]["pr_number"] == 7
+
+    def test_tools_with_workflows_are_not_templated(self, plans):
+        """Closing a PR with 'notify' runs the orchestrator's email workflow, which a replay would skip."""
+        close = {"name": "github_close_pull_request", "args": {"owner": "octo", "repo": "repo1", "pr_number": 5}}
+        plans.store("close pr 5 in octo/repo1 and notify the team", [close], [{"state": "closed"}])
+
+        assert plans.match("close pr 7 in octo/repo1 and notify the team") is None
+
+
+@pytest.mark.unit
+class TestAgentPlanReuse:
+    """Test cases for the orchestrator skipping the planning call."""
+
+    @pytest.fixture
+    def agent(self, monkeypatch, tmp_path):
+        from app.orchestration import coordinator
+        from app.services.context_service import ContextService
+
+        monkeypatch.setattr(settings, "gemini_context_cache_enabled", False)
+        monkeypatch.setattr(settings, "plan_cache_enabled", True)
+        monkeypatch.setattr(coordinator, "context_service", ContextService(str(tmp_path)))
+        return coordinator.GeminiToolsAgent()
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_planning(self, agent, monkeypatch):
+        """A reworded request runs the stored calls again without asking the model to plan."""
+        from app.orchestration import coordinator
+
+        calls, ran = [], []
+
+        async def generate(contents, call, model=None, prefix=None):
+            calls.append(call)
+            if call == "plan":
+                part = SimpleNamespace(function_call=SimpleNamespace(name="issues_search", args=dict(_IN_PROGRESS[0]["args"])))
+                return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+            return SimpleNamespace(text="Found issues.")
+
+        async def issues_search(**args):
+            ran.append(args)
+            return {"issues": [], "total": 0}
+
+        monkeypatch.setattr(agent, "_generate", generate)
+        monkeypatch.setitem(coordinator.ALL_TOOL_RUNNERS, "issues_search", issues_search)
+
+        await agent.run("show in progress issues in TP", "plans")
+        result = await agent.run("in progress issues in TP please", "plans")
+
+        assert calls == ["plan", "result_summary", "result_summary"]
+        assert ran == [_IN_PROGRESS[0]["args"]] * 2
+        assert result["toolCalls"] == _IN_PROGRESS
+
+    @pytest.mark.asyncio
+    async def test_same_shape_write_flow(self, agent, monkeypatch):
+        """A transition of another issue runs both calls without the model; an unknown status goes to the model."""
+        from app.orchestration import coordinator
+
+        calls, ran = [], []
+
+        async def generate(contents, call, model=None, prefix=None):
+            calls.append(call)
+            if call == "plan":
+                parts = [SimpleNamespace(function_call=SimpleNamespace(name=c["name"], args=dict(c["args"]))) for c in _MOVE]
+                return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))])
+            return SimpleNamespace(text="Moved.")
+
+        async def get_transitions(issue_key):
+            ran.append(("transitions", issue_key))
+            return _TRANSITIONS
+
+        async def transition(issue_key, transition_id):
+            ran.append(("transition", issue_key, transition_id))
+            return {"status": "success"}
+
+        monkeypatch.setattr(agent, "_generate", generate)
+        monkeypatch.setitem(coordinator.ALL_TOOL_RUNNERS, "jira_get_possible_transitions", get_transitions)
+        monkeypatch.setitem(coordinator.ALL_TOOL_RUNNERS, "jira_transition_issue", transition)
+
+        await agent.run("move TP-1 to Done", "templates")
+        result = await agent.run("move TP-9 to In Progress", "templates")
+
+        assert calls == ["plan"] and result["result"][1] == {"status": "success"}
+        assert ran[-2:] == [("transitions", "TP-9"), ("transition", "TP-9", "2")]
+
+        await agent.run("move TP-9 to Review", "templates")
+        assert calls == ["plan", "plan"]
@@ -0,0 +1,96 @@
+"""
+Unit tests for chunked map-reduce pull request summaries.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from app.services import ai_service, pr_summary_service
+from app.services.pr_summary_service import _file_sections, estimate_tokens, summarize_pull_request
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """Replaces Gemini with a recorder that answers every prompt with a numbered summary."""
+    state = SimpleNamespace(prompts=[], active=0, peak=0)
+
+    async def generate_content(model, contents):
+        state.prompts.append(contents)
+        state.active += 1
+        state.peak = max(state.peak, state.active)
+        await asyncio.sleep(0.01)
+        state.active -= 1
+        return SimpleNamespace(text=f"summary {len(state.prompts)}", usage_metadata=None)
+
+    monkeypatch.setattr(ai_service, "generate_content", generate_content)
+    monkeypatch.setattr(pr_summary_service.genai, "GenerativeModel", lambda name: None)
+    pr_summary_service._summaries.invalidate()
+    yield state
+    pr_summary_service._summaries.invalidate()
+
+
+@pytest.mark.unit
+class TestPullRequestSummary:
+    """Test cases for chunking, the map and reduce steps and the per-head-SHA cache."""
+
+    def test_large_patches_are_split_at_line_ends(self):
+        """A patch over the chunk budget becomes numbered parts, each within the budget."""
+        patch = "".join(f"+line {n}\n" for n in range(500))
+        sections = _file_sections({"filename": "big.py", "status": "modified", "additions": 500, "deletions": 0, "patch": patch}, 200)
+
+        assert len(sections) > 1 and sections[0].startswith("--- big.py (modified, +500 -0) [part 1 of")
+        assert all(estimate_tokens(s) <= 200 + 20 for s in sections)
+        assert "".join(s.split("\n", 1)[1] for s in sections) == patch
+
+    @pytest.mark.asyncio
+    async def test_small_diff_takes_one_call(self, github_standin, gemini):
+        """A diff that fits one chunk is summarized by a single call with the PR description."""
+        github_standin.state.data.file_count = 3
+        result = await summarize_pull_request("bench", "repo-1", 4)
+
+        assert len(gemini.prompts) == 1 and "Description of PR 4" in gemini.prompts[0]
+        assert (result.summary, result.chunks, result.files) == ("summary 1", 1, 3)
+        assert result.head_sha == "repo-1-pr4-head"
+
+    @pytest.mark.asyncio
+    async def test_large_diff_is_mapped_then_reduced(self, github_standin, gemini, monkeypatch):
+        """Chunks are summarized concurrently up to the cap, then combined into one summary."""
+        from app.config.settings import settings
+
+        monkeypatch.setattr(settings, "pr_summary_chunk_tokens", 300)
+        monkeypatch.setattr(settings, "pr_summary_concurrency", 2)
+        github_standin.state.data.file_count = 40
+        result = await summarize_pull_request("bench", "repo-1", 4)
+
+        maps, reduces = gemini.prompts[:result.chunks], gemini.prompts[result.chunks:]
+        assert result.chunks > 2 and result.files == 40
+        assert all(estimate_tokens(p) < 300 + estimate_tokens(pr_summary_service._MAP_PROMPT) + 20 for p in maps)
+        assert gemini.peak == 2
+        assert reduces and "Part 1:" in reduces[-1] and result.summary == f"summary {len(gemini.prompts)}"
+
+    @pytest.mark.asyncio
+    async def test_summary_is_cached_per_head_sha(self, github_standin, gemini, monkeypatch):
+        """Asking again costs only the PR lookup; a new head commit is summarized afresh."""
+        data = github_standin.state.data
+        data.file_count = 3
+        await summarize_pull_request("bench", "repo-1", 4)
+        github_standin.state.requests.clear()
+
+        again = await summarize_pull_request("bench", "repo-1", 4)
+        assert len(gemini.prompts) == 1
+        assert [r.url.path for r in github_standin.state.requests] == ["/repos/bench/repo-1/pulls/4"]
+
+        pull = data.pull
+        monkeypatch.setattr(data, "pull", lambda *args, **kwargs: {**pull(*args, **kwargs), "head": {"sha": "pushed"}})
+        pushed = await summarize_pull_request("bench", "repo-1", 4)
+        assert len(gemini.prompts) == 2
+        assert (again.head_sha, pushed.head_sha) == ("repo-1-pr4-head", "pushed")
+
+    @pytest.mark.asyncio
+    async def test_missing_pull_request(self, github_standin, gemini):
+        """An unknown PR is a 404 and no model call is made."""
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException) as exc:
+            await summarize_pull_request("bench", "repo-1", 9999)
+        assert exc.value.status_code == 404 and not gemini.prompts
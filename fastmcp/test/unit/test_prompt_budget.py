@@ -0,0 +1,122 @@
+"""
+Unit tests for token-budgeted prompt assembly.
+"""
+import json
+
+import pytest
+from app.config.settings import settings
+from app.orchestration import prompt_budget
+from app.orchestration.prompt_budget import PromptSection, assemble_prompt, build_prompt, fit_text, fit_tool_response, fit_value
+from app.services import metrics_service
+from app.services.ai_service import estimate_tokens
+
+
+def _history(count, size=400):
+    return [f"{n}. User: request {n} " + "x" * size + "\n\n" for n in range(1, count + 1)]
+
+
+def _sections(history, context="Session Context: Current repository: bench/repo-1"):
+    return [
+        PromptSection("context", [context], 200, priority=1),
+        PromptSection("history", history, 300, header="\nRecent conversation context:\n"),
+        PromptSection("request", ["\n\nUser request: list my repositories"]),
+    ]
+
+
+@pytest.mark.unit
+class TestFitting:
+    """Test cases for cutting text and tool results to a budget."""
+
+    def test_fit_text_cuts_at_line_end(self):
+        """Long text keeps whole leading lines and says how much was left out."""
+        text = "".join(f"line {n}\n" for n in range(400))
+        fitted = fit_text(text, 100)
+
+        assert estimate_tokens(fitted) <= 100 and fitted.startswith("line 0\n")
+        assert "tokens omitted]" in fitted and fit_text("short", 100) == "short"
+
+    def test_fit_value_shortens_strings_then_lists(self):
+        """Descriptions are shortened before issues are dropped; the count of dropped ones is kept."""
+        issues = [{"key": f"TP-{n}", "description": "y" * 3000} for n in range(200)]
+        fitted = fit_value({"issues": issues, "total": 200}, 1000)
+        data = json.loads(fitted)
+
+        assert estimate_tokens(fitted) <= 1000 and data["total"] == 200
+        kept = data["issues"][:-1]
+        assert len(kept) > 1 and all(i["description"].endswith("[... truncated]") for i in kept)
+        assert data["issues"][-1] == f"... {200 - len(kept)} more items"
+
+    def test_small_tool_response_is_unchanged(self):
+        """Responses within the budget go back to the model as they are."""
+        response = {"key": "TP-1", "status": "Done"}
+        assert fit_tool_response(response, 100) is response
+        assert fit_tool_response({"items": list(range(1000))}, 100)["truncated"] is True
+
+
+@pytest.mark.unit
+class TestAssembly:
+    """Test cases for per-section and total budgets."""
+
+    def test_within_budget_is_unchanged(self):
+        """Sections that fit are joined as they are."""
+        prompt, counts, trimmed = assemble_prompt(_sections(_history(1, 10)), 1000)
+
+        assert prompt.startswith("Session Context: Current repository") and prompt.endswith("User request: list my repositories")
+        assert trimmed == [] and set(counts) == {"context", "history", "request"}
+
+    def test_oldest_history_goes_first(self):
+        """Over its own budget, history drops its oldest conversations."""
+        prompt, counts, trimmed = assemble_prompt(_sections(_history(5)), 5000)
+
+        assert counts["history"] <= 300 and trimmed == ["history"]
+        assert "5. User: request 5" in prompt and "1. User: request 1" not in prompt
+
+    def test_total_budget_trims_lowest_priority_first(self):
+        """Over the total, history shrinks before the session summary; the request is never cut."""
+        context = "Session Context: " + "c" * 600
+        prompt, counts, trimmed = assemble_prompt(_sections(_history(3, 200), context), 150)
+
+        assert counts["history"] == 0 and 0 < counts["context"] < 150
+        assert trimmed == ["history", "context"]
+        assert prompt.endswith("User request: list my repositories")
+
+    @pytest.mark.asyncio
+    async def test_usage_is_recorded_per_request(self, monkeypatch):
+        """Section sizes and trims land in the request's tracked usage."""
+        monkeypatch.setattr(settings, "prompt_exact_token_count", False)
+        with metrics_service.track_gemini_usage() as usage:
+            await build_prompt(_sections(_history(5)), 5000)
+
+        assert set(usage.sections) == {"context", "history", "request"} and usage.trimmed == ["history"]
+
+    @pytest.mark.asyncio
+    async def test_exact_count_retrims(self, monkeypatch):
+        """When Gemini counts more tokens than estimated, the prompt is assembled again to fit."""
+        counted = []
+
+        async def count_tokens(model, contents):
+            counted.append(contents)
+            return estimate_tokens(contents) * 2
+
+        monkeypatch.setattr(settings, "prompt_exact_token_count", True)
+        monkeypatch.setattr(prompt_budget.ai_service, "count_tokens", count_tokens)
+        estimate, _, _ = assemble_prompt(_sections(_history(2, 200)), 600)
+        prompt = await build_prompt(_sections(_history(2, 200)), 600, model=object())
+
+        assert counted == [estimate] and estimate_tokens(prompt) * 2 <= 600 + 20
+
+
+@pytest.mark.unit
+def test_context_sections_match_prompt_context(tmp_path):
+    """The budgeted sections carry the same text as the unbudgeted context prompt."""
+    from app.services.context_service import ContextService
+
+    service = ContextService(str(tmp_path))
+    context = service.get_or_create_context("budget")
+    for n in range(7):
+        context.add_conversation(f"show issues for TP-{n}", {"toolCalls": [{"name": "jira_fetch_issue", "args": {}}], "result": None})
+
+    summary, conversations = service.get_prompt_sections("next")
+
+    assert len(conversations) == 5 and conversations[0].startswith("1. User: show issues for TP-2")
+    assert service.get_context_for_prompt("next") == f"{summary}\nRecent conversation context:\n{''.join(conversations)}\n\n"
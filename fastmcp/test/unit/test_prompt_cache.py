@@ -0,0 +1,93 @@
+"""
+Unit tests for the orchestrator's Gemini context cache.
+"""
+from types import SimpleNamespace
+
+import pytest
+from app.config.settings import settings
+from app.orchestration import prompt_cache
+from app.orchestration.prompt_cache import CachedPrefixModel
+
+
+class _FakeCaches:
+    """Records CachedContent.create/update calls; `fail` makes create raise."""
+
+    def __init__(self):
+        self.created = []
+        self.updates = 0
+        self.fail = False
+
+    def create(self, **kwargs):
+        if self.fail:
+            raise ValueError("Cached content is too small")
+        content = SimpleNamespace(name=f"cachedContents/{len(self.created) + 1}", kwargs=kwargs,
+                                  update=self._update, usage_metadata=SimpleNamespace(total_token_count=4000))
+        self.created.append(content)
+        return content
+
+    def _update(self, ttl):
+        self.updates += 1
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    fake = _FakeCaches()
+    clock = [1000.0]
+    monkeypatch.setattr(prompt_cache.caching.CachedContent, "create", fake.create)
+    monkeypatch.setattr(prompt_cache.genai.GenerativeModel, "from_cached_content", staticmethod(lambda content: ("cached", content.name)))
+    monkeypatch.setattr(prompt_cache.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(settings, "gemini_context_cache_enabled", True)
+    monkeypatch.setattr(settings, "gemini_context_cache_ttl", 600.0)
+    monkeypatch.setattr(settings, "gemini_context_cache_retry", 300.0)
+    fake.clock = clock
+    return fake
+
+
+@pytest.mark.unit
+class TestCachedPrefixModel:
+    """Test cases for creating, refreshing and falling back from the context cache."""
+
+    @pytest.mark.asyncio
+    async def test_created_once_then_reused(self, caches):
+        """The instruction and tools are uploaded once; later calls reuse the cache."""
+        prefix = CachedPrefixModel("gemini-2.5-flash-lite", "Be helpful", [{"function_declarations": []}])
+
+        first = await prefix.get()
+        caches.clock[0] += 300
+        second = await prefix.get()
+
+        assert first == second == ("cached", "cachedContents/1")
+        assert len(caches.created) == 1 and caches.created[0].kwargs["system_instruction"] == "Be helpful"
+
+    @pytest.mark.asyncio
+    async def test_extended_before_expiry_and_recreated_after(self, caches):
+        """Near the TTL the cache is extended in place; once invalidated it is created again."""
+        prefix = CachedPrefixModel("gemini-2.5-flash-lite", "Be helpful", [])
+        await prefix.get()
+
+        caches.clock[0] += 600 - CachedPrefixModel.REFRESH_MARGIN + 1
+        assert await prefix.get() == ("cached", "cachedContents/1")
+        assert caches.updates == 1 and len(caches.created) == 1
+
+        prefix.invalidate()
+        assert await prefix.get() == ("cached", "cachedContents/2")
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_unsupported(self, caches):
+        """A failed create serves the plain model and is only retried after the retry delay."""
+        caches.fail = True
+        prefix = CachedPrefixModel("gemini-2.5-flash-lite", "Be helpful", [])
+
+        assert await prefix.get() is prefix.plain
+        caches.fail = False
+        assert await prefix.get() is prefix.plain
+        caches.clock[0] += 301
+        assert await prefix.get() == ("cached", "cachedContents/1")
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, caches, monkeypatch):
+        """With caching off nothing is created."""
+        monkeypatch.setattr(settings, "gemini_context_cache_enabled", False)
+        prefix = CachedPrefixModel("gemini-2.5-flash-lite", "Be helpful", [])
+
+        assert await prefix.get() is prefix.plain and not caches.created
@@ -0,0 +1,292 @@
+"""
+Unit tests for upstream retries, the circuit breaker and request hedging.
+"""
+import asyncio
+
+import httpx
+import pytest
+from app.config.settings import settings
+from app.services import metrics_service, resilience
+from app.services.resilience import (
+    CircuitBreaker, CircuitOpenError, HedgeBudget, HedgedTransport, ResilientTransport, RetryPolicy
+)
+
+
+def _client(handler, policy=None):
+    transport = ResilientTransport("jira", httpx.MockTransport(handler), policy or RetryPolicy(3, 0, 0))
+    return httpx.AsyncClient(transport=transport, base_url="http://upstream.test")
+
+
+def _sample(name, labels):
+    return metrics_service.registry.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.unit
+class TestResilience:
+    """Test cases for ResilientTransport and CircuitBreaker."""
+
+    def setup_method(self):
+        resilience.reset_breakers()
+
+    def teardown_method(self):
+        resilience.reset_breakers()
+
+    @pytest.mark.asyncio
+    async def test_get_retried_on_503(self):
+        """A GET is retried until it succeeds and retries are counted."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503 if len(calls) < 3 else 200, json={"ok": True})
+
+        before = _sample("fastmcp_upstream_retries_total", {"upstream": "jira", "reason": "503"})
+        async with _client(handler) as client:
+            response = await client.get("/rest/api/3/project")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert _sample("fastmcp_upstream_retries_total", {"upstream": "jira", "reason": "503"}) == before + 2
+
+    @pytest.mark.asyncio
+    async def test_get_gives_up_after_max_attempts(self):
+        """The last retryable response is returned once attempts are exhausted."""
+        async with _client(lambda request: httpx.Response(502)) as client:
+            response = await client.get("/x")
+        assert response.status_code == 502
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_on_status(self):
+        """Non-idempotent requests that reached the server are not retried."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        async with _client(handler) as client:
+            response = await client.post("/rest/api/3/issue", json={})
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_post_marked_idempotent_is_retried(self):
+        """Read-only POSTs such as GraphQL queries can opt in to status retries."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(502 if len(calls) < 2 else 200, json={"data": {}})
+
+        async with _client(handler) as client:
+            response = await client.post("/graphql", json={"query": "{}"}, extensions={"idempotent": True})
+
+        assert response.status_code == 200
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_retried_when_not_sent(self):
+        """Connection failures are retried for any method, as the request never left."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(201)
+
+        async with _client(handler) as client:
+            response = await client.post("/rest/api/3/issue", json={})
+
+        assert response.status_code == 201
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_read_timeout_not_retried(self):
+        """A POST that may have reached the server is not replayed."""
+        def handler(request):
+            raise httpx.ReadTimeout("slow", request=request)
+
+        async with _client(handler) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.post("/rest/api/3/issue", json={})
+
+    def test_backoff_honours_retry_after_and_cap(self):
+        """Retry-After is used when present, and delays never exceed the cap."""
+        policy = RetryPolicy(max_attempts=5, backoff_base=1.0, backoff_max=2.0)
+        assert policy.backoff(0, retry_after=1.5) == 1.5
+        assert policy.backoff(0, retry_after=60) == 2.0
+        assert all(0 <= policy.backoff(attempt) <= 2.0 for attempt in range(10))
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_and_fails_fast(self):
+        """After enough failures the breaker rejects calls without touching the upstream."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        resilience._breakers["upstream.test"] = CircuitBreaker("upstream.test", failure_threshold=2, reset_timeout=60)
+        async with _client(handler, RetryPolicy(1, 0, 0)) as client:
+            await client.get("/a")
+            await client.get("/b")
+            with pytest.raises(CircuitOpenError):
+                await client.get("/c")
+
+        assert len(calls) == 2
+        assert isinstance(CircuitOpenError("x"), httpx.RequestError)
+        assert _sample("fastmcp_circuit_breaker_open", {"host": "upstream.test"}) == 1
+
+    def test_half_open_probe(self, monkeypatch):
+        """After the reset timeout one probe is allowed; success closes the circuit."""
+        clock = [100.0]
+        monkeypatch.setattr(resilience.time, "monotonic", lambda: clock[0])
+        breaker = CircuitBreaker("h", failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+        assert breaker.allow() is False
+
+        clock[0] += 10
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # only one probe in flight
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow() is True
+
+    def test_failed_probe_reopens(self, monkeypatch):
+        """A failing half-open probe reopens the circuit for another timeout."""
+        clock = [0.0]
+        monkeypatch.setattr(resilience.time, "monotonic", lambda: clock[0])
+        breaker = CircuitBreaker("h", failure_threshold=1, reset_timeout=5)
+        breaker.record_failure()
+        clock[0] = 5
+        assert breaker.allow() is True
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is False
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self, monkeypatch):
+        """A probe cancelled mid-request frees the slot, so the next call may probe again."""
+        monkeypatch.setattr(settings, "circuit_reset_timeout", 0.0)
+        started = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            await asyncio.sleep(10)
+
+        breaker = resilience.get_breaker("upstream.test")
+        breaker.record_failure()
+        breaker.state = CircuitBreaker.OPEN
+        async with _client(handler) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get("/x"), 0.05)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN and breaker.allow() is True
+
+def _hedged_client(handler, samples=0.01, count=resilience.MIN_HEDGE_SAMPLES):
+    transport = HedgedTransport("github", "github.test", httpx.MockTransport(handler))
+    for _ in range(count):
+        transport.tracker.record(samples)
+    return httpx.AsyncClient(transport=transport, base_url="http://upstream.test"), transport
+
+
+@pytest.mark.unit
+class TestHedging:
+    """Test cases for HedgedTransport and its budget."""
+
+    def setup_method(self):
+        resilience.reset_breakers()
+
+    def teardown_method(self):
+        resilience.reset_breakers()
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged(self, monkeypatch):
+        """A GET slower than the threshold gets a duplicate, and the faster answer wins."""
+        monkeypatch.setattr(settings, "http_hedge_min_delay_ms", 10.0)
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(1)
+                return httpx.Response(200, json={"from": "primary"})
+            return httpx.Response(200, json={"from": "hedge"})
+
+        before = _sample("fastmcp_upstream_hedges_total", {"upstream": "github", "result": "won"})
+        client, _ = _hedged_client(handler)
+        async with client:
+            response = await client.get("/repos/o/r/pulls")
+
+        assert response.json() == {"from": "hedge"}
+        assert len(calls) == 2
+        assert _sample("fastmcp_upstream_hedges_total", {"upstream": "github", "result": "won"}) == before + 1
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_not_hedged(self, monkeypatch):
+        """Responses under the threshold never trigger a duplicate."""
+        monkeypatch.setattr(settings, "http_hedge_min_delay_ms", 200.0)
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200)
+
+        client, _ = _hedged_client(handler)
+        async with client:
+            await client.get("/x")
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_samples_or_for_writes(self, monkeypatch):
+        """Hedging needs a latency history and only applies to GET."""
+        monkeypatch.setattr(settings, "http_hedge_min_delay_ms", 1.0)
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200)
+
+        client, _ = _hedged_client(handler, count=0)
+        async with client:
+            await client.get("/x")
+        assert len(calls) == 1
+
+        client, _ = _hedged_client(handler)
+        async with client:
+            await client.post("/x", json={})
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_hedge_used_when_primary_fails(self, monkeypatch):
+        """If the original request errors after the hedge was sent, the hedge still answers."""
+        monkeypatch.setattr(settings, "http_hedge_min_delay_ms", 10.0)
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(0.05)
+                raise httpx.ReadError("reset", request=request)
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"from": "hedge"})
+
+        client, _ = _hedged_client(handler)
+        async with client:
+            response = await client.get("/x")
+        assert response.json() == {"from": "hedge"}
+
+    def test_budget_limits_hedge_rate(self):
+        """The budget allows about `ratio` hedges per request once the burst is spent."""
+        budget = HedgeBudget(ratio=0.1, burst=1)
+        hedges = 0
+        for _ in range(100):
+            budget.on_request()
+            hedges += budget.try_spend()
+        assert 9 <= hedges <= 11
@@ -0,0 +1,90 @@
+"""
+Unit tests for the orjson response class and json_response.
+"""
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.models.github_models import GithubRepo
+from app.models.pagination import Page
+from app.responses import ORJSONResponse, json_response
+
+
+def _repo(n: int) -> GithubRepo:
+    return GithubRepo(name=f"repo-{n}", full_name=f"bench/repo-{n}", private=False, html_url=f"https://github.com/bench/repo-{n}")
+
+
+@pytest.mark.unit
+class TestORJSONResponse:
+    """Test cases for rendering and the validation-free route path."""
+
+    def test_renders_encoded_content_like_json(self):
+        """Already-encoded content renders to the same JSON as the stdlib encoder."""
+        content = {"result": [{"a": 1, "b": None}], "text": "naïve ✓", "n": 1.5}
+        assert json.loads(ORJSONResponse(content).body) == content
+
+    def test_renders_models_without_jsonable_encoder(self):
+        """Models, nested anywhere in the content, are converted in one pass."""
+        content = {
+            "page": Page[GithubRepo](items=[_repo(1)], next_cursor=None),
+            "repos": [_repo(2)],
+            "at": datetime(2025, 9, 1, 12, 30, tzinfo=timezone.utc),
+        }
+
+        body = json.loads(ORJSONResponse(content).body)
+
+        assert body["page"] == {"items": [_repo(1).model_dump()], "next_cursor": None}
+        assert body["repos"] == [_repo(2).model_dump()]
+        assert body["at"] == "2025-09-01T12:30:00Z"
+
+    def test_renders_other_objects_like_jsonable_encoder(self):
+        """Objects neither orjson nor pydantic serialize fall back to jsonable_encoder."""
+        class Opaque:
+            def __init__(self):
+                self.title = "t"
+
+        assert json.loads(ORJSONResponse({"result": Opaque()}).body) == {"result": {"title": "t"}}
+
+    def test_renders_agent_tool_call_args(self):
+        """Object-typed Gemini args (pr_details, issue_details) become plain JSON at every depth."""
+        from google.ai.generativelanguage import FunctionCall
+        from app.orchestration.coordinator import _plain_args
+
+        args = {"pr_details": {"title": "t", "labels": ["bug", {"n": 1}]}, "ticket_ids": ["TP-1"]}
+        plain = _plain_args(FunctionCall(name="github_create_pull_request", args=args).args)
+
+        assert json.loads(ORJSONResponse({"toolCalls": [{"args": plain}]}).body) == {"toolCalls": [{"args": args}]}
+
+    def test_json_response_skips_response_model_validation(self):
+        """json_response content is sent as-is; a plain return is still validated."""
+        app = FastAPI(default_response_class=ORJSONResponse)
+        payload: List[Dict[str, Any]] = [{"name": "not a full repo"}]
+
+        @app.get("/direct", response_model=List[GithubRepo])
+        async def direct():
+            return json_response(payload)
+
+        @app.get("/validated", response_model=List[GithubRepo])
+        async def validated():
+            return payload
+
+        client = TestClient(app, raise_server_exceptions=False)
+        assert client.get("/direct").json() == payload
+        assert client.get("/validated").status_code == 500
+
+    def test_routes_serve_service_models(self, github_standin):
+        """List routes returning json_response produce the documented schema."""
+        from app.routers import github
+
+        app = FastAPI(default_response_class=ORJSONResponse)
+        app.include_router(github.router, prefix="/github")
+        client = TestClient(app)
+
+        repos = client.get("/github/repos").json()
+        page = client.get("/github/repos", params={"limit": 5}).json()
+
+        assert len(repos) == 30 and set(repos[0]) == set(GithubRepo.model_fields)
+        assert page["items"] == repos[:5] and page["next_cursor"]
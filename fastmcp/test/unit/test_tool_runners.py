@@ -10,7 +10,7 @@ from app.adk_tools.runners import (
     run_github_get_pr_files, run_jira_get_projects, run_jira_get_issues_for_project,
     run_jira_create_issue, run_jira_fetch_issue, run_jira_get_issue_comments,
     run_jira_comment_issue, run_jira_get_possible_transitions, run_jira_transition_issue,
-    run_jira_summarize_and_email_issue, run_email_send, run_email_confirm_and_send,
+    run_jira_summarize_and_email_issue, run_jira_move_issue_to_sprint, run_email_send, run_email_confirm_and_send,
     run_regenerate_email_summary
 )
 
@@ -192,6 +192,14 @@ class TestJiraToolRunners:
             
             assert result == mock_transition
 
+    @pytest.mark.asyncio
+    async def test_run_jira_move_issue_to_sprint_argument_order(self):
+        """The runner passes the sprint ID and issue key in the service's order."""
+        with patch('app.adk_tools.runners.jira_service.move_issue_to_sprint', new_callable=AsyncMock) as mock_move:
+            await run_jira_move_issue_to_sprint("TEST-1", 12)
+
+            mock_move.assert_awaited_once_with(12, "TEST-1")
+
     @pytest.mark.asyncio
     async def test_run_jira_summarize_and_email_issue_success(self):
         """Test successful Jira issue summarization and email."""
@@ -355,7 +363,7 @@ class TestToolRunnersIntegration:
             run_github_get_pr_files, run_jira_get_projects, run_jira_get_issues_for_project,
             run_jira_create_issue, run_jira_fetch_issue, run_jira_get_issue_comments,
             run_jira_comment_issue, run_jira_get_possible_transitions, run_jira_transition_issue,
-            run_jira_summarize_and_email_issue, run_email_send, run_email_confirm_and_send,
+            run_jira_summarize_and_email_issue, run_jira_move_issue_to_sprint, run_email_send, run_email_confirm_and_send,
             run_regenerate_email_summary
         )
         
@@ -0,0 +1,121 @@
+"""
+Unit tests for per-request tool subset selection.
+"""
+from types import SimpleNamespace
+
+import pytest
+from app.config.settings import settings
+from app.orchestration.tool_selector import ToolSelector
+
+_DECLARATIONS = [
+    {"name": "jira_get_sprints", "description": "List sprints of a Jira project's board",
+     "parameters": {"type": "object", "properties": {"project_key": {"type": "string"}}}},
+    {"name": "jira_get_possible_transitions", "description": "List the transitions available for a Jira issue"},
+    {"name": "jira_transition_issue", "description": "Apply a transition to a Jira issue"},
+    {"name": "github_get_branches", "description": "List branches of a GitHub repository"},
+    {"name": "github_merge_pull_request", "description": "Merge a GitHub pull request"},
+    {"name": "email_send", "description": "Send an email"},
+]
+_PATTERNS = [
+    "- 'show sprints for [project]' → call jira_get_sprints ",
+    "- 'change status of [ticket]' → first call jira_get_possible_transitions, then call jira_transition_issue ",
+    "- 'show branches for [repo]' → call github_get_branches ",
+    "- 'merge this pr' → use the most recently viewed PR number from context ",
+]
+
+
+@pytest.fixture
+def selector():
+    return ToolSelector(_DECLARATIONS, _PATTERNS, rules="When the user confirms an email preview use email_send. ")
+
+
+@pytest.mark.unit
+class TestToolSelector:
+    """Test cases for ranking tools against a prompt."""
+
+    def test_picks_matching_tools(self, selector):
+        """The best match is offered together with the tools the rules always need."""
+        assert selector.select("show sprints of project BENCH", top_k=1) == ["jira_get_sprints", "email_send"]
+        assert selector.select("list branches in repo-1", top_k=1) == ["github_get_branches", "email_send"]
+
+    def test_pattern_companions_are_included(self, selector):
+        """A multi-step pattern brings its other tools along."""
+        names = selector.select("change the status of TP-1", top_k=1)
+        assert {"jira_get_possible_transitions", "jira_transition_issue"} <= set(names)
+        assert "github_get_branches" not in names
+
+    def test_no_match_offers_everything(self, selector):
+        """Prompts without a tool word (follow-ups, questions about context) keep the full set."""
+        assert selector.select("yes", top_k=2) is None
+        assert selector.select("what did I do last?", top_k=2) is None
+
+    def test_patterns_for_subset(self, selector):
+        """Patterns of tools not offered are dropped; tool-less patterns stay."""
+        assert selector.patterns_for(["github_get_branches"]) == [_PATTERNS[2], _PATTERNS[3]]
+
+
+@pytest.mark.unit
+class TestAgentToolSubsets:
+    """Test cases for the orchestrator's per-subset models."""
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        from app.orchestration.coordinator import GeminiToolsAgent
+
+        monkeypatch.setattr(settings, "gemini_context_cache_enabled", False)
+        monkeypatch.setattr(settings, "gemini_tool_selection_enabled", True)
+        return GeminiToolsAgent()
+
+    def test_jira_request_gets_jira_tools(self, agent):
+        """A Jira-only request is offered no GitHub tools and a shorter instruction."""
+        prefix = agent._prefix_for("show sprints for project BENCH")
+        names = [d["name"] for d in prefix.tools[0]["function_declarations"]]
+
+        assert "jira_get_sprints" in names and not any(n.startswith("github_") for n in names)
+        assert len(prefix.system_instruction) < len(agent.prefix.system_instruction)
+        assert "github_get_branches" not in prefix.system_instruction
+
+    def test_transition_request_gets_both_steps(self, agent):
+        """'move [ticket] to [status]' is offered its two-step flow and pattern, however weakly the tools score."""
+        for prompt in ("move TP-1 to Done", "set TP-1 status to In Progress"):
+            prefix = agent._prefix_for(prompt)
+            names = [d["name"] for d in prefix.tools[0]["function_declarations"]]
+
+            assert {"jira_get_possible_transitions", "jira_transition_issue"} <= set(names)
+            assert "'move [ticket] to [status]'" in prefix.system_instruction
+
+    def test_models_are_cached_per_subset(self, agent, monkeypatch):
+        """The same subset reuses its model; the least recently used subset is evicted."""
+        monkeypatch.setattr(settings, "gemini_tool_subset_cache_size", 1)
+        first = agent._prefix_for("show sprints for project BENCH")
+
+        assert agent._prefix_for("show sprints for project BENCH") is first
+        assert agent._prefix_for("show branches for repo-1") is not first
+        assert agent._prefix_for("show sprints for project BENCH") is not first
+        assert agent._prefix_for("what did I do last?") is agent.prefix
+
+    def test_disabled(self, agent, monkeypatch):
+        """With selection off every request gets the full tool set."""
+        monkeypatch.setattr(settings, "gemini_tool_selection_enabled", False)
+        assert agent._prefix_for("show sprints for project BENCH") is agent.prefix
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_the_subset_model(self, agent, monkeypatch):
+        """Calls for a request go to the subset's model; explicit other models are kept."""
+        from app.services import ai_service
+
+        sent = []
+
+        async def generate_content(model, contents):
+            sent.append(model)
+            return SimpleNamespace(usage_metadata=None)
+
+        monkeypatch.setattr(ai_service, "generate_content", generate_content)
+        prefix = agent._prefix_for("show sprints for project BENCH")
+        other = object()
+
+        await agent._generate("hi", call="plan", prefix=prefix)
+        await agent._generate("hi", call="plain_fallback", model=other, prefix=prefix)
+        await agent._generate("hi", call="plan")
+
+        assert sent == [prefix.plain, other, agent.prefix.plain]
@@ -0,0 +1,141 @@
+"""
+Unit tests for the GitHub and Jira webhook receivers.
+"""
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config.settings import settings
+from app.services import jira_service, pr_summary_service
+from app.services.issue_index import issue_index
+
+SECRET = "s3cret"
+
+
+def _signed(payload, secret=SECRET):
+    body = json.dumps(payload).encode()
+    return body, "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.routers import webhooks
+
+    monkeypatch.setattr(settings, "github_webhook_secret", SECRET)
+    monkeypatch.setattr(settings, "jira_webhook_secret", SECRET)
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/webhooks")
+    issue_index.clear()
+    yield TestClient(app)
+    issue_index.clear()
+
+
+def _github(client, event, payload, **kwargs):
+    body, signature = _signed(payload, **kwargs)
+    return client.post("/webhooks/github", content=body, headers={"X-GitHub-Event": event, "X-Hub-Signature-256": signature})
+
+
+def _jira(client, payload):
+    body, signature = _signed(payload)
+    return client.post("/webhooks/jira", content=body, headers={"X-Hub-Signature": signature})
+
+
+_REPOSITORY = {"name": "repo-1", "owner": {"login": "bench"}}
+
+
+def _issue_event(action, number=7, title="Login fails"):
+    issue = {"id": number, "number": number, "title": title, "state": "open",
+             "html_url": f"https://github.example/bench/repo-1/issues/{number}", "body": "Steps to reproduce"}
+    return {"action": action, "issue": issue, "repository": _REPOSITORY}
+
+
+@pytest.mark.unit
+class TestWebhookSignatures:
+    """Test cases for signature verification."""
+
+    def test_bad_or_missing_signature_is_rejected(self, client):
+        """Deliveries signed with another secret, or unsigned, change nothing."""
+        assert _github(client, "issues", _issue_event("opened"), secret="wrong").status_code == 401
+        assert client.post("/webhooks/jira", json={"webhookEvent": "jira:issue_updated"}).status_code == 401
+        assert issue_index.count("github") == 0
+
+    def test_receiver_is_off_without_secret(self, client, monkeypatch):
+        """Without a configured secret the receiver does not exist."""
+        monkeypatch.setattr(settings, "github_webhook_secret", None)
+        assert _github(client, "issues", _issue_event("opened")).status_code == 404
+
+
+@pytest.mark.unit
+class TestGithubWebhook:
+    """Test cases for applying GitHub events."""
+
+    def test_issue_events_update_the_index(self, client):
+        """Opened and edited issues are searchable at once; deleted ones disappear."""
+        assert _github(client, "issues", _issue_event("opened")).json()["result"] == "applied"
+        _github(client, "issues", _issue_event("edited", title="Login fails on Safari"))
+
+        found = issue_index.search(text="safari", source="github")
+        assert [i.key for i in found.issues] == ["bench/repo-1#7"]
+
+        _github(client, "issues", _issue_event("deleted"))
+        assert issue_index.count("github") == 0
+
+    def test_synchronize_drops_outdated_pr_summaries(self, client):
+        """A new head commit drops summaries of older commits and keeps the current one."""
+        summaries = pr_summary_service._summaries
+        summaries.invalidate()
+        summaries.set(("bench", "repo-1", 4, "old"), "old summary")
+        summaries.set(("bench", "repo-1", 4, "new"), "new summary")
+        summaries.set(("bench", "repo-1", 5, "old"), "other PR")
+        payload = {"action": "synchronize", "repository": _REPOSITORY,
+                   "pull_request": {"number": 4, "state": "open", "head": {"sha": "new"}}}
+
+        response = _github(client, "pull_request", payload).json()
+
+        assert response["dropped"] == 1
+        assert set(summaries.items()) == {("bench", "repo-1", 4, "new"), ("bench", "repo-1", 5, "old")}
+        summaries.invalidate()
+
+    def test_other_events_are_ignored(self, client):
+        """Events nothing cached depends on are acknowledged."""
+        response = _github(client, "push", {"ref": "refs/heads/main", "repository": _REPOSITORY})
+        assert response.status_code == 200 and response.json()["result"] == "ignored"
+
+
+@pytest.mark.unit
+class TestJiraWebhook:
+    """Test cases for applying Jira events."""
+
+    @pytest.mark.asyncio
+    async def test_issue_update_is_served_without_polling(self, client, jira_standin, monkeypatch):
+        """A pushed change reaches the sync store, so reads within the interval skip Jira."""
+        monkeypatch.setattr(settings, "jira_incremental_sync", True)
+        monkeypatch.setattr(settings, "jira_sync_min_interval", 300.0)
+        await jira_service.get_issues_for_project("BENCH")
+        jira_standin.state.requests.clear()
+
+        issue = jira_standin.state.data.issue("BENCH-5")
+        issue["fields"]["summary"] = "Renamed by webhook"
+        assert _jira(client, {"webhookEvent": "jira:issue_updated", "issue": issue}).json()["key"] == "BENCH-5"
+        _jira(client, {"webhookEvent": "jira:issue_deleted", "issue": jira_standin.state.data.issue("BENCH-6")})
+
+        issues = {i.key: i for i in await jira_service.get_issues_for_project("BENCH")}
+        assert issues["BENCH-5"].summary == "Renamed by webhook" and "BENCH-6" not in issues
+        assert jira_standin.state.requests == []
+        assert [i.key for i in issue_index.search(text="webhook", source="jira").issues] == ["BENCH-5"]
+
+    @pytest.mark.asyncio
+    async def test_sprint_event_drops_the_boards_sprint_list(self, client, jira_standin):
+        """The next sprint lookup for the board goes back to Jira."""
+        await jira_service.get_sprints("BENCH")
+        await jira_service.get_sprints("BENCH")
+        before = len(jira_standin.state.requests)
+        board_id = await jira_service.get_board_id_for_project("BENCH")
+
+        _jira(client, {"webhookEvent": "sprint_started", "sprint": {"id": 1, "originBoardId": board_id}})
+        await jira_service.get_sprints("BENCH")
+
+        assert len(jira_standin.state.requests) == before + 1